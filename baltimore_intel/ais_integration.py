@@ -16,6 +16,7 @@ from datetime import datetime
 from commodities import (
     BaltimorePortCommodities,
     correlate_vessel_with_commodities,
+    get_commodity_snapshot,
     VESSEL_COMMODITY_MAP,
     TRADING_PARTNERS
 )
@@ -72,19 +73,10 @@ class BaltimoreAISIntegration:
     def __init__(self, ais_tracker_url: str = "http://localhost:8080"):
         self.ais_tracker_url = ais_tracker_url
         self.commodities = BaltimorePortCommodities()
-        self._commodity_cache = None
-        self._cache_time = None
 
     def _get_cached_commodities(self) -> Dict:
-        """Get commodity data with 5-minute cache."""
-        now = datetime.now()
-        if self._commodity_cache is None or self._cache_time is None:
-            self._commodity_cache = self.commodities.get_all_commodities()
-            self._cache_time = now
-        elif (now - self._cache_time).seconds > 300:  # 5 minute cache
-            self._commodity_cache = self.commodities.get_all_commodities()
-            self._cache_time = now
-        return self._commodity_cache
+        """Get commodity data from the shared process-wide snapshot."""
+        return get_commodity_snapshot()
 
     def is_in_baltimore_area(self, lat: float, lon: float) -> bool:
         """Check if coordinates are in Baltimore port area."""
@@ -283,8 +275,7 @@ def create_api():
     @app.route("/api/commodities", methods=["GET"])
     def get_commodities():
         """Get current commodity data."""
-        data = integration.commodities.get_all_commodities()
-        return jsonify(data)
+        return jsonify(get_commodity_snapshot())
 
     @app.route("/api/enrich-vessel", methods=["POST"])
     def enrich_vessel():
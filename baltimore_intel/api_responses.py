@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialized Response Cache for the Intelligence API
+
+Most API payloads change far less often than they are requested (static
+infrastructure GeoJSON, rail stations, snapshots refreshed every
+minute), so the API serves stored bytes instead of re-encoding dicts:
+- bodies are cached per (resource key, version) and rebuilt only when
+  the version changes; versions come from the hub's data version and
+  snapshot versions
+- every body carries a strong ETag (hash of the bytes, with a "-gzip" /
+  "-br" suffix for compressed variants, since their bytes differ);
+  cached bodies also carry Last-Modified (when that version was first
+  built), and If-None-Match / If-Modified-Since are answered with 304
+- bodies of at least COMPRESS_MIN_BYTES are compressed with brotli
+  (if installed) or gzip when the client accepts it, once per version
+- JSON is encoded with orjson when installed, else compact stdlib json
+
+Uncached responses (per-request queries) still get the fast encoder,
+ETag, 304 handling and compression.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # stdlib json is the fallback encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _default(value: Any) -> str:
+    # Datetimes as ISO 8601 (like orjson), anything else as str()
+    isoformat = getattr(value, "isoformat", None)
+    return isoformat() if isoformat is not None else str(value)
+
+
+def dumps(payload: Any) -> bytes:
+    """Compact JSON bytes of an API payload."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; fall through to json
+    return json.dumps(payload, separators=(",", ":"), default=_default).encode()
+
+
+class CachedBody:
+    """One serialized body and its lazily compressed variants."""
+
+    __slots__ = ("version", "body", "etag", "last_modified", "_encoded")
+
+    def __init__(self, body: bytes, version: Hashable = None, last_modified: Optional[float] = None):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.last_modified = last_modified
+        self._encoded: Dict[str, bytes] = {}
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag of the identity body or of one encoded variant."""
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.body, quality=BROTLI_QUALITY)
+            else:
+                data = gzip.compress(self.body, GZIP_LEVEL, mtime=0)
+            self._encoded[encoding] = data
+        return data
+
+
+class ResponseCache:
+    """Serialized bodies by resource key, each valid for one version."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> CachedBody:
+        """Cached body for key at version, building it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = CachedBody(dumps(build()), version, time.time())
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "builds": self.builds}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _not_modified(request, entry: CachedBody, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since and entry.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.last_modified) <= since
+    return False
+
+
+def _encoding_for(request) -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def send(request, entry: CachedBody, cache_control: str = "no-cache") -> Response:
+    """Response for a body: 304, compressed or plain."""
+    encoding = _encoding_for(request) if len(entry.body) >= COMPRESS_MIN_BYTES else None
+    etag = entry.etag_for(encoding)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": cache_control}
+    if entry.last_modified is not None:
+        headers["Last-Modified"] = formatdate(entry.last_modified, usegmt=True)
+
+    if _not_modified(request, entry, etag):
+        return Response(status=304, headers=headers)
+
+    body = entry.body
+    if encoding is not None:
+        body = entry.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, mimetype="application/json", headers=headers)
+
+
+def send_json(request, payload: Any, status: int = 200) -> Response:
+    """Uncached payload with the same encoding and conditional handling."""
+    response = send(request, CachedBody(dumps(payload)))
+    if response.status_code == 200:
+        response.status_code = status
+    return response
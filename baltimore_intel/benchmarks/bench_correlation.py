@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Correlation Engine Benchmark
+
+Compares per-event correlation cost of:
+- legacy: rebuild the window from the event store for every ingest and
+  run the nested commodity x vessel loop over it
+- incremental: add to the rule's CorrelationWindow, advance the watermark
+  and evaluate the condition against running aggregates
+
+Usage:
+    python benchmarks/bench_correlation.py [--sizes 10000 100000] [--probes 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_store import EventStore  # noqa: E402
+from intelligence_hub import IntelligenceHub, IntelEvent, EventType  # noqa: E402
+
+RULE_NAME = "commodity_vessel_correlation"
+COMMODITY_ALERTS = 5
+
+
+def make_vessel(i: int, ts: datetime) -> IntelEvent:
+    return IntelEvent(
+        id=f"v{i}", timestamp=ts, event_type=EventType.VESSEL_ARRIVAL,
+        source="bench", title="", description="", severity="info",
+        raw_data={"vessel_type": "container"}
+    )
+
+
+def make_commodity(i: int, ts: datetime) -> IntelEvent:
+    return IntelEvent(
+        id=f"c{i}", timestamp=ts, event_type=EventType.COMMODITY_ALERT,
+        source="bench", title="", description="", severity="medium",
+        raw_data={"commodity": "coal"}
+    )
+
+
+def legacy_condition(hub: IntelligenceHub, events) -> bool:
+    """The pre-incremental nested-loop condition."""
+    commodity_events = [e for e in events if e.event_type == EventType.COMMODITY_ALERT]
+    vessel_events = [e for e in events if e.event_type == EventType.VESSEL_ARRIVAL]
+    for ce in commodity_events:
+        for ve in vessel_events:
+            if ce.raw_data and ve.raw_data:
+                if hub._cargo_matches(ce.raw_data.get("commodity", ""),
+                                      ve.raw_data.get("vessel_type", "")):
+                    return True
+    return False
+
+
+def run(window_size: int, probes: int) -> dict:
+    hub = IntelligenceHub(max_events=None)
+    rule = next(r for r in hub.correlation_rules if r.name == RULE_NAME)
+    store = EventStore(max_age=None, max_events=None)
+
+    now = datetime.now()
+    start = now - timedelta(minutes=30)
+    step = timedelta(minutes=30) / window_size
+
+    # Pre-fill: many non-matching vessels plus a handful of coal alerts
+    commodity_every = window_size // COMMODITY_ALERTS
+    for i in range(window_size):
+        ts = start + i * step
+        event = make_commodity(i, ts) if i % commodity_every == 0 else make_vessel(i, ts)
+        store.add(event)
+        rule.window.add(event)
+    rule.window.advance(now)
+
+    probe_events = [make_vessel(window_size + i, now) for i in range(probes)]
+
+    t0 = time.perf_counter()
+    for event in probe_events:
+        store.add(event)
+        window_events = store.since(now - rule.time_window, rule.event_types)
+        legacy_condition(hub, window_events)
+    legacy = (time.perf_counter() - t0) / probes
+
+    t0 = time.perf_counter()
+    for event in probe_events:
+        rule.window.add(event)
+        rule.window.advance(now)
+        rule.condition(rule.window)
+    incremental = (time.perf_counter() - t0) / probes
+
+    return {"window": window_size, "legacy_us": legacy * 1e6, "incremental_us": incremental * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark correlation window evaluation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--probes", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'window':>10} {'legacy us/evt':>15} {'incremental us/evt':>20} {'speedup':>10}")
+    for size in args.sizes:
+        r = run(size, args.probes)
+        speedup = r["legacy_us"] / r["incremental_us"] if r["incremental_us"] else float("inf")
+        print(f"{r['window']:>10} {r['legacy_us']:>15.1f} {r['incremental_us']:>20.2f} {speedup:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Event Memory Benchmark
+
+Builds N vessel events the way ingest does (each from freshly parsed
+JSON, so no strings are shared by accident) and reports retained bytes
+per event, measured with tracemalloc, for:
+- dataclass: the previous IntelEvent layout (per-instance __dict__,
+  raw_data kept as nested dicts)
+- slotted: IntelEvent with raw_data still a dict (correlation events)
+- frozen: IntelEvent after freeze(), as source events are retained
+
+Also times to_dict() against to_json() for frozen events.
+
+Usage:
+    python benchmarks/bench_event_memory.py [--events 1000000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intelligence_hub import IntelEvent, EventType  # noqa: E402
+
+
+@dataclass
+class DataclassEvent:
+    """The IntelEvent layout before it was slotted."""
+    id: str
+    timestamp: datetime
+    event_type: EventType
+    source: str
+    title: str
+    description: str
+    severity: str
+    location: Optional[Dict] = None
+    entities: Optional[List[str]] = None
+    raw_data: Optional[Dict] = None
+    correlations: Optional[List[str]] = None
+
+
+def vessel_line(i: int) -> str:
+    """One AIS position plus the commodity enrichment, as JSON."""
+    vessel = {
+        "mmsi": str(200000000 + i), "name": f"BENCH VESSEL {i}",
+        "ship_type_text": "bulk_carrier", "flag": "Panama",
+        "lat": 39.2 + (i % 100) * 0.001, "lon": -76.6 + (i % 50) * 0.001,
+        "speed": 11.2, "course": 143.0, "destination": "BALTIMORE",
+        "timestamp": "2025-06-02T08:00:00Z"
+    }
+    correlation = {
+        "vessel_type": "bulk_carrier", "flag": "Panama",
+        "likely_cargo": ["coal", "soybeans"], "trading_partner": None,
+        "commodity_signals": [], "risk_assessment": "normal"
+    }
+    return json.dumps({"vessel": vessel, "commodity_correlation": correlation})
+
+
+def build(cls, i: int, ts: datetime, freeze: bool):
+    raw = json.loads(vessel_line(i))
+    vessel = raw["vessel"]
+    event = cls(
+        f"evt_20250602_{i:07d}", ts, EventType.VESSEL_ARRIVAL,
+        "".join(["ais_", "tracker"]), f"Vessel vessel_arrival: {vessel['name']}",
+        f"MMSI: {vessel['mmsi']} | Type: bulk_carrier | Flag: Panama",
+        "".join(["in", "fo"]), {"lat": vessel["lat"], "lon": vessel["lon"]},
+        [vessel["mmsi"], vessel["name"]], raw
+    )
+    if freeze:
+        event.freeze()
+    return event
+
+
+def measure(label: str, cls, count: int, freeze: bool = False):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = datetime.now() - timedelta(hours=72)
+    t0 = time.perf_counter()
+    events = [build(cls, i, start + timedelta(seconds=i), freeze) for i in range(count)]
+    elapsed = time.perf_counter() - t0
+    retained = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    print(f"{label:<10} {retained / count:>8,.0f} bytes/event  "
+          f"{retained / 1e6:>9,.1f} MB total  ({elapsed:.1f} s to build)")
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IntelEvent memory")
+    parser.add_argument("--events", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"events: {args.events:,}")
+    events = measure("dataclass", DataclassEvent, args.events)
+    sample = events[:10000]
+    t0 = time.perf_counter()
+    for event in sample:
+        d = asdict(event)
+        d["event_type"] = event.event_type.value
+        d["timestamp"] = event.timestamp.isoformat()
+        json.dumps(d)
+    legacy_serialize = time.perf_counter() - t0
+    del events, sample
+
+    events = measure("slotted", IntelEvent, args.events)
+    del events
+    events = measure("frozen", IntelEvent, args.events, freeze=True)
+
+    sample = events[:10000]
+    t0 = time.perf_counter()
+    for event in sample:
+        json.dumps(event.to_dict())
+    to_dict = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for event in sample:
+        event.to_json()
+    to_json = time.perf_counter() - t0
+    print(f"serialize 10k: asdict+dumps {legacy_serialize * 1000:.0f} ms, "
+          f"to_dict+dumps {to_dict * 1000:.0f} ms, to_json {to_json * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
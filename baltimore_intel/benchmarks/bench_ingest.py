@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingest Endpoint Benchmark
+
+Posts N vessel positions through the Flask API (in-process test client)
+and compares:
+- single: one POST /api/ingest/vessel per position
+- bulk: one POST /api/ingest/bulk of NDJSON (parsed in 64 KiB chunks)
+
+Commodity enrichment reads a fixed snapshot so no network is involved.
+
+Usage:
+    python benchmarks/bench_ingest.py [--events 20000] [--batch-size 500]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intelligence_hub import IntelligenceHub, create_intelligence_api  # noqa: E402
+from snapshot_cache import SnapshotCache  # noqa: E402
+
+
+def make_vessel(i: int) -> dict:
+    return {
+        "mmsi": str(200000000 + i), "name": f"BENCH {i}", "ship_type_text": "container",
+        "flag": "Panama", "lat": 39.2 + (i % 100) * 0.001, "lon": -76.6 + (i % 50) * 0.001
+    }
+
+
+def make_client():
+    market = SnapshotCache(lambda: {"commodities": {}, "alerts": []}, ttl=float("inf"))
+    hub = IntelligenceHub(max_events=None, default_rules=False, commodity_snapshot=market)
+    return hub, create_intelligence_api(hub).test_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single vs bulk ingest")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    vessels = [make_vessel(i) for i in range(args.events)]
+
+    hub, client = make_client()
+    t0 = time.perf_counter()
+    for vessel in vessels:
+        client.post("/api/ingest/vessel", json=vessel)
+    single = time.perf_counter() - t0
+    assert len(hub.store) == args.events
+
+    payload = "".join(json.dumps({"kind": "vessel", "data": v}) + "\n" for v in vessels).encode()
+
+    hub, client = make_client()
+    t0 = time.perf_counter()
+    response = client.post(
+        f"/api/ingest/bulk?batch_size={args.batch_size}&errors_only=1",
+        data=payload, content_type="application/x-ndjson"
+    )
+    bulk = time.perf_counter() - t0
+    assert response.get_json()["accepted"] == args.events
+    assert len(hub.store) == args.events
+
+    print(f"events:           {args.events:,}")
+    print(f"single endpoint:  {single:.2f} s  ({args.events / single:,.0f} events/s)")
+    print(f"bulk endpoint:    {bulk:.2f} s  ({args.events / bulk:,.0f} events/s)")
+    print(f"speedup:          {single / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal Warm-Restart Benchmark
+
+Writes N events to an EventJournal, then measures:
+- replay: decoding every record through mmap
+- restore: a new IntelligenceHub rebuilding store, windows and caches,
+  first from raw segments, then from a compacted snapshot
+- json: parsing the same events from one JSON blob, for comparison
+
+Usage:
+    python benchmarks/bench_journal.py [--events 1000000] [--dir /tmp/journal]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_journal import EventJournal  # noqa: E402
+from intelligence_hub import (  # noqa: E402
+    IntelligenceHub, IntelEvent, EventType, JOURNAL_EVENT
+)
+
+TYPES = [EventType.VESSEL_ARRIVAL, EventType.RAIL_MOVEMENT, EventType.SCANNER_ALERT]
+
+
+def make_event(i: int, ts: datetime) -> IntelEvent:
+    return IntelEvent(
+        id=f"evt_bench_{i:07d}", timestamp=ts, event_type=TYPES[i % len(TYPES)],
+        source="bench", title=f"Event {i}", description="benchmark event",
+        severity="info", location={"lat": 39.26, "lon": -76.58},
+        raw_data={"mmsi": str(200000000 + i), "vessel_type": "container"}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark journal replay")
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="intel-journal-")
+    shutil.rmtree(directory, ignore_errors=True)
+
+    now = datetime.now()
+    step = timedelta(hours=24) / args.events
+    start = now - timedelta(hours=24)
+    events = [make_event(i, start + i * step) for i in range(args.events)]
+
+    journal = EventJournal(directory)
+    t0 = time.perf_counter()
+    for event in events:
+        journal.append(JOURNAL_EVENT, IntelligenceHub._event_record(event))
+    journal.close()
+    write = time.perf_counter() - t0
+    size = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+
+    t0 = time.perf_counter()
+    count = sum(1 for _ in EventJournal(directory).replay())
+    replay = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hub = IntelligenceHub(max_events=None, journal=EventJournal(directory))
+    restore = time.perf_counter() - t0
+    assert len(hub.store) == count == args.events
+
+    hub.compact_journal()
+    hub.journal.close()
+    t0 = time.perf_counter()
+    hub = IntelligenceHub(max_events=None, journal=EventJournal(directory))
+    snapshot_restore = time.perf_counter() - t0
+    assert len(hub.store) == args.events
+
+    blob = json.dumps([e.to_dict() for e in events])
+    t0 = time.perf_counter()
+    for d in json.loads(blob):
+        IntelEvent(**dict(
+            d, timestamp=datetime.fromisoformat(d["timestamp"]),
+            event_type=EventType(d["event_type"])
+        ))
+    json_parse = time.perf_counter() - t0
+
+    print(f"events:           {args.events:,}")
+    print(f"journal size:     {size / 1e6:.1f} MB")
+    print(f"append:           {write:.2f} s")
+    print(f"replay (decode):  {replay:.2f} s")
+    print(f"hub restore:      {restore:.2f} s  (segments)")
+    print(f"hub restore:      {snapshot_restore:.2f} s  (snapshot)")
+    print(f"json blob parse:  {json_parse:.2f} s")
+
+    if not args.dir:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
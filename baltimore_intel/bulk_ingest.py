@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk NDJSON Ingest
+
+Lets relays (AIS, scanner transcription) push many events per request
+instead of paying one HTTP round trip and response per event:
+- the body is read in fixed-size chunks and split into lines as it
+  arrives, so memory is bounded by the chunk and line limits rather
+  than the body size
+- each line is one JSON object naming its kind:
+
+      {"kind": "vessel", "data": {...vessel...}}
+      {"kind": "scanner", "data": {"transcript": "...", "feed": "...", "timestamp": ...}}
+      {"kind": "rail", "data": {...inference...}}
+      {"kind": "commodity", "data": {...quote...}}
+      {"kind": "infrastructure", "data": {"infra_id": "...", "alert_type": "...", ...}}
+      {"kind": "event", "data": {...IntelEvent.to_dict()...}}
+
+  A line without "kind" but with "event_type" is taken as a plain event.
+  Plain events get a hub-assigned id (a client id could collide with
+  hub ids or other relays), and their timestamp is normalized like any
+  source timestamp (naive local time, future times clamped).
+- lines are built with the hub's create_* helpers (so enrichment and
+  event-time handling match the single-event endpoints) and ingested in
+  batches of `batch_size`, taking the hub lock once per batch; with
+  ingest workers running they are enqueued instead
+- every non-blank line gets a result: the event id, or an error (also
+  when building succeeded but ingesting that one event failed)
+"""
+
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from event_time import parse_event_time
+from intelligence_hub import EventType, IngestQueueFull, IntelEvent, IntelligenceHub
+
+CHUNK_BYTES = 64 * 1024
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class LineTooLong(ValueError):
+    """A line exceeded MAX_LINE_BYTES."""
+
+
+def iter_lines(
+    stream,
+    chunk_bytes: int = CHUNK_BYTES,
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (line number, bytes) for each line of a binary stream, read
+    chunk by chunk. Over-long lines yield a LineTooLong instead of bytes
+    and are skipped up to their newline.
+    """
+    line_no = 0
+    pending = b""
+    skipping = False
+    while True:
+        chunk = stream.read(chunk_bytes)
+        if not chunk:
+            break
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            if skipping:
+                # Already reported (and counted) when it grew too long
+                skipping = False
+            else:
+                line_no += 1
+                line = pending + chunk[start:end] if pending else chunk[start:end]
+                if len(line) > max_line_bytes:
+                    yield line_no, LineTooLong(f"line exceeds {max_line_bytes} bytes")
+                else:
+                    yield line_no, line
+            pending = b""
+            start = end + 1
+        if not skipping:
+            pending += chunk[start:]
+            if len(pending) > max_line_bytes:
+                line_no += 1
+                yield line_no, LineTooLong(f"line exceeds {max_line_bytes} bytes")
+                pending = b""
+                skipping = True
+    if pending and not skipping:
+        yield line_no + 1, pending
+
+
+def _vessel(hub: IntelligenceHub, data: Dict, record: Dict):
+    event_type = EventType(record.get("event_type", EventType.VESSEL_ARRIVAL.value))
+    return hub.create_vessel_event(data, event_type)
+
+
+def _scanner(hub: IntelligenceHub, data: Dict, record: Dict):
+    return hub.create_scanner_event(
+        data["transcript"], data.get("feed", "unknown"), data.get("timestamp")
+    )
+
+
+def _infrastructure(hub: IntelligenceHub, data: Dict, record: Dict):
+    event = hub.create_infrastructure_event(
+        data["infra_id"], data["alert_type"], data.get("description", ""),
+        data.get("severity", "medium"), data.get("timestamp")
+    )
+    if event is None:
+        raise ValueError(f"Unknown infrastructure: {data['infra_id']}")
+    return event
+
+
+def _event(hub: IntelligenceHub, data: Dict, record: Dict):
+    timestamp = parse_event_time(data.get("timestamp"), hub.clock.now())
+    if timestamp is None:
+        raise ValueError("missing or invalid timestamp")
+    event = IntelEvent.from_dict(dict(
+        data, id=hub._generate_event_id(), timestamp=timestamp.isoformat()
+    ))
+    if event.event_type == EventType.CORRELATION:
+        raise ValueError("correlation events are derived, not ingested")
+    hub._dispatch(event)
+    return event
+
+
+HANDLERS: Dict[str, Callable[[IntelligenceHub, Dict, Dict], Optional[IntelEvent]]] = {
+    "vessel": _vessel,
+    "scanner": _scanner,
+    "rail": lambda hub, data, record: hub.create_rail_event(data),
+    "commodity": lambda hub, data, record: hub.create_commodity_event(data),
+    "infrastructure": _infrastructure,
+    "event": _event,
+}
+
+
+def parse_record(line: bytes) -> Tuple[str, Dict, Dict]:
+    """(kind, data, record) for one line. Raises ValueError."""
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("line is not a JSON object")
+    kind = record.get("kind")
+    if kind is None:
+        if "event_type" not in record:
+            raise ValueError("missing kind")
+        return "event", record, record
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown kind: {kind}")
+    data = record.get("data")
+    if not isinstance(data, dict):
+        raise ValueError("data must be an object")
+    return kind, data, record
+
+
+def bulk_ingest(
+    hub: IntelligenceHub,
+    lines: Iterable[Tuple[int, object]],
+    batch_size: int = 500
+) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Build and ingest events from numbered NDJSON lines.
+    Returns (per-line results, summary counts).
+    """
+    results: List[Dict] = []
+    summary = {"lines": 0, "accepted": 0, "rejected": 0, "batches": 0}
+    # (result, event) awaiting ingest
+    batch: List[Tuple[Dict, IntelEvent]] = []
+
+    def reject(result: Dict, error: str):
+        if result.pop("id", None) is not None:
+            summary["accepted"] -= 1
+            summary["rejected"] += 1
+        result["error"] = error
+
+    def flush():
+        if not batch:
+            return
+        if hub.async_ingest:
+            for result, event in batch:
+                try:
+                    hub.submit(event)
+                except IngestQueueFull as e:
+                    reject(result, str(e))
+        else:
+            results_by_event = {id(event): result for result, event in batch}
+            hub.ingest_batch(
+                [event for _, event in batch],
+                on_error=lambda event, e: reject(results_by_event[id(event)], f"ingest failed: {e}")
+            )
+        summary["batches"] += 1
+        batch.clear()
+
+    for line_no, line in lines:
+        if isinstance(line, Exception):
+            error: Optional[str] = str(line)
+        elif not line.strip():
+            continue
+        else:
+            error = None
+        summary["lines"] += 1
+        result: Dict = {"line": line_no}
+        results.append(result)
+        if error is None:
+            try:
+                kind, data, record = parse_record(line)
+                with hub.collecting() as built:
+                    HANDLERS[kind](hub, data, record)
+            except KeyError as e:
+                error = f"missing field {e}"
+            except Exception as e:
+                # Wrongly typed fields surface as all sorts of errors
+                # inside the handlers; they still only fail this line
+                error = str(e) or type(e).__name__
+        if error is not None:
+            result["error"] = error
+            summary["rejected"] += 1
+            continue
+        for event in built:
+            result["id"] = event.id
+            batch.append((result, event))
+        summary["accepted"] += 1
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return results, summary
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Clocks
+
+The hub reads "now" through a Clock so it can run against the wall clock
+in production or against simulated time when replaying recorded traffic:
+- SystemClock: datetime.now()
+- SimulatedClock: a settable time that only moves forward, driven by the
+  replay loop from event timestamps
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class Clock:
+    """Source of the current time."""
+
+    def now(self) -> datetime:
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Wall-clock time."""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class SimulatedClock(Clock):
+    """Manually advanced time for replay and tests."""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = start or datetime.now()
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        return self._now
+
+    def set(self, when: datetime) -> datetime:
+        """Move to `when`; earlier times are ignored (time never rewinds)."""
+        with self._lock:
+            if when > self._now:
+                self._now = when
+            return self._now
+
+    def advance(self, delta: timedelta) -> datetime:
+        with self._lock:
+            if delta > timedelta(0):
+                self._now += delta
+            return self._now
@@ -12,10 +12,15 @@ Tracks commodity prices and indicators relevant to Port of Baltimore operations:
 
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import os
 
+from snapshot_cache import SnapshotCache
+from price_history import PriceHistory, compute_adaptive_alerts
+
 # Free API endpoints
 YAHOO_FINANCE_API = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
 FRED_API = "https://api.stlouisfed.org/fred/series/observations"
@@ -103,21 +108,97 @@ FRED_INDICATORS = {
 
 
 class BaltimorePortCommodities:
-    """Track commodities relevant to Port of Baltimore."""
+    """
+    Track commodities relevant to Port of Baltimore.
+
+    Quotes are fetched concurrently: each request has its own timeout and
+    the whole batch is bounded by `deadline` seconds. Symbols that miss
+    the deadline (or fail) fall back to their last good quote, marked
+    with `"stale": True`.
+
+    When a PriceHistory is attached (or COMMODITY_HISTORY_DIR is set),
+    every fresh quote is recorded and alerts use adaptive, per-commodity
+    volatility thresholds once enough history exists.
+    """
 
-    def __init__(self, fred_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        fred_api_key: Optional[str] = None,
+        max_workers: int = 8,
+        deadline: float = 12.0,
+        symbol_timeout: float = 8.0,
+        history: Optional[PriceHistory] = None
+    ):
         self.fred_api_key = fred_api_key or os.getenv("FRED_API_KEY")
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.symbol_timeout = symbol_timeout
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         })
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_good: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if history is None and os.getenv("COMMODITY_HISTORY_DIR"):
+            history = PriceHistory(os.getenv("COMMODITY_HISTORY_DIR"))
+        self.history = history
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="commodity-fetch"
+                )
+            return self._executor
+
+    def _fetch_concurrently(
+        self,
+        tasks: Dict[str, Callable[[], Optional[Dict]]],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Dict]:
+        """
+        Run fetch tasks in parallel within a global deadline.
+
+        Returns key -> result for every task that produced data, using the
+        last good result (marked stale) for tasks that failed or timed out.
+        """
+        executor = self._get_executor()
+        futures = {executor.submit(fn): key for key, fn in tasks.items()}
+        done, _ = wait(futures, timeout=deadline if deadline is not None else self.deadline)
+
+        results = {}
+        for future, key in futures.items():
+            data = None
+            if future in done and future.exception() is None:
+                data = future.result()
+            else:
+                future.cancel()
+
+            if data is not None:
+                data["stale"] = False
+                with self._lock:
+                    self._last_good[key] = data
+                results[key] = data
+                continue
+
+            with self._lock:
+                last = self._last_good.get(key)
+            if last is not None:
+                stale = dict(last)
+                stale["stale"] = True
+                stale["as_of"] = last.get("timestamp")
+                results[key] = stale
+
+        return results
 
-    def fetch_yahoo_quote(self, symbol: str) -> Optional[Dict]:
+    def fetch_yahoo_quote(self, symbol: str, timeout: Optional[float] = None) -> Optional[Dict]:
         """Fetch current price from Yahoo Finance."""
         try:
             url = YAHOO_FINANCE_API.format(symbol=symbol)
             params = {"interval": "1d", "range": "5d"}
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=timeout or self.symbol_timeout)
 
             if response.status_code != 200:
                 return None
@@ -150,6 +231,7 @@ class BaltimorePortCommodities:
                 "change_pct": round(change_pct, 2),
                 "currency": meta.get("currency", "USD"),
                 "exchange": meta.get("exchangeName", "Unknown"),
+                "market_time": meta.get("regularMarketTime"),
                 "timestamp": datetime.now().isoformat()
             }
 
@@ -157,7 +239,12 @@ class BaltimorePortCommodities:
             print(f"Error fetching {symbol}: {e}")
             return None
 
-    def fetch_fred_data(self, series_id: str, limit: int = 30) -> Optional[Dict]:
+    def fetch_fred_data(
+        self,
+        series_id: str,
+        limit: int = 30,
+        timeout: Optional[float] = None
+    ) -> Optional[Dict]:
         """Fetch data from FRED API."""
         if not self.fred_api_key:
             return None
@@ -170,7 +257,7 @@ class BaltimorePortCommodities:
                 "sort_order": "desc",
                 "limit": limit
             }
-            response = self.session.get(FRED_API, params=params, timeout=10)
+            response = self.session.get(FRED_API, params=params, timeout=timeout or self.symbol_timeout)
 
             if response.status_code != 200:
                 return None
@@ -208,22 +295,50 @@ class BaltimorePortCommodities:
             print(f"Error fetching FRED {series_id}: {e}")
             return None
 
-    def get_all_commodities(self) -> Dict:
-        """Fetch all Baltimore-relevant commodity data."""
+    def get_all_commodities(self, deadline: Optional[float] = None) -> Dict:
+        """
+        Fetch all Baltimore-relevant commodity data.
+
+        Yahoo quotes and FRED series are fetched in one concurrent batch
+        bounded by `deadline` seconds (default: self.deadline).
+        """
         results = {
             "timestamp": datetime.now().isoformat(),
             "port": "Baltimore",
             "commodities": {},
+            "indicators": {},
             "categories": {
                 "exports": [],
                 "imports": [],
                 "shipping": []
             },
-            "alerts": []
+            "alerts": [],
+            "stale": []
+        }
+
+        tasks = {
+            f"yahoo:{key}": (lambda symbol=config["symbol"]: self.fetch_yahoo_quote(symbol))
+            for key, config in COMMODITIES.items()
         }
+        if self.fred_api_key:
+            for key, config in FRED_INDICATORS.items():
+                tasks[f"fred:{key}"] = (
+                    lambda series_id=config["series_id"]: self.fetch_fred_data(series_id)
+                )
+
+        fetched = self._fetch_concurrently(tasks, deadline)
+
+        for key, config in FRED_INDICATORS.items():
+            series = fetched.get(f"fred:{key}")
+            if series:
+                series["name"] = config["name"]
+                series["relevance"] = config["relevance"]
+                results["indicators"][key] = series
+                if series["stale"]:
+                    results["stale"].append(key)
 
         for key, config in COMMODITIES.items():
-            quote = self.fetch_yahoo_quote(config["symbol"])
+            quote = fetched.get(f"yahoo:{key}")
             if quote:
                 quote["name"] = config["name"]
                 quote["relevance"] = config["relevance"]
@@ -231,18 +346,59 @@ class BaltimorePortCommodities:
                 results["commodities"][key] = quote
                 results["categories"][config["category"]].append(key)
 
-                # Generate alerts for significant moves
-                if abs(quote["change_pct"]) >= 3.0:
-                    direction = "up" if quote["change_pct"] > 0 else "down"
-                    results["alerts"].append({
-                        "commodity": config["name"],
-                        "message": f"{config['name']} {direction} {abs(quote['change_pct']):.1f}%",
-                        "relevance": config["relevance"],
-                        "severity": "high" if abs(quote["change_pct"]) >= 5.0 else "medium"
-                    })
+                if quote["stale"]:
+                    # Don't re-alert on a move we already reported
+                    results["stale"].append(key)
 
+        fresh = {
+            key: quote for key, quote in results["commodities"].items()
+            if not quote["stale"]
+        }
+        results["alerts"] = self._generate_alerts(fresh)
         return results
 
+    def _generate_alerts(self, quotes: Dict[str, Dict]) -> List[Dict]:
+        """
+        Alert on significant moves in fresh quotes.
+
+        Commodities with enough recorded history are judged against their
+        own volatility (rolling z-score / volatility band); the rest fall
+        back to the fixed 3% (medium) / 5% (high) day-over-day rule.
+        """
+        adaptive = {}
+        if self.history is not None and quotes:
+            self.history.append_quotes(quotes)
+            adaptive = compute_adaptive_alerts(self.history, list(quotes))
+
+        alerts = []
+        for key, quote in quotes.items():
+            config = COMMODITIES[key]
+            stats = adaptive.get(key)
+            if stats is not None:
+                quote["volatility"] = stats
+                if not stats["severity"]:
+                    continue
+                direction = "up" if stats["change_pct"] > 0 else "down"
+                message = (
+                    f"{config['name']} {direction} {abs(stats['change_pct']):.1f}% "
+                    f"({stats['zscore']:+.1f}σ vs recent volatility)"
+                )
+                severity = stats["severity"]
+            elif abs(quote["change_pct"]) >= 3.0:
+                direction = "up" if quote["change_pct"] > 0 else "down"
+                message = f"{config['name']} {direction} {abs(quote['change_pct']):.1f}%"
+                severity = "high" if abs(quote["change_pct"]) >= 5.0 else "medium"
+            else:
+                continue
+
+            alerts.append({
+                "commodity": config["name"],
+                "message": message,
+                "relevance": config["relevance"],
+                "severity": severity
+            })
+        return alerts
+
     def generate_report(self) -> str:
         """Generate a human-readable report."""
         data = self.get_all_commodities()
@@ -343,20 +499,66 @@ TRADING_PARTNERS = {
 }
 
 
-def correlate_vessel_with_commodities(vessel_type: str, origin_country: str = None) -> Dict:
+# ===========================================
+# SHARED COMMODITY SNAPSHOT
+# ===========================================
+
+# Seconds a snapshot is served fresh before a background revalidation
+COMMODITY_SNAPSHOT_TTL = int(os.getenv("COMMODITY_SNAPSHOT_TTL", "300"))
+
+_snapshot: Optional[SnapshotCache] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_commodity_snapshot_service() -> SnapshotCache:
+    """Process-wide commodity snapshot shared by every correlation path."""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = SnapshotCache(
+                    BaltimorePortCommodities().get_all_commodities,
+                    ttl=COMMODITY_SNAPSHOT_TTL,
+                    name="commodity-snapshot",
+                    default={"commodities": {}, "alerts": []}
+                )
+    return _snapshot
+
+
+def get_commodity_snapshot() -> Dict:
+    """Current commodity data from the shared snapshot."""
+    return get_commodity_snapshot_service().get()
+
+
+def correlate_vessel_with_commodities(
+    vessel_type: str,
+    origin_country: str = None,
+    snapshot: Optional[SnapshotCache] = None
+) -> Dict:
     """
     Correlate a vessel with relevant commodity indicators.
 
+    Reads from the shared commodity snapshot; results are memoized per
+    (vessel_type, origin_country) for each snapshot version.
+
     Args:
         vessel_type: Type of vessel (bulk_carrier, tanker, roro, etc.)
         origin_country: Country of origin/destination
+        snapshot: Snapshot to read from (defaults to the shared one)
 
     Returns:
         Dict with relevant commodities and their current status
     """
-    tracker = BaltimorePortCommodities()
-    all_data = tracker.get_all_commodities()
+    snapshot = snapshot or get_commodity_snapshot_service()
+    result = snapshot.memoize(
+        ("vessel_correlation", vessel_type, origin_country),
+        lambda all_data: _build_vessel_correlation(vessel_type, origin_country, all_data)
+    )
+    return dict(result)
+
 
+def _build_vessel_correlation(vessel_type: str, origin_country: Optional[str], all_data: Dict) -> Dict:
+    """Compute a vessel/commodity correlation from one commodity snapshot."""
     relevant_commodities = VESSEL_COMMODITY_MAP.get(vessel_type.lower(), [])
 
     result = {
@@ -370,7 +572,7 @@ def correlate_vessel_with_commodities(vessel_type: str, origin_country: str = No
     risk_score = 0
 
     for commodity_key in relevant_commodities:
-        if commodity_key in all_data["commodities"]:
+        if commodity_key in all_data.get("commodities", {}):
             commodity = all_data["commodities"][commodity_key]
             result["relevant_commodities"].append({
                 "name": commodity["name"],
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental Sliding Windows for Correlation Rules
+
+Each correlation rule owns a CorrelationWindow. Events are added as they
+are ingested and expired as the watermark advances, while running
+aggregates are maintained alongside:
+- per-EventType counts
+- keyed counters (e.g. commodity names, vessel types) defined per rule
+
+Rule conditions read these aggregates instead of re-filtering raw event
+lists, so evaluating a rule costs the same whether the window holds ten
+events or a hundred thousand. Keys are computed once, when an event is
+added, and kept beside it for expiry: by then the event's payload may be
+frozen, and re-deriving keys from it would be slower and could yield a
+different (e.g. JSON round-tripped) value.
+
+CorrelationCache keeps repeat matches from re-emitting near-identical
+correlation events while a rule is in cooldown.
+"""
+
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+
+# A key function maps an event to a key, or None if the event has no key
+KeyFunction = Callable[[object], Optional[Hashable]]
+
+
+class CorrelationWindow:
+    """
+    Time-bounded window of events with incrementally maintained aggregates.
+    """
+
+    def __init__(self, span: timedelta, keys: Optional[Dict[str, KeyFunction]] = None):
+        self.span = span
+        self._events = deque()
+        self._event_keys = deque()  # per event, the key of each key function
+        self._type_counts = Counter()
+        self._key_functions = dict(keys or {})
+        self._key_counts: Dict[str, Counter] = {name: Counter() for name in self._key_functions}
+        self.latest = None  # Most recently added event
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._events)
+
+    def add(self, event):
+        """
+        Add an event to the window and update aggregates. Out-of-order
+        events are inserted in timestamp order, scanning from the newest.
+        """
+        keys = tuple(key_function(event) for key_function in self._key_functions.values())
+        events = self._events
+        if events and event.timestamp < events[-1].timestamp:
+            i = len(events) - 1
+            while i and events[i - 1].timestamp > event.timestamp:
+                i -= 1
+            events.insert(i, event)
+            self._event_keys.insert(i, keys)
+        else:
+            events.append(event)
+            self._event_keys.append(keys)
+        self._type_counts[event.event_type] += 1
+        for counts, key in zip(self._key_counts.values(), keys):
+            if key is not None:
+                counts[key] += 1
+        self.latest = event
+
+    def advance(self, watermark: datetime) -> int:
+        """Expire events older than watermark - span. Returns count expired."""
+        self.watermark = watermark
+        cutoff = watermark - self.span
+        expired = 0
+        while self._events and self._events[0].timestamp < cutoff:
+            self._discard(self._events.popleft(), self._event_keys.popleft())
+            expired += 1
+        return expired
+
+    def _discard(self, event, keys: tuple):
+        self._type_counts[event.event_type] -= 1
+        if not self._type_counts[event.event_type]:
+            del self._type_counts[event.event_type]
+        for counts, key in zip(self._key_counts.values(), keys):
+            if key is not None:
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+
+    def count(self, event_type=None) -> int:
+        """Number of events in the window, optionally of a single type."""
+        if event_type is None:
+            return len(self._events)
+        return self._type_counts.get(event_type, 0)
+
+    def keys(self, name: str) -> Counter:
+        """Running counter of key values for a named key function."""
+        return self._key_counts[name]
+
+    def has_key(self, name: str, value: Hashable) -> bool:
+        """Check whether any event in the window has the given key value."""
+        return self._key_counts[name].get(value, 0) > 0
+
+    def ids(self) -> List[str]:
+        """IDs of all events currently in the window, oldest first."""
+        return [e.id for e in self._events]
+
+    def clear(self):
+        """Drop all events and aggregates."""
+        self._events.clear()
+        self._event_keys.clear()
+        self._type_counts.clear()
+        for counts in self._key_counts.values():
+            counts.clear()
+        self.latest = None
+
+
+class CorrelationCache:
+    """
+    De-duplicates correlation output.
+
+    Entries are keyed by (rule name, contributing entity set). While an
+    entry is within its rule's cooldown, further matches extend the cached
+    correlation event in place instead of emitting a new one.
+    """
+
+    def __init__(self, purge_threshold: int = 1024):
+        self._entries: Dict[Hashable, list] = {}  # key -> [event, expires_at, member_ids]
+        self._purge_threshold = purge_threshold
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, now: datetime):
+        """Return the live correlation event for key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._entries[key]
+            return None
+        return entry[0]
+
+    def put(self, key: Hashable, event, expires_at: datetime):
+        """Cache a freshly emitted correlation event until expires_at."""
+        if len(self._entries) >= self._purge_threshold:
+            self.purge(event.timestamp)
+        self._entries[key] = [event, expires_at, set(event.correlations or [])]
+
+    def extend(self, key: Hashable, event_id: str) -> bool:
+        """Append a contributing event id. Returns False if already present."""
+        entry = self._entries[key]
+        members = entry[2]
+        if event_id in members:
+            return False
+        members.add(event_id)
+        entry[0].correlations.append(event_id)
+        return True
+
+    def purge(self, now: datetime) -> int:
+        """Drop expired entries. Returns count dropped."""
+        expired = [k for k, entry in self._entries.items() if entry[1] <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def clear(self):
+        self._entries.clear()
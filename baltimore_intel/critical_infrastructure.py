@@ -15,11 +15,15 @@ Design pattern borrowed from Watcher's threat intelligence approach.
 """
 
 import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from dependency_graph import DependencyGraph
+from keyword_matcher import get_transcript_matcher
+from spatial_index import GridIndex
+
 class InfrastructureType(Enum):
     PORT_TERMINAL = "port_terminal"
     RAIL_YARD = "rail_yard"
@@ -333,6 +337,24 @@ BALTIMORE_INFRASTRUCTURE: Dict[str, Infrastructure] = {
 }
 
 
+# Transcript keywords for each infrastructure asset
+INFRASTRUCTURE_KEYWORDS: Dict[str, List[str]] = {
+    "seagirt": ["seagirt", "container terminal"],
+    "dundalk": ["dundalk", "auto terminal"],
+    "cnx_coal": ["curtis bay", "coal terminal", "cnx"],
+    "howard_street_tunnel": ["howard street", "tunnel"],
+    "key_bridge": ["key bridge", "bridge clearance"],
+    "channel_patapsco": ["channel", "ship channel", "patapsco"],
+    "bayview_yard": ["bayview", "csx yard"],
+}
+
+# Transcript keywords that flag an emergency at matched infrastructure
+EMERGENCY_KEYWORDS: List[str] = [
+    "emergency", "fire", "collision", "derailment",
+    "spill", "explosion", "evacuation", "closure"
+]
+
+
 # ===========================================
 # INFRASTRUCTURE MONITORING
 # ===========================================
@@ -341,11 +363,68 @@ class InfrastructureMonitor:
     """
     Monitor critical infrastructure and correlate with
     vessel, rail, scanner, and commodity data.
+
+    Derived indexes (spatial grid, dependency graph, impact memo) are
+    built lazily and rebuilt after the registry changes through
+    register_infrastructure() or remove_infrastructure().
     """
 
-    def __init__(self):
-        self.infrastructure = BALTIMORE_INFRASTRUCTURE
+    SPATIAL_CELL_NM = 1.0
+    CASCADE_DECAY = 0.5  # impact weight per dependency hop
+
+    def __init__(self, infrastructure: Optional[Dict[str, Infrastructure]] = None):
+        self.infrastructure = dict(
+            BALTIMORE_INFRASTRUCTURE if infrastructure is None else infrastructure
+        )
         self.alerts: List[InfrastructureAlert] = []
+        self._registry_version = 0
+        self._derived: Dict[str, tuple] = {}
+
+    # ===========================================
+    # REGISTRY
+    # ===========================================
+
+    def register_infrastructure(self, assets: Iterable[Infrastructure]):
+        """Add or replace assets (e.g. a bulk OSM rail/pipeline/berth load)."""
+        for infra in assets:
+            self.infrastructure[infra.id] = infra
+        self._registry_version += 1
+
+    def remove_infrastructure(self, infra_id: str) -> bool:
+        """Remove an asset. Returns False if it was not registered."""
+        if self.infrastructure.pop(infra_id, None) is None:
+            return False
+        self._registry_version += 1
+        return True
+
+    def _registry_state(self) -> tuple:
+        # Length catches direct dict edits that bypassed the registry API
+        return (self._registry_version, len(self.infrastructure))
+
+    def _cached(self, name: str, build):
+        """Value derived from the registry, rebuilt when it changes."""
+        state = self._registry_state()
+        cached = self._derived.get(name)
+        if cached is None or cached[0] != state:
+            cached = (state, build())
+            self._derived[name] = cached
+        return cached[1]
+
+    def get_spatial_index(self) -> GridIndex:
+        """Grid index over asset positions, rebuilt on registry change."""
+        def build():
+            assets = list(self.infrastructure.values())
+            return GridIndex(
+                [inf.id for inf in assets],
+                [inf.lat for inf in assets],
+                [inf.lon for inf in assets],
+                cell_nm=self.SPATIAL_CELL_NM
+            )
+        return self._cached("spatial_index", build)
+
+    def get_dependency_graph(self) -> DependencyGraph:
+        """Reverse-adjacency dependency graph, rebuilt on registry change."""
+        return self._cached("dependency_graph", lambda: DependencyGraph(self.infrastructure))
 
     def get_all_infrastructure(self) -> List[Dict]:
         """Get all infrastructure as list of dicts."""
@@ -367,26 +446,37 @@ class InfrastructureMonitor:
 
     def get_dependencies(self, infra_id: str) -> List[Infrastructure]:
         """Get all infrastructure that depends on a given asset."""
-        dependents = []
-        for inf in self.infrastructure.values():
-            if infra_id in inf.dependencies:
-                dependents.append(inf)
-        return dependents
+        return [
+            self.infrastructure[dep_id]
+            for dep_id in self.get_dependency_graph().get_dependents(infra_id)
+        ]
 
-    def assess_impact(self, infra_id: str) -> Dict:
+    def assess_impact(self, infra_id: str, max_depth: int = 1) -> Dict:
         """
         Assess cascading impact if infrastructure is compromised.
+
+        Follows dependents up to `max_depth` hops; an asset first reached
+        at depth d adds criticality * 0.5^d to the score. Results are
+        memoized until the registry changes.
         """
         if infra_id not in self.infrastructure:
             return {"error": "Infrastructure not found"}
 
+        memo = self._cached("impact_memo", dict)
+        key = (infra_id, max_depth)
+        if key not in memo:
+            memo[key] = self._build_impact(infra_id, max_depth)
+        return dict(memo[key])
+
+    def _build_impact(self, infra_id: str, max_depth: int) -> Dict:
         primary = self.infrastructure[infra_id]
-        dependents = self.get_dependencies(infra_id)
+        cascade = self.get_dependency_graph().cascade(infra_id, max_depth)
+        dependents = [self.infrastructure[dep_id] for dep_id, _ in cascade]
 
         # Calculate impact score
         impact_score = primary.criticality
-        for dep in dependents:
-            impact_score += dep.criticality * 0.5
+        for dep, (_, depth) in zip(dependents, cascade):
+            impact_score += dep.criticality * self.CASCADE_DECAY ** depth
 
         affected_commodities = set()
         affected_operators = {primary.operator}
@@ -400,11 +490,43 @@ class InfrastructureMonitor:
             "infrastructure": primary.to_dict(),
             "impact_score": round(impact_score, 1),
             "dependent_assets": [d.to_dict() for d in dependents],
+            "cascade": [{"id": dep_id, "depth": depth} for dep_id, depth in cascade],
             "affected_commodities": list(affected_commodities),
             "affected_operators": list(affected_operators),
             "assessment": self._get_impact_level(impact_score)
         }
 
+    def assess_all_impacts(self, max_depth: Optional[int] = 3) -> List[Dict]:
+        """
+        Impact score for every asset, highest first.
+
+        Computed in one reverse-topological pass over the dependency
+        graph instead of one traversal per asset; memoized until the
+        registry changes.
+        """
+        def build():
+            cascades = self.get_dependency_graph().all_cascades(max_depth)
+            scores = []
+            for infra_id, infra in self.infrastructure.items():
+                reached = cascades.get(infra_id, {})
+                score = infra.criticality + sum(
+                    self.infrastructure[dep_id].criticality * self.CASCADE_DECAY ** depth
+                    for dep_id, depth in reached.items()
+                    if dep_id in self.infrastructure
+                )
+                scores.append({
+                    "id": infra_id,
+                    "name": infra.name,
+                    "impact_score": round(score, 1),
+                    "dependent_count": len(reached),
+                    "max_depth": max(reached.values(), default=0),
+                    "assessment": self._get_impact_level(score)
+                })
+            scores.sort(key=lambda s: s["impact_score"], reverse=True)
+            return scores
+
+        return list(self._cached(f"all_impacts:{max_depth}", build))
+
     def _get_impact_level(self, score: float) -> str:
         if score >= 10:
             return "CRITICAL - Major port disruption"
@@ -442,40 +564,23 @@ class InfrastructureMonitor:
         """
         Analyze scanner transcript for infrastructure-related mentions.
         """
-        text_lower = text.lower()
+        scan = get_transcript_matcher()
         matches = []
 
-        # Keywords for each infrastructure
-        infra_keywords = {
-            "seagirt": ["seagirt", "container terminal"],
-            "dundalk": ["dundalk", "auto terminal"],
-            "cnx_coal": ["curtis bay", "coal terminal", "cnx"],
-            "howard_street_tunnel": ["howard street", "tunnel"],
-            "key_bridge": ["key bridge", "bridge clearance"],
-            "channel_patapsco": ["channel", "ship channel", "patapsco"],
-            "bayview_yard": ["bayview", "csx yard"],
-        }
-
         # Check for matches
-        for infra_id, keywords in infra_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                infra = self.infrastructure.get(infra_id)
-                if infra:
-                    matches.append({
-                        "infrastructure_id": infra_id,
-                        "infrastructure_name": infra.name,
-                        "type": infra.type.value,
-                        "criticality": infra.criticality,
-                        "matched_text": text
-                    })
+        for infra_id in scan.matches(text, "infra"):
+            infra = self.infrastructure.get(infra_id)
+            if infra:
+                matches.append({
+                    "infrastructure_id": infra_id,
+                    "infrastructure_name": infra.name,
+                    "type": infra.type.value,
+                    "criticality": infra.criticality,
+                    "matched_text": text
+                })
 
         # Check for emergency keywords
-        emergency_keywords = [
-            "emergency", "fire", "collision", "derailment",
-            "spill", "explosion", "evacuation", "closure"
-        ]
-
-        if any(kw in text_lower for kw in emergency_keywords):
+        if "emergency" in scan.scan(text):
             for match in matches:
                 match["emergency_detected"] = True
 
@@ -489,33 +594,35 @@ class InfrastructureMonitor:
         """
         Find infrastructure near a vessel's position.
         """
-        from math import radians, sin, cos, sqrt, atan2
-
-        def haversine(lat1, lon1, lat2, lon2):
-            """Calculate distance in nautical miles."""
-            R = 3440.065  # Earth radius in nm
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * atan2(sqrt(a), sqrt(1-a))
-            return R * c
-
-        vessel_lat = vessel.get("lat", vessel.get("latitude", 0))
-        vessel_lon = vessel.get("lon", vessel.get("longitude", 0))
-
-        nearby = []
-        for infra in self.infrastructure.values():
-            distance = haversine(vessel_lat, vessel_lon, infra.lat, infra.lon)
-            if distance <= proximity_nm:
-                nearby.append({
-                    "infrastructure": infra.to_dict(),
+        return self.correlate_vessels_with_infrastructure([vessel], proximity_nm)[0]
+
+    def correlate_vessels_with_infrastructure(
+        self,
+        vessels: List[Dict],
+        proximity_nm: float = 1.0
+    ) -> List[List[Dict]]:
+        """
+        Find infrastructure near many vessels in one pass.
+
+        Returns one list of matches per input vessel (same order), each
+        sorted by distance.
+        """
+        index = self.get_spatial_index()
+        lats = [v.get("lat", v.get("latitude", 0)) for v in vessels]
+        lons = [v.get("lon", v.get("longitude", 0)) for v in vessels]
+
+        results = []
+        for vessel, hits in zip(vessels, index.query_batch(lats, lons, proximity_nm)):
+            results.append([
+                {
+                    "infrastructure": self.infrastructure[index.ids[i]].to_dict(),
                     "distance_nm": round(distance, 2),
                     "vessel_mmsi": vessel.get("mmsi"),
                     "vessel_name": vessel.get("name", "Unknown")
-                })
-
-        return sorted(nearby, key=lambda x: x["distance_nm"])
+                }
+                for i, distance in hits
+            ])
+        return results
 
     def get_status_report(self) -> Dict:
         """Generate infrastructure status report."""
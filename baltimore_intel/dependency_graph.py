@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Infrastructure Dependency Graph
+
+Reverse-adjacency view of the infrastructure registry: for each asset,
+the assets that list it in their `dependencies`. Built once per
+registry version and used for:
+- O(1) direct-dependent lookups
+- bounded breadth-first cascades from a single asset
+- cascade depths for every asset in one pass over the condensation
+  (strongly connected components in reverse topological order), so
+  dependency cycles such as terminal <-> rail spur are handled exactly
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class DependencyGraph:
+    """Asset -> dependents graph with cascade queries."""
+
+    def __init__(self, registry: Dict):
+        # Registry order is kept so results match a linear registry scan
+        self.dependents: Dict[str, List[str]] = {asset_id: [] for asset_id in registry}
+        for infra in registry.values():
+            for provider in infra.dependencies or []:
+                self.dependents.setdefault(provider, []).append(infra.id)
+
+    def get_dependents(self, asset_id: str) -> List[str]:
+        """Assets that directly depend on `asset_id`."""
+        return self.dependents.get(asset_id, [])
+
+    def cascade(self, source: str, max_depth: Optional[int] = 1) -> List[Tuple[str, int]]:
+        """
+        (asset id, depth) for every asset reached from `source` within
+        `max_depth` hops (None: unbounded), at its shortest depth.
+        Ordered by depth, then registry order.
+        """
+        seen = {source}
+        reached = []
+        frontier = deque([(source, 0)])
+        while frontier:
+            node, depth = frontier.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for dependent in self.get_dependents(node):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    reached.append((dependent, depth + 1))
+                    frontier.append((dependent, depth + 1))
+        return reached
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """
+        Tarjan's algorithm (iterative). Components come out in reverse
+        topological order: a component is emitted after every component
+        it reaches through dependent edges.
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in self.dependents:
+            if root in index:
+                continue
+            work = [(root, iter(self.get_dependents(root)))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.get_dependents(child))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def all_cascades(self, max_depth: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Shortest cascade depth from every asset to everything it reaches
+        (within `max_depth`), computed in one reverse-topological pass.
+
+        Depths of a component's external dependents are merged from the
+        already-computed maps of the components it feeds, offset by the
+        intra-component distance to the exit edge.
+        """
+        depths: Dict[str, Dict[str, int]] = {}
+
+        for component in self.strongly_connected_components():
+            members = set(component)
+            for node in component:
+                # Shortest paths within the component
+                inner = {node: 0}
+                frontier = deque([node])
+                while frontier:
+                    current = frontier.popleft()
+                    for child in self.get_dependents(current):
+                        if child in members and child not in inner:
+                            inner[child] = inner[current] + 1
+                            frontier.append(child)
+
+                reach = {
+                    member: depth for member, depth in inner.items()
+                    if member != node and (max_depth is None or depth <= max_depth)
+                }
+                for member, offset in inner.items():
+                    for child in self.get_dependents(member):
+                        if child in members:
+                            continue
+                        base = offset + 1
+                        if max_depth is not None and base > max_depth:
+                            continue
+                        candidates = [(child, 0)]
+                        candidates.extend(depths[child].items())
+                        for target, depth in candidates:
+                            total = base + depth
+                            if target == node or (max_depth is not None and total > max_depth):
+                                continue
+                            if total < reach.get(target, total + 1):
+                                reach[target] = total
+                depths[node] = reach
+
+        return depths
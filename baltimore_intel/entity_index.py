@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Entity Inverted Index
+
+Maps normalized entities (MMSI, vessel names, infrastructure ids,
+operators, scanner categories) to the retained events that mention
+them, so entity lookups never scan the whole store:
+- postings: entity -> events, in ingest order
+- per-minute entity counters for "most mentioned in the last N hours"
+
+Entries are added on ingest and dropped through the event store's evict
+listener, giving the index the same retention as the store. Entities are
+normalized with event_archive.normalize_entity, matching archive lookups.
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from event_archive import normalize_entity
+from event_time import minute_bucket
+
+
+def event_entities(event) -> List[str]:
+    """Distinct normalized entities of an event, skipping blanks."""
+    seen = []
+    for entity in event.entities or []:
+        if entity is None:
+            continue
+        key = normalize_entity(entity)
+        if key and key not in seen:
+            seen.append(key)
+    return seen
+
+
+class EntityIndex:
+    """Inverted index from entity to retained events."""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, object]] = {}
+        self._minutes: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, event):
+        """Index an event under each of its entities."""
+        entities = event_entities(event)
+        if not entities:
+            return
+        minute = minute_bucket(event.timestamp)
+        with self._lock:
+            counts = self._minutes.get(minute)
+            if counts is None:
+                counts = self._minutes[minute] = Counter()
+            for entity in entities:
+                postings = self._postings.get(entity)
+                if postings is None:
+                    postings = self._postings[entity] = {}
+                if event.id not in postings:
+                    counts[entity] += 1
+                postings[event.id] = event
+
+    def remove(self, events):
+        """Drop events from the index (store evict listener)."""
+        with self._lock:
+            for event in events:
+                minute = minute_bucket(event.timestamp)
+                counts = self._minutes.get(minute)
+                for entity in event_entities(event):
+                    postings = self._postings.get(entity)
+                    if postings is None or postings.pop(event.id, None) is None:
+                        continue
+                    if not postings:
+                        del self._postings[entity]
+                    if counts is not None:
+                        counts[entity] -= 1
+                        if counts[entity] <= 0:
+                            del counts[entity]
+                if counts is not None and not counts:
+                    del self._minutes[minute]
+
+    def events(
+        self,
+        entity: str,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List:
+        """Events mentioning an entity, oldest first (newest `limit` kept)."""
+        with self._lock:
+            postings = list(self._postings.get(normalize_entity(entity), {}).values())
+        if since is not None:
+            postings = [e for e in postings if e.timestamp >= since]
+        postings.sort(key=lambda e: e.timestamp)
+        if limit is not None:
+            postings = postings[-limit:] if limit > 0 else []
+        return postings
+
+    def top(self, since: datetime, n: int = 10) -> List[Tuple[str, int]]:
+        """(entity, event count) for the most mentioned entities since a time."""
+        start = minute_bucket(since)
+        combined: Counter = Counter()
+        with self._lock:
+            for minute, counts in self._minutes.items():
+                if minute >= start:
+                    combined.update(counts)
+        return combined.most_common(n)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._minutes.clear()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Queryable On-Disk Event Archive
+
+Long-term, indexed history of hub events in SQLite (WAL mode):
+- events(seq, id, ts, event_type, severity, data) with indexes on
+  (ts), (event_type, ts) and (severity, ts); each also carries the
+  rowid, so the (ts, seq) keyset order is read straight off the index
+- event_entities(entity, ts, seq) join table for entity lookups
+
+Writes are buffered and committed in batches by a background thread so
+ingest never waits on disk. Reads use per-thread connections and run
+concurrently with the writer (WAL). Queries push time, type, severity
+and entity filters into SQL and page with an opaque keyset cursor
+instead of OFFSET, so page N costs the same as page 1.
+"""
+
+import base64
+import json
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    ts REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events (event_type, ts);
+CREATE INDEX IF NOT EXISTS idx_events_severity_ts ON events (severity, ts);
+CREATE TABLE IF NOT EXISTS event_entities (
+    entity TEXT NOT NULL,
+    ts REAL NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (entity, ts, seq)
+) WITHOUT ROWID;
+"""
+
+UPSERT_EVENT = """
+INSERT INTO events (id, ts, event_type, severity, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET data = excluded.data, severity = excluded.severity
+RETURNING seq
+"""
+
+MAX_PAGE_SIZE = 1000
+
+
+def normalize_entity(entity) -> str:
+    """Canonical form used to index and look up entities."""
+    return str(entity).strip().lower()
+
+
+def encode_cursor(ts: float, seq: int) -> str:
+    return base64.urlsafe_b64encode(f"{ts!r}:{seq}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Raises ValueError for malformed cursors."""
+    try:
+        ts, seq = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(ts), int(seq)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class EventArchive:
+    """SQLite-backed event history with batched writes and keyset paging."""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._pending: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self._flushed = threading.Condition()
+        self._written = 0
+        self._submitted = 0
+
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="event-archive", daemon=True)
+        self._writer.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ===========================================
+    # WRITES
+    # ===========================================
+
+    def add(self, event):
+        """
+        Queue an event (anything with to_dict()) for archiving. It is
+        serialized on the writer thread; adding the same id again
+        replaces its stored data (correlation updates).
+        """
+        with self._flushed:
+            self._submitted += 1
+        self._pending.put(event)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything queued so far is committed."""
+        target = self._submitted
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self):
+        self.flush()
+        self._pending.put(None)
+        self._writer.join(5.0)
+
+    def _write_loop(self):
+        conn = self._connection()
+        while True:
+            first = self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._pending.put(None)
+                    break
+                batch.append(item)
+
+            try:
+                self._write_batch(conn, batch)
+            except Exception as e:
+                conn.rollback()
+                print(f"Event archive write error: {e}")
+            with self._flushed:
+                self._written += len(batch)
+                self._flushed.notify_all()
+
+    def _write_batch(self, conn: sqlite3.Connection, items: List):
+        with conn:
+            for item in items:
+                event = item.to_dict()
+                ts = datetime.fromisoformat(event["timestamp"]).timestamp()
+                seq = conn.execute(UPSERT_EVENT, (
+                    event["id"], ts, event["event_type"], event["severity"],
+                    json.dumps(event, default=str)
+                )).fetchone()[0]
+                entities = {normalize_entity(e) for e in event.get("entities") or []}
+                if entities:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO event_entities (entity, ts, seq) VALUES (?, ?, ?)",
+                        [(entity, ts, seq) for entity in entities]
+                    )
+
+    # ===========================================
+    # QUERIES
+    # ===========================================
+
+    def query(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        event_types: Optional[Iterable[str]] = None,
+        severities: Optional[Iterable[str]] = None,
+        entity: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        newest_first: bool = True
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Return (events, next_cursor). Pass next_cursor back to get the
+        following page; it is None on the last page.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        table = "events e"
+        where: List[str] = []
+        params: List = []
+
+        if entity:
+            table = "event_entities x JOIN events e ON e.seq = x.seq"
+            where.append("x.entity = ?")
+            params.append(normalize_entity(entity))
+            ts_col = "x.ts"
+        else:
+            ts_col = "e.ts"
+
+        if start is not None:
+            where.append(f"{ts_col} >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            where.append(f"{ts_col} <= ?")
+            params.append(end.timestamp())
+
+        types = list(event_types or [])
+        if types:
+            where.append(f"e.event_type IN ({','.join('?' * len(types))})")
+            params.extend(types)
+        levels = list(severities or [])
+        if levels:
+            where.append(f"e.severity IN ({','.join('?' * len(levels))})")
+            params.extend(levels)
+
+        if cursor:
+            ts, seq = decode_cursor(cursor)
+            where.append(f"({ts_col}, e.seq) {'<' if newest_first else '>'} (?, ?)")
+            params.extend([ts, seq])
+
+        direction = "DESC" if newest_first else "ASC"
+        sql = (
+            f"SELECT e.data, {ts_col}, e.seq FROM {table}"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + f" ORDER BY {ts_col} {direction}, e.seq {direction} LIMIT ?"
+        )
+        params.append(limit + 1)
+
+        rows = self._connection().execute(sql, params).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][2])
+        return [json.loads(row[0]) for row in rows], next_cursor
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM events").fetchone()[0]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Viewport Index for Located Events
+
+Uniform lat/lon grid over every retained event that has a position, so
+the map can ask for one viewport instead of every event:
+- each cell keeps its events sorted by timestamp, so a `since` filter is
+  a bisect per cell rather than a scan
+- GeoJSON features are built once, when the event is indexed
+- entries leave the grid through the event store's evict listener, so
+  the index never outlives store retention
+- at low zoom, events are aggregated server-side into one cluster
+  feature per screen-sized cell, keeping the payload bounded by the
+  viewport rather than by the number of events in it
+
+Bounding boxes use the GeoJSON order: min_lon, min_lat, max_lon, max_lat.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BBox = Tuple[float, float, float, float]
+
+# Fine grid cell edge in degrees (~0.6 nm of latitude)
+CELL_DEG = 0.01
+# Zoom levels below this return clusters instead of individual events
+CLUSTER_MAX_ZOOM = 12
+# Cluster cell edge in screen pixels (256 px web-mercator tiles)
+CLUSTER_PIXELS = 64
+
+SEVERITY_RANK = {"info": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+
+
+def parse_bbox(value: str) -> BBox:
+    """Parse "min_lon,min_lat,max_lon,max_lat". Raises ValueError."""
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError(f"bbox needs 4 numbers, got {len(parts)}")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox minimums exceed maximums")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def event_position(event) -> Optional[Tuple[float, float]]:
+    """(lat, lon) of an event, or None when it has no usable location."""
+    location = event.location
+    if not location:
+        return None
+    try:
+        lat = float(location.get("lat"))
+        lon = float(location.get("lon"))
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(lat) or math.isnan(lon):
+        return None
+    return lat, lon
+
+
+def event_feature(event, lat: float, lon: float) -> Dict:
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {
+            "id": event.id,
+            "title": event.title,
+            "type": event.event_type.value,
+            "severity": event.severity,
+            "timestamp": event.timestamp.isoformat(),
+            "source": event.source
+        }
+    }
+
+
+class _Cell:
+    """Events of one grid cell, sorted by (timestamp, id)."""
+
+    __slots__ = ("keys", "entries")
+
+    def __init__(self):
+        self.keys: List[Tuple[float, str]] = []
+        self.entries: List[Tuple[float, float, str, str, Dict]] = []  # lat, lon, type, severity, feature
+
+
+class EventGeoIndex:
+    """Grid of located events with viewport queries and clustering."""
+
+    def __init__(self, cell_deg: float = CELL_DEG):
+        self.cell_deg = cell_deg
+        self._cells: Dict[Tuple[int, int], _Cell] = {}
+        self._located: Dict[str, Tuple[Tuple[int, int], Tuple[float, str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._located)
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lon / self.cell_deg), math.floor(lat / self.cell_deg)
+
+    # ===========================================
+    # MAINTENANCE
+    # ===========================================
+
+    def add(self, event):
+        """Index an event if it has a position."""
+        position = event_position(event)
+        if position is None:
+            return
+        lat, lon = position
+        cell_key = self._cell_of(lat, lon)
+        key = (event.timestamp.timestamp(), event.id)
+        entry = (lat, lon, event.event_type.value, event.severity, event_feature(event, lat, lon))
+
+        with self._lock:
+            if event.id in self._located:
+                self._discard(event.id)
+            cell = self._cells.get(cell_key)
+            if cell is None:
+                cell = self._cells[cell_key] = _Cell()
+            i = bisect_left(cell.keys, key)
+            cell.keys.insert(i, key)
+            cell.entries.insert(i, entry)
+            self._located[event.id] = (cell_key, key)
+
+    def remove(self, events):
+        """Drop events from the index (store evict listener)."""
+        with self._lock:
+            for event in events:
+                self._discard(event.id)
+
+    def _discard(self, event_id: str):
+        located = self._located.pop(event_id, None)
+        if located is None:
+            return
+        cell_key, key = located
+        cell = self._cells[cell_key]
+        i = bisect_left(cell.keys, key)
+        if i < len(cell.keys) and cell.keys[i] == key:
+            del cell.keys[i]
+            del cell.entries[i]
+        if not cell.keys:
+            del self._cells[cell_key]
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self._located.clear()
+
+    # ===========================================
+    # QUERIES
+    # ===========================================
+
+    def _iter_entries(self, bbox: Optional[BBox], since: Optional[datetime]) -> Iterator[Tuple]:
+        """Entries inside bbox at or after since. Caller holds the lock."""
+        start = (since.timestamp(), "") if since is not None else None
+
+        if bbox is None:
+            cells = self._cells.values()
+        else:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            x0, y0 = self._cell_of(min_lat, min_lon)
+            x1, y1 = self._cell_of(max_lat, max_lon)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+                # Viewport spans more cells than are occupied
+                cells = [
+                    cell for (x, y), cell in self._cells.items()
+                    if x0 <= x <= x1 and y0 <= y <= y1
+                ]
+            else:
+                cells = [
+                    self._cells[(x, y)]
+                    for x in range(x0, x1 + 1)
+                    for y in range(y0, y1 + 1)
+                    if (x, y) in self._cells
+                ]
+
+        for cell in cells:
+            first = bisect_left(cell.keys, start) if start is not None else 0
+            for entry in cell.entries[first:]:
+                if bbox is not None and not (
+                    bbox[1] <= entry[0] <= bbox[3] and bbox[0] <= entry[1] <= bbox[2]
+                ):
+                    continue
+                yield entry
+
+    def features(self, bbox: Optional[BBox] = None, since: Optional[datetime] = None) -> List[Dict]:
+        """Point features for every located event in the viewport."""
+        with self._lock:
+            found = list(self._iter_entries(bbox, since))
+        found.sort(key=lambda entry: entry[4]["properties"]["timestamp"])
+        return [entry[4] for entry in found]
+
+    def clusters(
+        self,
+        zoom: int,
+        bbox: Optional[BBox] = None,
+        since: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        One feature per occupied screen cell at `zoom`: single events are
+        returned as-is, groups as a cluster point at their centroid with
+        a count, top severity and per-type counts.
+        """
+        size = 360.0 / (2 ** max(zoom, 0)) * CLUSTER_PIXELS / 256.0
+        groups: Dict[Tuple[int, int], list] = {}
+        with self._lock:
+            for entry in self._iter_entries(bbox, since):
+                key = (math.floor(entry[1] / size), math.floor(entry[0] / size))
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [1, entry[0], entry[1], entry[3], Counter({entry[2]: 1}), entry]
+                    continue
+                group[0] += 1
+                group[1] += entry[0]
+                group[2] += entry[1]
+                if SEVERITY_RANK.get(entry[3], 0) > SEVERITY_RANK.get(group[3], 0):
+                    group[3] = entry[3]
+                group[4][entry[2]] += 1
+
+        features = []
+        for count, lat_sum, lon_sum, severity, types, first in groups.values():
+            if count == 1:
+                features.append(first[4])
+                continue
+            features.append({
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [round(lon_sum / count, 6), round(lat_sum / count, 6)]
+                },
+                "properties": {
+                    "cluster": True,
+                    "point_count": count,
+                    "severity": severity,
+                    "types": dict(types)
+                }
+            })
+        return features
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Append-Only Segmented Event Journal
+
+Makes hub state survive restarts:
+- every record is appended to the active segment as
+  [length:u32][crc32:u32][body], body = marshal bytes of (kind, payload)
+- segments rotate once they reach `segment_bytes`
+- compaction writes a snapshot of the live state covering every segment
+  before a rotation point, then deletes those segments
+- replay reads the latest snapshot plus later segments through mmap and
+  stops at the first torn or corrupt record (a crash mid-write), which
+  is truncated away before new appends
+
+The journal stores opaque records; callers decide what a kind means.
+marshal is used for payloads because it round-trips plain Python data
+several times faster than JSON; payloads must be built from core types
+(str, int, float, None, bool, list, tuple, dict).
+"""
+
+import marshal
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+HEADER = struct.Struct("<II")
+MARSHAL_VERSION = 4
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{10})\.log$")
+SNAPSHOT_PATTERN = re.compile(r"^snapshot-(\d{10})\.snap$")
+
+Record = Tuple[int, Any]
+
+
+def encode_record(kind: int, payload: Any) -> bytes:
+    body = marshal.dumps((kind, payload), MARSHAL_VERSION)
+    return HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def iter_records(path: Path) -> Iterator[Record]:
+    """
+    Yield every intact record of a segment or snapshot file.
+
+    The generator's return value (`valid = yield from iter_records(p)`)
+    is the offset just past the last intact record.
+    """
+    size = path.stat().st_size
+    if size == 0:
+        return 0
+
+    offset = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        unpack = HEADER.unpack_from
+        header_size = HEADER.size
+        crc32 = zlib.crc32
+        loads = marshal.loads
+        while offset + header_size <= size:
+            length, crc = unpack(data, offset)
+            start = offset + header_size
+            end = start + length
+            if end > size:
+                break
+            body = data[start:end]
+            if crc32(body) != crc:
+                break
+            offset = end
+            yield loads(body)
+    return offset
+
+
+class EventJournal:
+    """Segmented append-only record log with snapshot compaction."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = False
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment_seq = 0
+        self._segment_size = 0
+        self.bytes_since_snapshot = 0
+
+    # ===========================================
+    # FILES
+    # ===========================================
+
+    def _segments(self) -> List[Tuple[int, Path]]:
+        found = []
+        for path in self.directory.iterdir():
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    def _latest_snapshot(self) -> Optional[Tuple[int, Path]]:
+        found = []
+        for path in self.directory.iterdir():
+            match = SNAPSHOT_PATTERN.match(path.name)
+            if match:
+                found.append((int(match.group(1)), path))
+        return max(found) if found else None
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"segment-{seq:010d}.log"
+
+    def _open_segment(self, seq: int):
+        if self._file is not None:
+            self._file.close()
+        path = self._segment_path(seq)
+        self._file = open(path, "ab")
+        self._segment_seq = seq
+        self._segment_size = path.stat().st_size
+
+    # ===========================================
+    # REPLAY
+    # ===========================================
+
+    def replay(self) -> Iterator[Record]:
+        """
+        Yield every durable record: the latest snapshot, then segments
+        written after it. Truncates a torn tail and opens the journal
+        for appending afterwards.
+        """
+        snapshot = self._latest_snapshot()
+        first_seq = 0
+        if snapshot is not None:
+            first_seq = snapshot[0]
+            yield from iter_records(snapshot[1])
+
+        segments = [(seq, path) for seq, path in self._segments() if seq >= first_seq]
+        for seq, path in segments:
+            valid = yield from iter_records(path)
+            self.bytes_since_snapshot += valid
+            if valid < path.stat().st_size:
+                with open(path, "r+b") as f:
+                    f.truncate(valid)
+
+        with self._lock:
+            last_seq = segments[-1][0] if segments else first_seq
+            self._open_segment(last_seq)
+
+    def records(self) -> Iterator[Record]:
+        """
+        Yield every intact record like replay(), but read-only: torn
+        tails are skipped, not truncated, and nothing is opened for
+        appending (for offline tools reading another process's journal).
+        """
+        snapshot = self._latest_snapshot()
+        first_seq = 0
+        if snapshot is not None:
+            first_seq = snapshot[0]
+            yield from iter_records(snapshot[1])
+        for seq, path in self._segments():
+            if seq >= first_seq:
+                yield from iter_records(path)
+
+    # ===========================================
+    # APPEND
+    # ===========================================
+
+    def append(self, kind: int, payload: Any):
+        """Append one record, rotating the segment when full."""
+        data = encode_record(kind, payload)
+        with self._lock:
+            if self._file is None:
+                # Not replayed: never append after a possibly torn tail
+                segments = self._segments()
+                self._open_segment(segments[-1][0] + 1 if segments else 0)
+            elif self._segment_size + len(data) > self.segment_bytes and self._segment_size:
+                self._open_segment(self._segment_seq + 1)
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._segment_size += len(data)
+            self.bytes_since_snapshot += len(data)
+
+    def rotate(self) -> int:
+        """
+        Start a new segment and return its sequence number. Everything
+        before it can then be replaced by write_snapshot(seq, ...).
+        """
+        with self._lock:
+            if self._file is None:
+                segments = self._segments()
+                self._segment_seq = segments[-1][0] if segments else 0
+            self._open_segment(self._segment_seq + 1)
+            self.bytes_since_snapshot = 0
+            return self._segment_seq
+
+    def write_snapshot(self, seq: int, records: Iterable[Record]):
+        """
+        Persist `records` as the state before segment `seq`, then drop
+        the segments and snapshots it supersedes.
+        """
+        path = self.directory / f"snapshot-{seq:010d}.snap"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            for kind, payload in records:
+                f.write(encode_record(kind, payload))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+        for old_seq, old_path in self._segments():
+            if old_seq < seq:
+                old_path.unlink()
+        for old in self.directory.glob("snapshot-*.snap"):
+            match = SNAPSHOT_PATTERN.match(old.name)
+            if match and int(match.group(1)) < seq:
+                old.unlink()
+
+    def sync(self):
+        """Flush and fsync the active segment."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Time-Indexed Event Store for the Intelligence Hub
+
+Keeps hub events in per-type buckets ordered by timestamp so that
+time-range queries bisect straight to the window instead of scanning
+every event ever ingested.
+
+Retention is bounded two ways:
+- by age (events older than max_age are dropped)
+- by count (the oldest events are dropped once max_events is exceeded)
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class _Bucket:
+    """Time-ordered events of a single type.
+
+    Evictions always remove from the front, so instead of shifting the
+    list on every eviction we advance `start` and compact occasionally.
+    """
+
+    __slots__ = ("timestamps", "events", "start")
+
+    def __init__(self):
+        self.timestamps: List[datetime] = []
+        self.events: List = []
+        self.start = 0
+
+    def __len__(self):
+        return len(self.events) - self.start
+
+    def add(self, event):
+        ts = event.timestamp
+        if not self.timestamps or ts >= self.timestamps[-1]:
+            self.timestamps.append(ts)
+            self.events.append(event)
+            return
+        # Out-of-order arrival: keep the bucket sorted
+        idx = bisect_right(self.timestamps, ts, lo=self.start)
+        self.timestamps.insert(idx, ts)
+        self.events.insert(idx, event)
+
+    def oldest(self) -> Optional[datetime]:
+        if self.start < len(self.timestamps):
+            return self.timestamps[self.start]
+        return None
+
+    def pop_oldest(self):
+        event = self.events[self.start]
+        self.events[self.start] = None
+        self.start += 1
+        self._maybe_compact()
+        return event
+
+    def pop_before(self, cutoff: datetime) -> List:
+        idx = bisect_left(self.timestamps, cutoff, lo=self.start)
+        if idx == self.start:
+            return []
+        evicted = self.events[self.start:idx]
+        for i in range(self.start, idx):
+            self.events[i] = None
+        self.start = idx
+        self._maybe_compact()
+        return evicted
+
+    def remove(self, event) -> bool:
+        lo = bisect_left(self.timestamps, event.timestamp, lo=self.start)
+        hi = bisect_right(self.timestamps, event.timestamp, lo=lo)
+        for i in range(lo, hi):
+            if self.events[i] is event:
+                del self.timestamps[i]
+                del self.events[i]
+                return True
+        return False
+
+    def window(self, start: Optional[datetime], end: Optional[datetime]) -> List:
+        lo = self.start if start is None else bisect_left(self.timestamps, start, lo=self.start)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end, lo=lo)
+        return self.events[lo:hi]
+
+    def _maybe_compact(self):
+        if self.start > 1024 and self.start * 2 > len(self.events):
+            del self.timestamps[:self.start]
+            del self.events[:self.start]
+            self.start = 0
+
+
+class EventStore:
+    """
+    Bounded, time-indexed storage for IntelEvents.
+
+    Events are bucketed by event_type; each bucket is sorted by timestamp.
+    Range queries bisect each requested bucket and merge the slices, so
+    their cost depends on the size of the window, not the store.
+    """
+
+    def __init__(
+        self,
+        max_age: Optional[timedelta] = timedelta(hours=72),
+        max_events: Optional[int] = 200000
+    ):
+        self.max_age = max_age
+        self.max_events = max_events
+        self._buckets: Dict = {}
+        self._by_id: Dict[str, object] = {}
+        self._evict_listeners: List[Callable[[List], None]] = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.range())
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._by_id
+
+    def add_evict_listener(self, callback: Callable[[List], None]):
+        """Register a callback invoked with every batch of evicted events."""
+        self._evict_listeners.append(callback)
+
+    def add(self, event, now: Optional[datetime] = None):
+        """Insert an event and enforce retention."""
+        with self._lock:
+            bucket = self._buckets.get(event.event_type)
+            if bucket is None:
+                bucket = self._buckets[event.event_type] = _Bucket()
+            bucket.add(event)
+            self._by_id[event.id] = event
+            self.prune(now)
+
+    def extend(self, events: Iterable, now: Optional[datetime] = None):
+        """Insert many events and enforce retention once (bulk restore)."""
+        with self._lock:
+            by_id = self._by_id
+            last_type = bucket = None
+            for event in events:
+                if event.event_type is not last_type:
+                    last_type = event.event_type
+                    bucket = self._buckets.get(last_type)
+                    if bucket is None:
+                        bucket = self._buckets[last_type] = _Bucket()
+                bucket.add(event)
+                by_id[event.id] = event
+            self.prune(now)
+
+    def get(self, event_id: str):
+        """Look up an event by id."""
+        return self._by_id.get(event_id)
+
+    def remove(self, event_id: str):
+        """Remove a single event by id. Returns the removed event or None."""
+        with self._lock:
+            event = self._by_id.pop(event_id, None)
+            if event is not None:
+                self._buckets[event.event_type].remove(event)
+                self._emit_evicted([event])
+            return event
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        event_types: Optional[Iterable] = None
+    ) -> List:
+        """Return events with start <= timestamp <= end, oldest first."""
+        with self._lock:
+            if event_types is None:
+                buckets = list(self._buckets.values())
+            else:
+                buckets = [self._buckets[t] for t in event_types if t in self._buckets]
+
+            slices = [b.window(start, end) for b in buckets]
+            slices = [s for s in slices if s]
+            if not slices:
+                return []
+            if len(slices) == 1:
+                return slices[0]
+            return list(heapq.merge(*slices, key=lambda e: e.timestamp))
+
+    def since(self, cutoff: datetime, event_types: Optional[Iterable] = None) -> List:
+        """Return events at or after cutoff, oldest first."""
+        return self.range(start=cutoff, event_types=event_types)
+
+    def count(self, event_types: Optional[Iterable] = None) -> int:
+        """Number of retained events, optionally restricted to some types."""
+        with self._lock:
+            if event_types is None:
+                return len(self._by_id)
+            return sum(len(self._buckets[t]) for t in event_types if t in self._buckets)
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop events outside the retention policy. Returns count dropped."""
+        with self._lock:
+            evicted = []
+
+            if self.max_age is not None:
+                cutoff = (now or datetime.now()) - self.max_age
+                for bucket in self._buckets.values():
+                    oldest = bucket.oldest()
+                    if oldest is not None and oldest < cutoff:
+                        evicted.extend(bucket.pop_before(cutoff))
+
+            if self.max_events is not None:
+                excess = len(self._by_id) - len(evicted) - self.max_events
+                while excess > 0:
+                    bucket = min(
+                        (b for b in self._buckets.values() if len(b)),
+                        key=lambda b: b.oldest()
+                    )
+                    evicted.append(bucket.pop_oldest())
+                    excess -= 1
+
+            for event in evicted:
+                self._by_id.pop(event.id, None)
+            if evicted:
+                self._emit_evicted(evicted)
+            return len(evicted)
+
+    def clear(self):
+        """Drop all events."""
+        with self._lock:
+            evicted = list(self._by_id.values())
+            self._buckets.clear()
+            self._by_id.clear()
+            if evicted:
+                self._emit_evicted(evicted)
+
+    def _emit_evicted(self, events: List):
+        for callback in self._evict_listeners:
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"Event store eviction callback error: {e}")
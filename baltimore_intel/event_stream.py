@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Live Event Stream
+
+Backs the Server-Sent Events endpoint, so dashboards receive each new
+event once instead of re-polling the whole window:
+- every published event (and correlation update) is appended to a
+  bounded ring with a sequence number; stream ids are
+  "<epoch>-<sequence>", the epoch identifying this process, so a
+  Last-Event-ID from before a restart is recognized as unusable
+- events are serialized at most once, on first read, and the same bytes
+  are shared by every connected client; correlation updates are
+  serialized when they happen because the correlation keeps changing
+- readers resume after a Last-Event-ID at its offset from the oldest
+  sequence in the ring; if the ring has already dropped events after
+  that id (or the id is from another epoch), the reader is told to
+  refetch via a "reset" frame
+- filters are subscriptions.SubscriptionFilter, evaluated per reader
+"""
+
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional, Tuple
+
+from subscriptions import SubscriptionFilter
+
+# Frame kinds besides the event type
+UPDATE_KIND = "correlation_update"
+RESET_KIND = "reset"
+
+
+class _Entry:
+    __slots__ = ("seq", "kind", "event", "data")
+
+    def __init__(self, seq: int, kind: str, event, data: Optional[bytes]):
+        self.seq = seq
+        self.kind = kind
+        self.event = event
+        self.data = data
+
+
+class StreamBuffer:
+    """Ring of recently published events addressed by sequence number."""
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.epoch = f"{int(time.time() * 1000):x}"
+        self._entries: Deque[_Entry] = deque()
+        self._last_seq = 0
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def stream_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def parse_id(self, value: Optional[str]) -> Optional[int]:
+        """Sequence of a stream id from this epoch, else None."""
+        if not value:
+            return None
+        epoch, _, seq = value.strip().rpartition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    # ===========================================
+    # PUBLISH
+    # ===========================================
+
+    def publish(self, event):
+        """Append a new event (hub subscriber)."""
+        self._append(event.event_type.value, event, None)
+
+    def publish_update(self, event):
+        """Append a snapshot of an updated correlation."""
+        self._append(UPDATE_KIND, event, _serialize(event))
+
+    def _append(self, kind: str, event, data: Optional[bytes]):
+        with self._cond:
+            self._last_seq += 1
+            self._entries.append(_Entry(self._last_seq, kind, event, data))
+            if len(self._entries) > self.capacity:
+                self._entries.popleft()
+            self._cond.notify_all()
+
+    # ===========================================
+    # READ
+    # ===========================================
+
+    def read(
+        self,
+        after: int,
+        event_filter: Optional[SubscriptionFilter] = None,
+        limit: int = 500
+    ) -> Tuple[List[Tuple[int, str, bytes]], int, bool]:
+        """
+        Entries after sequence `after` that pass the filter, as
+        (seq, kind, json bytes). Returns (frames, new cursor, gap): the
+        cursor is the last sequence examined, and gap is True if entries
+        after `after` had already been dropped from the ring.
+        """
+        with self._cond:
+            # Sequences in the ring are contiguous, so an offset from the
+            # oldest one locates `after` without searching
+            oldest = self._entries[0].seq if self._entries else self._last_seq + 1
+            gap = after < oldest - 1
+            start = max(0, after + 1 - oldest)
+            entries = list(islice(self._entries, start, start + limit))
+            cursor = entries[-1].seq if entries else after
+
+        frames = []
+        for entry in entries:
+            if event_filter is not None and not event_filter.matches(entry.event):
+                continue
+            if entry.data is None:
+                entry.data = _serialize(entry.event)
+            frames.append((entry.seq, entry.kind, entry.data))
+        return frames, cursor, gap
+
+    def wait(self, after: int, timeout: float) -> bool:
+        """Block until something newer than `after` is published."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._last_seq > after, timeout)
+
+
+def _serialize(event) -> bytes:
+    return event.to_json()
+
+
+def sse_frame(stream_id: Optional[str], kind: str, data: bytes) -> bytes:
+    """One text/event-stream message."""
+    head = f"id: {stream_id}\n" if stream_id else ""
+    return f"{head}event: {kind}\ndata: ".encode() + data + b"\n\n"
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Event Time and Watermarks
+
+Sources report when something happened, which can be well before the
+hub sees it: AIS batches are collected over ~30 s, scanner transcripts
+arrive after transcription, and quotes are delayed. Correlating on
+arrival time mis-orders these events.
+
+- parse_event_time() normalizes source timestamps (ISO strings with or
+  without offsets, epoch seconds/milliseconds, datetimes) to the hub's
+  naive local time
+- WatermarkTracker tracks, per source, the newest event time seen minus
+  that source's allowed lateness. The hub watermark is the minimum over
+  sources that have delivered recently (idle sources don't hold it back)
+  and never moves backwards.
+
+Correlation windows close on the watermark instead of the wall clock, so
+data up to its source's allowed lateness still lands in the right
+windows, while events older than the watermark are counted as late and
+kept out of correlation rather than reopening closed windows.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple, Union
+
+# Allowed lateness by source prefix (longest matching prefix wins)
+DEFAULT_ALLOWED_LATENESS: Dict[str, timedelta] = {
+    "ais_tracker": timedelta(seconds=60),
+    "scanner_": timedelta(minutes=5),
+    "rail_scanner": timedelta(minutes=5),
+    "commodities_tracker": timedelta(minutes=15),
+    "infrastructure_monitor": timedelta(minutes=1),
+}
+DEFAULT_LATENESS = timedelta(minutes=2)
+
+# Event times further ahead of the clock than this are clamped to it
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+Lateness = Union[timedelta, float, int]
+
+
+def parse_event_time(value, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Source timestamp as a naive local datetime, or None if missing or
+    unparseable. Future times beyond MAX_CLOCK_SKEW are clamped to now.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, datetime):
+            parsed = value
+        elif isinstance(value, (int, float)):
+            # Epoch seconds, or milliseconds for values past year ~5000
+            seconds = value / 1000.0 if value > 1e11 else float(value)
+            parsed = datetime.fromtimestamp(seconds, timezone.utc)
+        else:
+            text = str(value).strip()
+            if text.endswith("Z"):
+                text = text[:-1] + "+00:00"
+            parsed = datetime.fromisoformat(text)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    if now is not None and parsed > now + MAX_CLOCK_SKEW:
+        return now
+    return parsed
+
+
+def minute_bucket(ts: datetime) -> int:
+    """Epoch minute of a timestamp, the bucket key of per-minute counters."""
+    return int(ts.timestamp() // 60)
+
+
+def _as_timedelta(value: Lateness) -> timedelta:
+    return value if isinstance(value, timedelta) else timedelta(seconds=value)
+
+
+class WatermarkTracker:
+    """Per-source event-time progress and the combined watermark."""
+
+    def __init__(
+        self,
+        allowed_lateness: Optional[Dict[str, Lateness]] = None,
+        default_lateness: Lateness = DEFAULT_LATENESS,
+        idle_timeout: timedelta = timedelta(minutes=10)
+    ):
+        lateness = dict(DEFAULT_ALLOWED_LATENESS)
+        lateness.update({k: _as_timedelta(v) for k, v in (allowed_lateness or {}).items()})
+        self._prefixes = sorted(lateness.items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_lateness = _as_timedelta(default_lateness)
+        self.idle_timeout = idle_timeout
+        self._lateness_cache: Dict[str, timedelta] = {}
+        # source -> (max event time, last arrival)
+        self._sources: Dict[str, Tuple[datetime, datetime]] = {}
+        self._watermark: Optional[datetime] = None
+        self.late_events: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def lateness_for(self, source: str) -> timedelta:
+        lateness = self._lateness_cache.get(source)
+        if lateness is None:
+            lateness = next(
+                (value for prefix, value in self._prefixes if source.startswith(prefix)),
+                self.default_lateness
+            )
+            self._lateness_cache[source] = lateness
+        return lateness
+
+    def observe(self, source: str, event_time: datetime, arrival: datetime) -> bool:
+        """
+        Record an event. Returns False if it is late: older than the
+        watermark, so the windows it belongs to have already closed.
+        """
+        with self._lock:
+            on_time = self._watermark is None or event_time >= self._watermark
+            if not on_time:
+                self.late_events[source] = self.late_events.get(source, 0) + 1
+
+            seen = self._sources.get(source)
+            newest = event_time if seen is None else max(seen[0], event_time)
+            self._sources[source] = (newest, arrival)
+            self._advance(arrival)
+            return on_time
+
+    def _advance(self, arrival: datetime):
+        horizon = arrival - self.idle_timeout
+        candidates = [
+            newest - self.lateness_for(source)
+            for source, (newest, last_arrival) in self._sources.items()
+            if last_arrival >= horizon
+        ]
+        if candidates:
+            candidate = min(candidates)
+            if self._watermark is None or candidate > self._watermark:
+                self._watermark = candidate
+
+    def current(self, arrival: Optional[datetime] = None) -> Optional[datetime]:
+        """Current watermark; passing the clock lets idle sources lapse."""
+        with self._lock:
+            if arrival is not None:
+                self._advance(arrival)
+            return self._watermark
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+                "late_events": sum(self.late_events.values()),
+                "late_by_source": dict(self.late_events),
+                "sources": {
+                    source: {
+                        "max_event_time": newest.isoformat(),
+                        "allowed_lateness_seconds": self.lateness_for(source).total_seconds()
+                    }
+                    for source, (newest, _) in self._sources.items()
+                }
+            }
+
+    def clear(self):
+        with self._lock:
+            self._sources.clear()
+            self._watermark = None
+            self.late_events.clear()
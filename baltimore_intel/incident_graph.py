@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incident Tracking over the Correlation Graph
+
+Correlations that share contributing events belong to one incident.
+Rather than re-walking correlation lists, incidents are maintained as
+connected components of a union-find over event ids:
+- each correlation unions itself with its member events
+- union by size with path halving keeps every update near O(1)
+  amortized
+- each component root carries running aggregates (members, rules,
+  severity roll-up, geographic extent, first/last seen), merged
+  smaller-into-larger on union, so listing incidents never recomputes
+
+Components are dropped once every member has left the event store
+(evict listener), keeping the same retention as the store.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from event_geo_index import SEVERITY_RANK, event_position
+
+
+class Incident:
+    """Aggregates of one connected component."""
+
+    __slots__ = (
+        "incident_id", "members", "correlations", "rules", "severity",
+        "severity_counts", "extent", "first_seen", "last_seen", "live"
+    )
+
+    def __init__(self, event):
+        self.incident_id: Optional[str] = None
+        self.members: List[str] = []
+        self.correlations: List[str] = []
+        self.rules: Dict[str, int] = {}
+        self.severity = "info"
+        self.severity_counts: Dict[str, int] = {}
+        self.extent: Optional[List[float]] = None  # min_lon, min_lat, max_lon, max_lat
+        self.first_seen: datetime = event.timestamp
+        self.last_seen: datetime = event.timestamp
+        self.live = 0
+        self.include(event)
+
+    def include(self, event):
+        """Fold a single new member into the aggregates."""
+        self.members.append(event.id)
+        self.live += 1
+        self.severity_counts[event.severity] = self.severity_counts.get(event.severity, 0) + 1
+        if SEVERITY_RANK.get(event.severity, 0) > SEVERITY_RANK.get(self.severity, 0):
+            self.severity = event.severity
+        self.first_seen = min(self.first_seen, event.timestamp)
+        self.last_seen = max(self.last_seen, event.timestamp)
+
+        position = event_position(event)
+        if position is not None:
+            lat, lon = position
+            if self.extent is None:
+                self.extent = [lon, lat, lon, lat]
+            else:
+                extent = self.extent
+                extent[0], extent[1] = min(extent[0], lon), min(extent[1], lat)
+                extent[2], extent[3] = max(extent[2], lon), max(extent[3], lat)
+
+        rule = (event.raw_data or {}).get("rule") if event.source == "correlation_engine" else None
+        if rule is not None:
+            self.correlations.append(event.id)
+            self.rules[rule] = self.rules.get(rule, 0) + 1
+            if self.incident_id is None:
+                self.incident_id = event.id
+
+    def absorb(self, other: "Incident"):
+        """Merge another component's aggregates into this one."""
+        self.members.extend(other.members)
+        self.correlations.extend(other.correlations)
+        for rule, count in other.rules.items():
+            self.rules[rule] = self.rules.get(rule, 0) + count
+        for severity, count in other.severity_counts.items():
+            self.severity_counts[severity] = self.severity_counts.get(severity, 0) + count
+        if SEVERITY_RANK.get(other.severity, 0) > SEVERITY_RANK.get(self.severity, 0):
+            self.severity = other.severity
+        if other.extent is not None:
+            if self.extent is None:
+                self.extent = list(other.extent)
+            else:
+                extent = self.extent
+                extent[0], extent[1] = min(extent[0], other.extent[0]), min(extent[1], other.extent[1])
+                extent[2], extent[3] = max(extent[2], other.extent[2]), max(extent[3], other.extent[3])
+        if other.first_seen < self.first_seen or self.incident_id is None:
+            self.incident_id = other.incident_id or self.incident_id
+        self.first_seen = min(self.first_seen, other.first_seen)
+        self.last_seen = max(self.last_seen, other.last_seen)
+        self.live += other.live
+
+    def to_dict(self) -> Dict:
+        extent = None
+        if self.extent is not None:
+            extent = dict(zip(("min_lon", "min_lat", "max_lon", "max_lat"), self.extent))
+        return {
+            "id": self.incident_id,
+            "severity": self.severity,
+            "severity_counts": dict(self.severity_counts),
+            "rules": dict(self.rules),
+            "correlations": list(self.correlations),
+            "members": list(self.members),
+            "member_count": len(self.members),
+            "extent": extent,
+            "first_seen": self.first_seen.isoformat(),
+            "last_seen": self.last_seen.isoformat()
+        }
+
+
+class IncidentTracker:
+    """Incremental union-find of correlations and their member events."""
+
+    def __init__(self):
+        self._parent: Dict[str, str] = {}
+        self._incidents: Dict[str, Incident] = {}  # root id -> aggregates
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._incidents)
+
+    def _find(self, node: str) -> str:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _node(self, event) -> str:
+        """Root of an event's component, creating a singleton if new."""
+        if event.id in self._parent:
+            return self._find(event.id)
+        self._parent[event.id] = event.id
+        self._incidents[event.id] = Incident(event)
+        return event.id
+
+    def _union(self, a: str, b: str) -> str:
+        if a == b:
+            return a
+        big, small = self._incidents[a], self._incidents[b]
+        if len(big.members) < len(small.members):
+            a, b, big, small = b, a, small, big
+        self._parent[b] = a
+        big.absorb(small)
+        del self._incidents[b]
+        return a
+
+    def link(self, correlation, members: Iterable):
+        """Union a correlation event with (newly) contributing events."""
+        with self._lock:
+            root = self._node(correlation)
+            for event in members:
+                root = self._union(root, self._node(event))
+
+    def remove(self, events: Iterable):
+        """Drop components whose members have all been evicted (evict listener)."""
+        with self._lock:
+            for event in events:
+                if event.id not in self._parent:
+                    continue
+                root = self._find(event.id)
+                incident = self._incidents[root]
+                incident.live -= 1
+                if incident.live <= 0:
+                    for member in incident.members:
+                        self._parent.pop(member, None)
+                    del self._incidents[root]
+
+    def incident_of(self, event_id: str) -> Optional[Dict]:
+        with self._lock:
+            if event_id not in self._parent:
+                return None
+            incident = self._incidents[self._find(event_id)]
+            return incident.to_dict() if incident.correlations else None
+
+    def incidents(
+        self,
+        since: Optional[datetime] = None,
+        min_severity: Optional[str] = None
+    ) -> List[Dict]:
+        """Incidents (components with a correlation), most recent first."""
+        floor = SEVERITY_RANK.get(min_severity, 0) if min_severity else 0
+        with self._lock:
+            found = [
+                incident for incident in self._incidents.values()
+                if incident.correlations
+                and (since is None or incident.last_seen >= since)
+                and SEVERITY_RANK.get(incident.severity, 0) >= floor
+            ]
+            found.sort(key=lambda incident: incident.last_seen, reverse=True)
+            return [incident.to_dict() for incident in found]
+
+    def clear(self):
+        with self._lock:
+            self._parent.clear()
+            self._incidents.clear()
@@ -15,17 +15,24 @@ threat intelligence approach.
 """
 
 import json
-from typing import Dict, List, Optional, Callable
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Callable, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import asdict
 from enum import Enum
 import threading
 import queue
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
 
 # Import all modules
 from commodities import (
     BaltimorePortCommodities,
     correlate_vessel_with_commodities,
+    get_commodity_snapshot_service,
     TRADING_PARTNERS
 )
 from scanner_feeds import (
@@ -45,6 +52,30 @@ from critical_infrastructure import (
     ThreatLevel,
     get_infrastructure_geojson
 )
+from event_store import EventStore
+from event_journal import EventJournal
+from event_archive import EventArchive, normalize_entity
+from rolling_counters import RollingCounters
+from spatiotemporal_join import SpatioTemporalJoin
+from rule_dsl import RuleSource, compile_rules
+from entity_index import EntityIndex
+from clock import Clock, SystemClock
+from event_time import Lateness, WatermarkTracker, parse_event_time
+from incident_graph import IncidentTracker
+from subscriptions import Subscription, SubscriptionFilter, SubscriptionManager
+from event_stream import RESET_KIND, StreamBuffer, sse_frame
+from event_geo_index import EventGeoIndex, CLUSTER_MAX_ZOOM, parse_bbox
+from snapshot_cache import SnapshotCache
+from correlation_window import CorrelationWindow, CorrelationCache, KeyFunction
+
+
+# Commodity → vessel types that carry it
+CARGO_VESSEL_TYPES = {
+    "coal": ["bulk_carrier"],
+    "soybeans": ["bulk_carrier"],
+    "natural_gas": ["lng_carrier", "tanker"],
+    "automobiles": ["roro", "car_carrier"],
+}
 
 
 class EventType(Enum):
@@ -58,44 +89,229 @@ class EventType(Enum):
     CORRELATION = "correlation"
 
 
-@dataclass
+_EVENT_TYPES = {t.value: t for t in EventType}
+
+# Journal record kinds
+JOURNAL_EVENT = 1    # full event
+JOURNAL_UPDATE = 2   # in-place correlation update: id, description, correlations, raw_data
+JOURNAL_EVENTS = 3   # batch of full events (snapshots)
+SNAPSHOT_BATCH = 1024
+
+# Severities listed as critical events in the situation report
+PRIORITY_SEVERITIES = ("critical", "high")
+
+
+_EVENT_FIELDS = (
+    "id", "timestamp", "event_type", "source", "title", "description",
+    "severity", "location", "entities", "raw_data", "correlations"
+)
+
+
+def _encode_raw(raw: Dict) -> bytes:
+    return json.dumps(raw, separators=(",", ":"), default=str).encode()
+
+
 class IntelEvent:
-    """Intelligence event from any source."""
-    id: str
-    timestamp: datetime
-    event_type: EventType
-    source: str
-    title: str
-    description: str
-    severity: str  # critical, high, medium, low, info
-    location: Optional[Dict] = None  # lat, lon
-    entities: Optional[List[str]] = None  # Related entities
-    raw_data: Optional[Dict] = None
-    correlations: Optional[List[str]] = None  # IDs of correlated events
+    """
+    Intelligence event from any source.
+
+    Slotted, so an event carries no per-instance __dict__. event_type is
+    the shared EventType member and severity/source are interned, so
+    events hold references to one canonical object per code instead of
+    a string each. freeze() replaces raw_data with its compact JSON
+    bytes; raw_data then decodes on every read (returning a fresh dict)
+    and to_json() splices the bytes without decoding them. The hub
+    freezes source events once correlation has run; correlation events
+    stay mutable because cooldown updates edit their raw_data in place.
+    """
+
+    __slots__ = (
+        "id", "timestamp", "event_type", "source", "title", "description",
+        "severity", "location", "entities", "_raw", "correlations"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        timestamp: datetime,
+        event_type: EventType,
+        source: str,
+        title: str,
+        description: str,
+        severity: str,  # critical, high, medium, low, info
+        location: Optional[Dict] = None,  # lat, lon
+        entities: Optional[List[str]] = None,  # Related entities
+        raw_data=None,  # dict, or pre-serialized JSON bytes
+        correlations: Optional[List[str]] = None  # IDs of correlated events
+    ):
+        self.id = id
+        self.timestamp = timestamp
+        self.event_type = event_type
+        self.source = sys.intern(source) if type(source) is str else source
+        self.title = title
+        self.description = description
+        self.severity = sys.intern(severity) if type(severity) is str else severity
+        self.location = location
+        self.entities = entities
+        self._raw = raw_data
+        self.correlations = correlations
+
+    @property
+    def raw_data(self) -> Optional[Dict]:
+        raw = self._raw
+        if type(raw) is bytes:
+            return json.loads(raw)
+        return raw
+
+    @raw_data.setter
+    def raw_data(self, value):
+        self._raw = value
+
+    @property
+    def frozen(self) -> bool:
+        return type(self._raw) is bytes
+
+    def freeze(self):
+        """Store raw_data as compact JSON bytes, decoded on demand."""
+        raw = self._raw
+        if raw is not None and type(raw) is not bytes:
+            self._raw = _encode_raw(raw)
+
+    @property
+    def raw_json(self) -> bytes:
+        """raw_data as JSON bytes, without decoding a frozen payload."""
+        raw = self._raw
+        return raw if type(raw) is bytes else _encode_raw(raw)
+
+    def __repr__(self) -> str:
+        return (
+            f"IntelEvent(id={self.id!r}, timestamp={self.timestamp!r}, "
+            f"event_type={self.event_type}, severity={self.severity!r}, title={self.title!r})"
+        )
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in _EVENT_FIELDS)
+
+    __hash__ = None
+
+    def _header(self) -> Dict:
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp.isoformat(),
+            "event_type": self.event_type.value,
+            "source": self.source,
+            "title": self.title,
+            "description": self.description,
+            "severity": self.severity,
+            "location": dict(self.location) if self.location is not None else None,
+            "entities": list(self.entities) if self.entities is not None else None,
+        }
 
     def to_dict(self):
-        d = asdict(self)
-        d['event_type'] = self.event_type.value
-        d['timestamp'] = self.timestamp.isoformat()
+        d = self._header()
+        raw = self.raw_data
+        d["raw_data"] = dict(raw) if raw is not None and raw is self._raw else raw
+        d["correlations"] = list(self.correlations) if self.correlations is not None else None
         return d
 
+    def to_json(self) -> bytes:
+        """Compact JSON of to_dict(), splicing a frozen payload as-is."""
+        d = self._header()
+        d["correlations"] = self.correlations
+        head = json.dumps(d, separators=(",", ":"), default=str).encode()
+        raw = b"null" if self._raw is None else self.raw_json
+        return head[:-1] + b',"raw_data":' + raw + b"}"
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "IntelEvent":
+        """Inverse of to_dict(). Raises KeyError/ValueError on bad input."""
+        return cls(
+            id=d["id"],
+            timestamp=datetime.fromisoformat(d["timestamp"]),
+            event_type=EventType(d["event_type"]),
+            source=d.get("source", "unknown"),
+            title=d.get("title", ""),
+            description=d.get("description", ""),
+            severity=d.get("severity", "info"),
+            location=d.get("location"),
+            entities=d.get("entities"),
+            raw_data=d.get("raw_data"),
+            correlations=d.get("correlations")
+        )
+
 
 class CorrelationRule:
-    """Rule for correlating events."""
+    """
+    Rule for correlating events.
+
+    Each rule keeps its own incremental window of matching events. The
+    condition is called with that CorrelationWindow, which can be iterated
+    like a list but also exposes running per-type counts and the keyed
+    counters declared in `keys`.
+
+    Repeat matches within `cooldown_minutes` (default: the window length)
+    extend the existing correlation instead of emitting a new one. If
+    `group_by` names one of the keyed counters, its current key set is
+    the contributing entity set, and a new set opens a new correlation.
+
+    With a `join`, a rule only fires for events the join pairs with a new
+    event (close in space and time); the correlation then covers just
+    those events, and `group_by` keys are taken from them.
+    """
 
     def __init__(
         self,
         name: str,
         event_types: List[EventType],
         time_window_minutes: int,
-        condition: Callable[[List[IntelEvent]], bool],
-        severity: str = "medium"
+        condition: Callable[[CorrelationWindow], bool],
+        severity: str = "medium",
+        keys: Optional[Dict[str, KeyFunction]] = None,
+        cooldown_minutes: Optional[int] = None,
+        group_by: Optional[str] = None,
+        join: Optional[SpatioTemporalJoin] = None
     ):
         self.name = name
         self.event_types = event_types
         self.time_window = timedelta(minutes=time_window_minutes)
         self.condition = condition
         self.severity = severity
+        self.keys = dict(keys or {})
+        self.window = CorrelationWindow(self.time_window, self.keys)
+        self.cooldown = (
+            timedelta(minutes=cooldown_minutes) if cooldown_minutes is not None
+            else self.time_window
+        )
+        self.group_by = group_by
+        self.join = join
+
+    def reset(self, events: List["IntelEvent"], now: datetime):
+        """Refill the window (and join) from already-retained events."""
+        self.window.clear()
+        if self.join is not None:
+            self.join.clear()
+        for event in events:
+            self.window.add(event)
+            if self.join is not None:
+                self.join.add(event)
+        self.window.advance(now)
+        if self.join is not None:
+            self.join.advance(now)
+
+    def entity_set(self, members: Optional[List["IntelEvent"]] = None) -> frozenset:
+        """Contributing entity set for the current window, or for `members`."""
+        if self.group_by is None:
+            return frozenset()
+        if members is None:
+            return frozenset(self.window.keys(self.group_by))
+        key_function = self.keys[self.group_by]
+        return frozenset(k for k in map(key_function, members) if k is not None)
+
+
+class IngestQueueFull(Exception):
+    """Raised when the async ingest queue is at capacity."""
 
 
 class IntelligenceHub:
@@ -104,37 +320,166 @@ class IntelligenceHub:
 
     Collects events from all sources and applies correlation rules
     to detect patterns and generate alerts.
+
+    By default events are ingested synchronously. Calling start_workers()
+    switches to async mode: create_* methods enqueue onto the bounded
+    event_queue and a pool of worker threads drains it in micro-batches.
+
+    With a journal, every event and correlation update is appended to it
+    before being applied, the hub restores its state from the journal on
+    construction, and the journal is compacted into a snapshot once
+    `snapshot_bytes` of segments accumulate.
+
+    With an archive, every event (and correlation update) is also written
+    to long-term indexed storage that outlives in-memory retention.
+
+    All "now" reads go through `clock`, so replay.py can drive the hub in
+    simulated time.
     """
 
-    def __init__(self):
-        self.events: List[IntelEvent] = []
-        self.event_queue = queue.Queue()
-        self.subscribers: List[Callable[[IntelEvent], None]] = []
+    def __init__(
+        self,
+        retention_hours: int = 72,
+        max_events: int = 200000,
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        journal: Optional[EventJournal] = None,
+        snapshot_bytes: int = 256 * 1024 * 1024,
+        archive: Optional[EventArchive] = None,
+        vessel_infra_distance_nm: float = 2.0,
+        vessel_infra_minutes: int = 30,
+        allowed_lateness: Optional[Dict[str, Lateness]] = None,
+        clock: Optional[Clock] = None,
+        default_rules: bool = True,
+        commodity_snapshot: Optional[SnapshotCache] = None,
+        stream_capacity: int = 10000
+    ):
+        self.clock = clock or SystemClock()
+        self.store = EventStore(
+            max_age=timedelta(hours=retention_hours),
+            max_events=max_events
+        )
+        # Materialized situation-report state, kept in step with the store
+        self.counters = RollingCounters()
+        self._priority_events = EventStore(max_age=None, max_events=None)
+        self.geo_index = EventGeoIndex()
+        self.entity_index = EntityIndex()
+        self.incidents = IncidentTracker()
+        self.store.add_evict_listener(self._on_evicted)
+        # Bumped on every ingest, correlation update and eviction
+        self.data_version = 0
+
+        self.event_queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.subscriptions = SubscriptionManager()
+        self.stream = StreamBuffer(stream_capacity)
+        # Events awaiting subscription delivery, which happens after the
+        # hub lock is released (a BLOCK subscriber may wait on its queue)
+        self._outbox: deque = deque()
+        self._publish_lock = threading.RLock()
         self.correlation_rules: List[CorrelationRule] = []
-        self._event_counter = 0
+        self._rules_by_type: Dict[EventType, List[CorrelationRule]] = {}
+        self.correlation_cache = CorrelationCache()
+        self.watermarks = WatermarkTracker(allowed_lateness)
+        self._event_ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+        # Async ingest state
+        self._workers: List[threading.Thread] = []
+        self._stop_workers = threading.Event()
+        self._ingest_stats = {"enqueued": 0, "processed": 0, "failed": 0, "rejected": 0, "batches": 0}
+        self._stats_lock = threading.Lock()
+        self._last_lag_seconds = 0.0
+        self._collecting = threading.local()
 
         # Initialize sub-monitors
+        self.commodity_snapshot = commodity_snapshot or get_commodity_snapshot_service()
         self.commodities = BaltimorePortCommodities()
         self.infrastructure = InfrastructureMonitor()
         self.rail = RailTracker()
+        self.rail_snapshot = SnapshotCache(
+            self.rail.get_amtrak_trains, ttl=60.0, name="amtrak-trains", default=[]
+        )
+        self.infrastructure_snapshot = SnapshotCache(
+            self.infrastructure.get_status_report, ttl=30.0, name="infrastructure-status", default={}
+        )
 
         # Register default correlation rules
-        self._register_default_rules()
+        self.vessel_infra_distance_nm = vessel_infra_distance_nm
+        self.vessel_infra_minutes = vessel_infra_minutes
+        if default_rules:
+            self._register_default_rules()
+
+        self.archive = archive
+        self.journal = journal
+        self.snapshot_bytes = snapshot_bytes
+        self._compacting = threading.Lock()
+        if journal is not None:
+            self.restore_from_journal()
+
+    @property
+    def events(self) -> List[IntelEvent]:
+        """All retained events, oldest first."""
+        return self.store.range()
+
+    def get_recent_events(
+        self,
+        hours: int = 24,
+        event_types: Optional[List[EventType]] = None
+    ) -> List[IntelEvent]:
+        """Get events from the last N hours, oldest first."""
+        cutoff = self.clock.now() - timedelta(hours=hours)
+        return self.store.since(cutoff, event_types)
+
+    def _track(self, event: IntelEvent):
+        """Update the materialized report state. Call before store.add()."""
+        self.counters.add(event)
+        self.geo_index.add(event)
+        self.entity_index.add(event)
+        if event.severity in PRIORITY_SEVERITIES:
+            self._priority_events.add(event)
+
+    def _on_evicted(self, events: List[IntelEvent]):
+        self.data_version += 1
+        self.counters.remove(events)
+        self.geo_index.remove(events)
+        self.entity_index.remove(events)
+        self.incidents.remove(events)
+        for event in events:
+            if event.severity in PRIORITY_SEVERITIES:
+                self._priority_events.remove(event.id)
 
     def _generate_event_id(self) -> str:
-        self._event_counter += 1
-        return f"evt_{datetime.now().strftime('%Y%m%d')}_{self._event_counter:06d}"
+        return f"evt_{self.clock.now().strftime('%Y%m%d')}_{next(self._event_ids):06d}"
+
+    def advance_event_ids(self, event_ids: Iterable[str]):
+        """Make generated ids continue after the highest hub id given."""
+        last_id = -1
+        for event_id in event_ids:
+            suffix = event_id.rsplit("_", 1)[-1]
+            if event_id.startswith("evt_") and suffix.isdigit():
+                last_id = max(last_id, int(suffix))
+        with self._lock:
+            current = next(self._event_ids)
+            self._event_ids = itertools.count(max(current, last_id + 1))
 
     def _register_default_rules(self):
         """Register default correlation rules."""
 
-        # Rule 1: Vessel + Infrastructure proximity
+        # Rule 1: Vessel + Infrastructure proximity (spatio-temporal join)
         self.add_correlation_rule(CorrelationRule(
             name="vessel_near_critical_infrastructure",
             event_types=[EventType.VESSEL_ARRIVAL, EventType.INFRASTRUCTURE_ALERT],
-            time_window_minutes=30,
-            condition=lambda events: self._check_vessel_infra_correlation(events),
-            severity="high"
+            time_window_minutes=self.vessel_infra_minutes,
+            condition=self._check_vessel_infra_correlation,
+            severity="high",
+            keys={"infrastructure": self._infrastructure_key},
+            group_by="infrastructure",
+            join=SpatioTemporalJoin(
+                [EventType.VESSEL_ARRIVAL], [EventType.INFRASTRUCTURE_ALERT],
+                max_distance_nm=self.vessel_infra_distance_nm,
+                max_gap=timedelta(minutes=self.vessel_infra_minutes)
+            )
         ))
 
         # Rule 2: Commodity spike + Vessel activity
@@ -142,8 +487,13 @@ class IntelligenceHub:
             name="commodity_vessel_correlation",
             event_types=[EventType.COMMODITY_ALERT, EventType.VESSEL_ARRIVAL],
             time_window_minutes=60,
-            condition=lambda events: self._check_commodity_vessel_correlation(events),
-            severity="medium"
+            condition=self._check_commodity_vessel_correlation,
+            severity="medium",
+            keys={
+                "commodity": self._commodity_key,
+                "vessel_type": self._vessel_type_key
+            },
+            group_by="commodity"
         ))
 
         # Rule 3: Scanner emergency + Infrastructure
@@ -151,8 +501,9 @@ class IntelligenceHub:
             name="scanner_infrastructure_emergency",
             event_types=[EventType.SCANNER_ALERT, EventType.INFRASTRUCTURE_ALERT],
             time_window_minutes=15,
-            condition=lambda events: self._check_scanner_infra_correlation(events),
-            severity="critical"
+            condition=self._check_scanner_infra_correlation,
+            severity="critical",
+            keys={"scanner_severity": self._scanner_severity_key}
         ))
 
         # Rule 4: Rail + Vessel correlation (cargo movement)
@@ -160,123 +511,556 @@ class IntelligenceHub:
             name="rail_vessel_cargo_movement",
             event_types=[EventType.RAIL_MOVEMENT, EventType.VESSEL_ARRIVAL],
             time_window_minutes=120,
-            condition=lambda events: self._check_rail_vessel_correlation(events),
+            condition=self._check_rail_vessel_correlation,
             severity="medium"
         ))
 
-    def _check_vessel_infra_correlation(self, events: List[IntelEvent]) -> bool:
-        """Check if vessel events correlate with infrastructure events."""
-        vessel_events = [e for e in events if e.event_type == EventType.VESSEL_ARRIVAL]
-        infra_events = [e for e in events if e.event_type == EventType.INFRASTRUCTURE_ALERT]
-        return len(vessel_events) > 0 and len(infra_events) > 0
+    @staticmethod
+    def _commodity_key(event: IntelEvent) -> Optional[str]:
+        if event.event_type == EventType.COMMODITY_ALERT and event.raw_data:
+            return event.raw_data.get("commodity", "").lower() or None
+        return None
+
+    @staticmethod
+    def _vessel_type_key(event: IntelEvent) -> Optional[str]:
+        if event.event_type == EventType.VESSEL_ARRIVAL and event.raw_data:
+            return event.raw_data.get("vessel_type", "").lower() or None
+        return None
+
+    @staticmethod
+    def _infrastructure_key(event: IntelEvent) -> Optional[str]:
+        if event.event_type == EventType.INFRASTRUCTURE_ALERT and event.entities:
+            return event.entities[0]
+        return None
+
+    @staticmethod
+    def _scanner_severity_key(event: IntelEvent) -> Optional[str]:
+        if event.event_type == EventType.SCANNER_ALERT:
+            return event.severity
+        return None
+
+    def _check_vessel_infra_correlation(self, window: CorrelationWindow) -> bool:
+        """
+        Check if vessel events correlate with infrastructure events.
+
+        Proximity is enforced by the rule's join; this only guards that
+        both sides are present.
+        """
+        return (
+            window.count(EventType.VESSEL_ARRIVAL) > 0 and
+            window.count(EventType.INFRASTRUCTURE_ALERT) > 0
+        )
 
-    def _check_commodity_vessel_correlation(self, events: List[IntelEvent]) -> bool:
+    def _check_commodity_vessel_correlation(self, window: CorrelationWindow) -> bool:
         """Check if commodity alerts correlate with vessel movements."""
-        commodity_events = [e for e in events if e.event_type == EventType.COMMODITY_ALERT]
-        vessel_events = [e for e in events if e.event_type == EventType.VESSEL_ARRIVAL]
-
-        for ce in commodity_events:
-            for ve in vessel_events:
-                # Check if vessel cargo matches commodity
-                if ce.raw_data and ve.raw_data:
-                    commodity = ce.raw_data.get("commodity", "")
-                    vessel_type = ve.raw_data.get("vessel_type", "")
-                    if self._cargo_matches(commodity, vessel_type):
-                        return True
+        vessel_types = window.keys("vessel_type")
+        if not vessel_types:
+            return False
+
+        # Bounded by the number of distinct commodities, not window size
+        for commodity in window.keys("commodity"):
+            if any(v in vessel_types for v in CARGO_VESSEL_TYPES.get(commodity, [])):
+                return True
         return False
 
-    def _check_scanner_infra_correlation(self, events: List[IntelEvent]) -> bool:
+    def _check_scanner_infra_correlation(self, window: CorrelationWindow) -> bool:
         """Check scanner alerts against infrastructure events."""
-        scanner_events = [e for e in events if e.event_type == EventType.SCANNER_ALERT]
-        return any(e.severity in ["critical", "high"] for e in scanner_events)
+        return (
+            window.has_key("scanner_severity", "critical") or
+            window.has_key("scanner_severity", "high")
+        )
 
-    def _check_rail_vessel_correlation(self, events: List[IntelEvent]) -> bool:
+    def _check_rail_vessel_correlation(self, window: CorrelationWindow) -> bool:
         """Check rail movements against vessel arrivals."""
-        rail_events = [e for e in events if e.event_type == EventType.RAIL_MOVEMENT]
-        vessel_events = [e for e in events if e.event_type == EventType.VESSEL_ARRIVAL]
-        return len(rail_events) > 0 and len(vessel_events) > 0
+        return (
+            window.count(EventType.RAIL_MOVEMENT) > 0 and
+            window.count(EventType.VESSEL_ARRIVAL) > 0
+        )
 
     def _cargo_matches(self, commodity: str, vessel_type: str) -> bool:
         """Check if commodity matches vessel type."""
-        cargo_map = {
-            "coal": ["bulk_carrier"],
-            "soybeans": ["bulk_carrier"],
-            "natural_gas": ["lng_carrier", "tanker"],
-            "automobiles": ["roro", "car_carrier"],
-        }
-        expected_vessels = cargo_map.get(commodity.lower(), [])
+        expected_vessels = CARGO_VESSEL_TYPES.get(commodity.lower(), [])
         return vessel_type.lower() in expected_vessels
 
     def add_correlation_rule(self, rule: CorrelationRule):
-        """Add a correlation rule."""
+        """Add a correlation rule, seeding its window from retained events."""
         self.correlation_rules.append(rule)
+        for event_type in rule.event_types:
+            self._rules_by_type.setdefault(event_type, []).append(rule)
+        self._reset_rule(rule)
+
+    def _reset_rule(self, rule: CorrelationRule):
+        """Refill a rule's window up to the event-time watermark."""
+        # Same horizon _check_correlations advances windows to; the clock
+        # only stands in before any event has been observed
+        watermark = self.watermarks.current() or self.clock.now()
+        rule.reset(self.store.since(watermark - rule.time_window, rule.event_types), watermark)
+
+    def load_rules(self, source: RuleSource) -> List[CorrelationRule]:
+        """
+        Compile declarative rules (see rule_dsl) and register them. Key
+        joins can map through "cargo_vessel_types". Raises RuleSpecError
+        before registering anything if a rule is invalid.
+        """
+        compiled = compile_rules(
+            source,
+            mappings={"cargo_vessel_types": CARGO_VESSEL_TYPES},
+            known_types=_EVENT_TYPES
+        )
+        rules = []
+        for plan in compiled:
+            rule = CorrelationRule(
+                name=plan.name,
+                event_types=[_EVENT_TYPES[t] for t in sorted(plan.event_types)],
+                time_window_minutes=plan.window_minutes,
+                condition=lambda window: True,
+                severity=plan.severity,
+                keys=plan.keys,
+                cooldown_minutes=plan.cooldown_minutes,
+                group_by=plan.group_by,
+                join=plan
+            )
+            with self._lock:
+                self.add_correlation_rule(rule)
+            rules.append(rule)
+        return rules
+
+    def subscribe(
+        self,
+        callback: Callable[[IntelEvent], None],
+        event_types: Optional[List[EventType]] = None,
+        min_severity: Optional[str] = None,
+        bbox=None,
+        entities: Optional[List[str]] = None,
+        **options
+    ) -> Subscription:
+        """
+        Subscribe to intelligence events matching an optional filter.
+
+        Delivery is asynchronous by default: each subscription gets a
+        bounded queue and its own thread (see subscriptions.py for
+        queue_size, policy, block_timeout and max_consecutive_drops).
+        Pass synchronous=True to be called inline during ingest.
+        """
+        return self.subscriptions.subscribe(
+            callback, event_types, min_severity, bbox, entities, **options
+        )
 
-    def subscribe(self, callback: Callable[[IntelEvent], None]):
-        """Subscribe to intelligence events."""
-        self.subscribers.append(callback)
+    def unsubscribe(self, subscription) -> bool:
+        return self.subscriptions.unsubscribe(subscription)
 
     def _notify_subscribers(self, event: IntelEvent):
-        """Notify all subscribers of an event."""
-        for callback in self.subscribers:
-            try:
-                callback(event)
-            except Exception as e:
-                print(f"Subscriber callback error: {e}")
+        """
+        Fan an event out to the live stream now and queue it for matching
+        subscriptions (see _publish_pending). Called with the lock held.
+        """
+        self.stream.publish(event)
+        self._outbox.append(event)
+
+    def _publish_pending(self):
+        """Offer queued events to subscriptions, in ingest order."""
+        with self._publish_lock:
+            while self._outbox:
+                self.subscriptions.publish(self._outbox.popleft())
 
     def ingest_event(self, event: IntelEvent):
         """Ingest an event and check correlations."""
-        self.events.append(event)
+        with self._lock:
+            self._ingest(event)
+        self._after_ingest()
+
+    def ingest_batch(
+        self,
+        events: List[IntelEvent],
+        on_error: Optional[Callable[[IntelEvent, Exception], None]] = None
+    ):
+        """
+        Ingest several events under a single lock acquisition. With
+        on_error, an event that fails is reported there and the rest of
+        the batch is still ingested.
+        """
+        with self._lock:
+            for event in events:
+                if on_error is None:
+                    self._ingest(event)
+                    continue
+                try:
+                    self._ingest(event)
+                except Exception as e:
+                    on_error(event, e)
+        self._after_ingest()
+
+    def _ingest(self, event: IntelEvent):
+        """Apply one event. Must be called with _lock held."""
+        self._journal_append(JOURNAL_EVENT, self._event_record(event))
+        self.data_version += 1
+        self._track(event)
+        self.store.add(event, self.clock.now())
+        if self.archive is not None:
+            self.archive.add(event)
         self._notify_subscribers(event)
 
         # Check correlation rules
         self._check_correlations(event)
+        if event.event_type != EventType.CORRELATION:
+            event.freeze()
+
+    def _after_ingest(self):
+        self._publish_pending()
+        if self.journal is not None and self.journal.bytes_since_snapshot >= self.snapshot_bytes:
+            self.compact_journal(background=True)
+
+    # ===========================================
+    # ASYNC INGEST
+    # ===========================================
+
+    @property
+    def async_ingest(self) -> bool:
+        """True while ingest workers are running."""
+        return bool(self._workers)
+
+    def start_workers(self, count: int = 2):
+        """Start background threads that drain event_queue."""
+        if self._workers:
+            return
+        self._stop_workers.clear()
+        for i in range(count):
+            worker = threading.Thread(
+                target=self._ingest_worker,
+                name=f"intel-ingest-{i}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop_workers(self, timeout: float = 5.0):
+        """Drain the queue and stop the ingest workers."""
+        if not self._workers:
+            return
+        self.event_queue.join()
+        self._stop_workers.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def submit(self, event: IntelEvent) -> str:
+        """Enqueue an event for async ingest. Raises IngestQueueFull."""
+        try:
+            self.event_queue.put_nowait((time.monotonic(), event))
+        except queue.Full:
+            with self._stats_lock:
+                self._ingest_stats["rejected"] += 1
+            raise IngestQueueFull(f"Ingest queue full ({self.event_queue.maxsize} events)")
+        with self._stats_lock:
+            self._ingest_stats["enqueued"] += 1
+        return event.id
+
+    @contextmanager
+    def collecting(self):
+        """
+        Make create_* helpers on this thread build events without
+        ingesting them; yields the list they are appended to, so callers
+        can ingest them as one batch (see bulk_ingest).
+        """
+        previous = getattr(self._collecting, "events", None)
+        self._collecting.events = collected = []
+        try:
+            yield collected
+        finally:
+            self._collecting.events = previous
+
+    def _dispatch(self, event: IntelEvent):
+        """Ingest synchronously, or enqueue when workers are running."""
+        collected = getattr(self._collecting, "events", None)
+        if collected is not None:
+            collected.append(event)
+        elif self._workers:
+            self.submit(event)
+        else:
+            self.ingest_event(event)
+
+    def _ingest_worker(self):
+        """Drain the queue in micro-batches of up to batch_size events."""
+        while not self._stop_workers.is_set():
+            try:
+                batch = [self.event_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.event_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            failed = []
+
+            def on_error(event: IntelEvent, error: Exception):
+                failed.append(event)
+                print(f"Ingest worker error on {event.id}: {error}")
+
+            try:
+                self.ingest_batch([event for _, event in batch], on_error=on_error)
+            except Exception as e:
+                print(f"Ingest worker error: {e}")
+            finally:
+                with self._stats_lock:
+                    self._last_lag_seconds = time.monotonic() - batch[0][0]
+                    self._ingest_stats["processed"] += len(batch) - len(failed)
+                    self._ingest_stats["failed"] += len(failed)
+                    self._ingest_stats["batches"] += 1
+                for _ in batch:
+                    self.event_queue.task_done()
+
+    def get_ingest_stats(self) -> Dict:
+        """Queue depth, lag and throughput counters for async ingest."""
+        with self.event_queue.mutex:
+            oldest = self.event_queue.queue[0][0] if self.event_queue.queue else None
+        return {
+            "async": self.async_ingest,
+            "workers": len(self._workers),
+            "queue_depth": self.event_queue.qsize(),
+            "queue_capacity": self.event_queue.maxsize,
+            "oldest_pending_seconds": round(time.monotonic() - oldest, 3) if oldest else 0.0,
+            "last_batch_lag_seconds": round(self._last_lag_seconds, 3),
+            **self._ingest_stats,
+            "event_time": self.watermarks.stats(),
+            "subscriptions": self.subscriptions.stats()
+        }
 
     def _check_correlations(self, new_event: IntelEvent):
-        """Check new event against correlation rules."""
-        for rule in self.correlation_rules:
-            if new_event.event_type not in rule.event_types:
+        """
+        Check new event against correlation rules.
+
+        Windows close on the event-time watermark. Events older than the
+        watermark are late: they are retained but not correlated.
+        """
+        now = self.clock.now()
+        if not self.watermarks.observe(new_event.source, new_event.timestamp, now):
+            return
+        watermark = self.watermarks.current()
+        for rule in self._rules_by_type.get(new_event.event_type, []):
+            window = rule.window
+            window.add(new_event)
+            window.advance(watermark)
+
+            members = None
+            if rule.join is not None:
+                matches = rule.join.add(new_event)
+                rule.join.advance(watermark)
+                if not matches:
+                    continue
+                members = [m for m, _ in matches] + [new_event]
+
+            if not rule.condition(window):
                 continue
 
-            # Get events within time window
-            cutoff = datetime.now() - rule.time_window
-            window_events = [
-                e for e in self.events
-                if e.timestamp >= cutoff and e.event_type in rule.event_types
-            ]
+            entities = rule.entity_set(members)
+            cache_key = (rule.name, entities)
+            existing = self.correlation_cache.get(cache_key, now)
+            if existing is not None:
+                # Within cooldown: extend in place, don't re-notify
+                added = [
+                    self.correlation_cache.extend(cache_key, m.id)
+                    for m in (members or [new_event])
+                ]
+                if any(added):
+                    self.incidents.link(existing, self._retained(
+                        m for m, new in zip(members or [new_event], added) if new
+                    ))
+                    existing.description = (
+                        f"Correlated {len(existing.correlations)} events matching rule '{rule.name}'"
+                    )
+                    existing.raw_data["update_count"] += 1
+                    self.data_version += 1
+                    existing.raw_data["last_updated"] = now.isoformat()
+                    self._journal_append(JOURNAL_UPDATE, (
+                        existing.id, existing.description,
+                        existing.correlations, existing.raw_data
+                    ))
+                    if self.archive is not None:
+                        self.archive.add(existing)
+                    self.stream.publish_update(existing)
+                continue
 
-            if rule.condition(window_events):
-                # Generate correlation event
-                corr_event = IntelEvent(
-                    id=self._generate_event_id(),
-                    timestamp=datetime.now(),
-                    event_type=EventType.CORRELATION,
-                    source="correlation_engine",
-                    title=f"Correlation: {rule.name}",
-                    description=f"Correlated {len(window_events)} events matching rule '{rule.name}'",
-                    severity=rule.severity,
-                    correlations=[e.id for e in window_events]
-                )
-                self.events.append(corr_event)
-                self._notify_subscribers(corr_event)
+            # Generate correlation event
+            correlations = [m.id for m in members] if members else window.ids()
+            raw_data = {
+                "rule": rule.name,
+                "entities": sorted(str(e) for e in entities),
+                "update_count": 0,
+                "last_updated": now.isoformat()
+            }
+            if members and matches[0][1] is not None:
+                raw_data["nearest_nm"] = round(matches[0][1], 3)
+            corr_event = IntelEvent(
+                id=self._generate_event_id(),
+                timestamp=now,
+                event_type=EventType.CORRELATION,
+                source="correlation_engine",
+                title=f"Correlation: {rule.name}",
+                description=f"Correlated {len(correlations)} events matching rule '{rule.name}'",
+                severity=rule.severity,
+                correlations=correlations,
+                raw_data=raw_data
+            )
+            self.correlation_cache.put(cache_key, corr_event, now + rule.cooldown)
+            self._journal_append(JOURNAL_EVENT, self._event_record(corr_event))
+            self._track(corr_event)
+            self.store.add(corr_event, now)
+            self.incidents.link(corr_event, self._retained(members or window))
+            if self.archive is not None:
+                self.archive.add(corr_event)
+            self._notify_subscribers(corr_event)
+
+    def _retained(self, events) -> List[IntelEvent]:
+        """Events still in the store (windows can outlive count retention)."""
+        return [e for e in events if e.id in self.store]
+
+    # ===========================================
+    # JOURNAL
+    # ===========================================
+
+    @staticmethod
+    def _event_record(event: IntelEvent) -> tuple:
+        return (
+            event.id, event.timestamp.timestamp(), event.event_type.value,
+            event.source, event.title, event.description, event.severity,
+            # Frozen payloads are journaled as their JSON bytes
+            event.location, event.entities, event._raw, event.correlations
+        )
+
+    @staticmethod
+    def _event_from_record(record: tuple) -> IntelEvent:
+        # Positional: record order matches the IntelEvent field order
+        return IntelEvent(
+            record[0], datetime.fromtimestamp(record[1]), _EVENT_TYPES[record[2]],
+            *record[3:]
+        )
+
+    def _journal_append(self, kind: int, payload: tuple):
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(kind, payload)
+        except ValueError:
+            # Non-core types in raw_data: store their JSON form instead
+            self.journal.append(kind, json.loads(json.dumps(payload, default=str)))
+
+    def restore_from_journal(self) -> int:
+        """
+        Rebuild the event store, correlation windows, cooldown cache and
+        event id counter from the journal. Returns events restored.
+        """
+        restored: Dict[str, IntelEvent] = {}
+        from_record = self._event_from_record
+        for kind, payload in self.journal.replay():
+            if kind == JOURNAL_EVENTS:
+                for event in map(from_record, payload):
+                    restored[event.id] = event
+            elif kind == JOURNAL_EVENT:
+                event = from_record(payload)
+                restored[event.id] = event
+            elif kind == JOURNAL_UPDATE:
+                event = restored.get(payload[0])
+                if event is not None:
+                    event.description, event.correlations, event.raw_data = payload[1:]
+
+        now = self.clock.now()
+        with self._lock:
+            self.data_version += 1
+            for event in restored.values():
+                if event.event_type != EventType.CORRELATION:
+                    event.freeze()
+                self._track(event)
+            self.store.extend(restored.values(), now)
+
+            # Journal order is not generation order (compaction snapshots,
+            # ingest workers, event-time ingest), so resume after the
+            # highest counter value of any restored hub id
+            self.advance_event_ids(restored)
+
+            # Rebuild the watermark from the restored events, oldest
+            # first, so none of them count as late
+            for event in self.store.range():
+                if event.event_type != EventType.CORRELATION:
+                    self.watermarks.observe(event.source, event.timestamp, now)
+
+            rules = {rule.name: rule for rule in self.correlation_rules}
+            for rule in self.correlation_rules:
+                self._reset_rule(rule)
+
+            self.correlation_cache.clear()
+            for corr in self.store.range(event_types=[EventType.CORRELATION]):
+                rule = rules.get((corr.raw_data or {}).get("rule"))
+                if rule is not None and corr.timestamp + rule.cooldown > now:
+                    key = (rule.name, frozenset(corr.raw_data.get("entities", [])))
+                    self.correlation_cache.put(key, corr, corr.timestamp + rule.cooldown)
+
+            self.incidents.clear()
+            for corr in self.store.range(event_types=[EventType.CORRELATION]):
+                members = (self.store.get(i) for i in corr.correlations or [])
+                self.incidents.link(corr, [m for m in members if m is not None])
+
+        return len(restored)
+
+    def compact_journal(self, background: bool = False):
+        """
+        Snapshot the retained events and drop the journal segments they
+        supersede (evicted events are not carried forward).
+        """
+        if self.journal is None or not self._compacting.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                with self._lock:
+                    seq = self.journal.rotate()
+                    events = self.store.range()
+                # Later updates to these events are journaled in segment
+                # `seq` as absolute values, so a racing update is harmless.
+                self.journal.write_snapshot(seq, (
+                    (JOURNAL_EVENTS, [self._event_record(e) for e in events[i:i + SNAPSHOT_BATCH]])
+                    for i in range(0, len(events), SNAPSHOT_BATCH)
+                ))
+            except Exception as e:
+                print(f"Journal compaction error: {e}")
+            finally:
+                self._compacting.release()
+
+        if background:
+            threading.Thread(target=run, name="intel-journal-compact", daemon=True).start()
+        else:
+            run()
 
     # ===========================================
     # EVENT CREATION METHODS
     # ===========================================
 
+    def _event_time(self, *candidates) -> datetime:
+        """First parseable source timestamp, else the arrival time."""
+        now = self.clock.now()
+        for value in candidates:
+            parsed = parse_event_time(value, now)
+            if parsed is not None:
+                return parsed
+        return now
+
     def create_vessel_event(
         self,
         vessel: Dict,
-        event_type: EventType = EventType.VESSEL_ARRIVAL
+        event_type: EventType = EventType.VESSEL_ARRIVAL,
+        event_time=None
     ) -> IntelEvent:
-        """Create event from vessel data."""
+        """Create event from vessel data (timed by the AIS report when present)."""
         # Enrich with commodity correlation
         vessel_type = vessel.get("ship_type_text", "cargo")
         flag = vessel.get("flag", "")
-        correlation = correlate_vessel_with_commodities(vessel_type, flag)
+        correlation = correlate_vessel_with_commodities(vessel_type, flag, self.commodity_snapshot)
 
         event = IntelEvent(
             id=self._generate_event_id(),
-            timestamp=datetime.now(),
+            timestamp=self._event_time(event_time, vessel.get("timestamp")),
             event_type=event_type,
             source="ais_tracker",
             title=f"Vessel {event_type.value}: {vessel.get('name', 'Unknown')}",
@@ -292,14 +1076,14 @@ class IntelligenceHub:
                 "commodity_correlation": correlation
             }
         )
-        self.ingest_event(event)
+        self._dispatch(event)
         return event
 
-    def create_commodity_event(self, commodity: Dict) -> IntelEvent:
-        """Create event from commodity alert."""
+    def create_commodity_event(self, commodity: Dict, event_time=None) -> IntelEvent:
+        """Create event from commodity alert (timed by the quote when present)."""
         event = IntelEvent(
             id=self._generate_event_id(),
-            timestamp=datetime.now(),
+            timestamp=self._event_time(event_time, commodity.get("timestamp")),
             event_type=EventType.COMMODITY_ALERT,
             source="commodities_tracker",
             title=f"Commodity Alert: {commodity.get('name', 'Unknown')}",
@@ -307,11 +1091,14 @@ class IntelligenceHub:
             severity="high" if abs(commodity.get("change_pct", 0)) >= 5 else "medium",
             raw_data=commodity
         )
-        self.ingest_event(event)
+        self._dispatch(event)
         return event
 
-    def create_scanner_event(self, transcript: str, feed_name: str) -> IntelEvent:
-        """Create event from scanner transcript."""
+    def create_scanner_event(self, transcript: str, feed_name: str, event_time=None) -> IntelEvent:
+        """
+        Create event from scanner transcript. Pass the time the traffic
+        was heard as event_time; transcription can lag by minutes.
+        """
         # Categorize transcript
         categories = categorize_transcript(transcript)
 
@@ -326,7 +1113,7 @@ class IntelligenceHub:
 
         event = IntelEvent(
             id=self._generate_event_id(),
-            timestamp=datetime.now(),
+            timestamp=self._event_time(event_time),
             event_type=EventType.SCANNER_ALERT,
             source=f"scanner_{feed_name}",
             title=f"Scanner: {feed_name}",
@@ -339,14 +1126,14 @@ class IntelligenceHub:
                 "infrastructure_matches": infra_matches
             }
         )
-        self.ingest_event(event)
+        self._dispatch(event)
         return event
 
-    def create_rail_event(self, inference: Dict) -> IntelEvent:
+    def create_rail_event(self, inference: Dict, event_time=None) -> IntelEvent:
         """Create event from rail scanner inference."""
         event = IntelEvent(
             id=self._generate_event_id(),
-            timestamp=datetime.now(),
+            timestamp=self._event_time(event_time, inference.get("timestamp")),
             event_type=EventType.RAIL_MOVEMENT,
             source="rail_scanner",
             title=f"Rail: {inference.get('railroad', 'Unknown')} movement",
@@ -354,7 +1141,7 @@ class IntelligenceHub:
             severity="medium" if inference.get("port_relevant") else "info",
             raw_data=inference
         )
-        self.ingest_event(event)
+        self._dispatch(event)
         return event
 
     def create_infrastructure_event(
@@ -362,7 +1149,8 @@ class IntelligenceHub:
         infra_id: str,
         alert_type: str,
         description: str,
-        severity: str = "medium"
+        severity: str = "medium",
+        event_time=None
     ) -> IntelEvent:
         """Create infrastructure alert event."""
         infra = BALTIMORE_INFRASTRUCTURE.get(infra_id)
@@ -371,7 +1159,7 @@ class IntelligenceHub:
 
         event = IntelEvent(
             id=self._generate_event_id(),
-            timestamp=datetime.now(),
+            timestamp=self._event_time(event_time),
             event_type=EventType.INFRASTRUCTURE_ALERT,
             source="infrastructure_monitor",
             title=f"Infrastructure: {infra.name} - {alert_type}",
@@ -381,7 +1169,7 @@ class IntelligenceHub:
             entities=[infra_id, infra.name, infra.operator],
             raw_data={"infrastructure": infra.to_dict()}
         )
-        self.ingest_event(event)
+        self._dispatch(event)
         return event
 
     # ===========================================
@@ -389,42 +1177,40 @@ class IntelligenceHub:
     # ===========================================
 
     def get_situation_report(self, hours: int = 24) -> Dict:
-        """Generate situation report."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent_events = [e for e in self.events if e.timestamp >= cutoff]
-
-        by_type = {}
+        """
+        Generate situation report.
+
+        Counts come from rolling per-minute counters and the external
+        sections from background-refreshed snapshots, so the cost does
+        not grow with the number of retained events.
+        """
+        cutoff = self.clock.now() - timedelta(hours=hours)
+        total, by_type, severity_counts = self.counters.totals(cutoff)
         by_severity = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
+        by_severity.update(severity_counts)
 
-        for event in recent_events:
-            type_key = event.event_type.value
-            by_type[type_key] = by_type.get(type_key, 0) + 1
-            by_severity[event.severity] = by_severity.get(event.severity, 0) + 1
-
-        # Get current commodity status
-        commodity_data = self.commodities.get_all_commodities()
+        # Get current commodity status from the shared snapshot
+        commodity_data = self.commodity_snapshot.get()
 
         # Get rail status
-        rail_trains = self.rail.get_amtrak_trains()
+        rail_trains = self.rail_snapshot.get() or []
 
         # Get infrastructure status
-        infra_status = self.infrastructure.get_status_report()
+        infra_status = self.infrastructure_snapshot.get()
 
         return {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": self.clock.now().isoformat(),
             "period_hours": hours,
             "summary": {
-                "total_events": len(recent_events),
+                "total_events": total,
                 "by_type": by_type,
                 "by_severity": by_severity
             },
             "critical_events": [
-                e.to_dict() for e in recent_events
-                if e.severity in ["critical", "high"]
-            ][:10],
+                e.to_dict() for e in self._priority_events.since(cutoff)[:10]
+            ],
             "correlations": [
-                e.to_dict() for e in recent_events
-                if e.event_type == EventType.CORRELATION
+                e.to_dict() for e in self.store.since(cutoff, [EventType.CORRELATION])
             ],
             "commodity_status": commodity_data.get("commodities", {}),
             "commodity_alerts": commodity_data.get("alerts", []),
@@ -435,35 +1221,27 @@ class IntelligenceHub:
             "infrastructure_status": infra_status
         }
 
-    def export_events_geojson(self, hours: int = 24) -> Dict:
-        """Export recent events as GeoJSON."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent_events = [
-            e for e in self.events
-            if e.timestamp >= cutoff and e.location
-        ]
-
-        features = []
-        for event in recent_events:
-            if event.location:
-                features.append({
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [
-                            event.location.get("lon", 0),
-                            event.location.get("lat", 0)
-                        ]
-                    },
-                    "properties": {
-                        "id": event.id,
-                        "title": event.title,
-                        "type": event.event_type.value,
-                        "severity": event.severity,
-                        "timestamp": event.timestamp.isoformat(),
-                        "source": event.source
-                    }
-                })
+    def export_events_geojson(
+        self,
+        hours: int = 24,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        zoom: Optional[int] = None,
+        since: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Export located events as GeoJSON.
+
+        `bbox` (min_lon, min_lat, max_lon, max_lat) limits the result to a
+        viewport and `since` overrides `hours`. Below CLUSTER_MAX_ZOOM,
+        nearby events are returned as cluster features.
+        """
+        if since is None:
+            since = self.clock.now() - timedelta(hours=hours)
+
+        if zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            features = self.geo_index.clusters(zoom, bbox, since)
+        else:
+            features = self.geo_index.features(bbox, since)
 
         return {
             "type": "FeatureCollection",
@@ -475,80 +1253,345 @@ class IntelligenceHub:
 # FLASK API
 # ===========================================
 
-def create_intelligence_api():
-    """Create Flask API for intelligence hub."""
-    from flask import Flask, jsonify, request
+def create_intelligence_api(hub: Optional[IntelligenceHub] = None):
+    """
+    Create Flask API for intelligence hub.
+
+    Set INTEL_INGEST_WORKERS to a positive number to run ingest endpoints
+    in async mode (enqueue and return 202 immediately). Set
+    INTEL_JOURNAL_DIR to persist events across restarts, and
+    INTEL_ARCHIVE_PATH (a SQLite file) to keep queryable long-term history.
+    INTEL_RULES_PATH loads extra declarative correlation rules (JSON/YAML).
+
+    GET responses go through api_responses: bodies are cached as bytes per
+    resource version where one exists, and every response gets an ETag,
+    304 handling and gzip/brotli compression.
+    """
+    from flask import Flask, Response, jsonify, request
+    from bulk_ingest import bulk_ingest, iter_lines
+    from api_responses import CachedBody, ResponseCache, send, send_json
 
     app = Flask(__name__)
-    hub = IntelligenceHub()
+    if hub is None:
+        journal_dir = os.getenv("INTEL_JOURNAL_DIR")
+        archive_path = os.getenv("INTEL_ARCHIVE_PATH")
+        hub = IntelligenceHub(
+            queue_size=int(os.getenv("INTEL_INGEST_QUEUE_SIZE", "10000")),
+            batch_size=int(os.getenv("INTEL_INGEST_BATCH_SIZE", "100")),
+            journal=EventJournal(journal_dir) if journal_dir else None,
+            archive=EventArchive(archive_path) if archive_path else None
+        )
+        rules_path = os.getenv("INTEL_RULES_PATH")
+        if rules_path:
+            hub.load_rules(rules_path)
+        workers = int(os.getenv("INTEL_INGEST_WORKERS", "0"))
+        if workers > 0:
+            hub.start_workers(workers)
+        hub.commodity_snapshot.start_auto_refresh()
+        hub.rail_snapshot.start_auto_refresh()
+
+    responses = ResponseCache()
+
+    def live_version(relative: bool = True):
+        """Hub data version, plus the minute for windows relative to now."""
+        if not relative:
+            return hub.data_version
+        return hub.data_version, int(hub.clock.now().timestamp() // 60)
+
+    def cached(key, version, build, cache_control: str = "no-cache"):
+        return send(request, responses.get(key, version, build), cache_control)
+
+    def ingest_response(create):
+        """Run an ingest helper and map it to a sync or async response."""
+        try:
+            event = create()
+        except IngestQueueFull as e:
+            response = jsonify({"error": str(e), "status": "rejected"})
+            response.status_code = 503
+            response.headers["Retry-After"] = "1"
+            return response
+        if hub.async_ingest:
+            return jsonify({"id": event.id, "status": "queued"}), 202
+        return jsonify(event.to_dict())
 
     @app.route("/api/status", methods=["GET"])
     def status():
         """Get current situation status."""
         hours = request.args.get("hours", 24, type=int)
-        return jsonify(hub.get_situation_report(hours))
+        # Load the snapshots first so their versions describe what the report reads
+        snapshots = (hub.rail_snapshot, hub.infrastructure_snapshot, hub.commodity_snapshot)
+        version = (live_version(),) + tuple(snapshot.get_versioned()[1] for snapshot in snapshots)
+        return cached(("status", hours), version, lambda: hub.get_situation_report(hours))
+
+    def parse_time(name: str) -> Optional[datetime]:
+        """Query time as naive local time, like stored timestamps. Raises ValueError."""
+        value = request.args.get(name)
+        if not value:
+            return None
+        parsed = parse_event_time(value)
+        if parsed is None:
+            raise ValueError(f"{name}={value!r}")
+        return parsed
+
+    def list_arg(name: str) -> List[str]:
+        values = []
+        for value in request.args.getlist(name):
+            values.extend(v.strip() for v in value.split(",") if v.strip())
+        return values
 
     @app.route("/api/events", methods=["GET"])
     def events():
-        """Get recent events."""
-        hours = request.args.get("hours", 24, type=int)
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent = [e.to_dict() for e in hub.events if e.timestamp >= cutoff]
-        return jsonify({"events": recent})
+        """
+        Get events.
+
+        Filters: hours (default 24) or start/end (ISO), type, severity
+        (comma-separated or repeated) and entity. With an archive the
+        filters run in SQL and results page newest first: pass `cursor`
+        from the previous response's `next_cursor` (limit <= 1000).
+        Without one, matching in-memory events are returned oldest first.
+        """
+        try:
+            start = parse_time("start")
+            end = parse_time("end")
+        except ValueError as e:
+            return jsonify({"error": f"Invalid time: {e}"}), 400
+        if start is None:
+            start = hub.clock.now() - timedelta(hours=request.args.get("hours", 24, type=int))
+        types = list_arg("type")
+        severities = list_arg("severity")
+        entity = request.args.get("entity")
+
+        if hub.archive is not None:
+            try:
+                found, next_cursor = hub.archive.query(
+                    start=start, end=end, event_types=types, severities=severities,
+                    entity=entity, limit=request.args.get("limit", 100, type=int),
+                    cursor=request.args.get("cursor")
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return send_json(request, {"events": found, "next_cursor": next_cursor})
+
+        try:
+            event_types = [EventType(t) for t in types] or None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        matches = hub.store.range(start, end, event_types)
+        if severities:
+            matches = [e for e in matches if e.severity in severities]
+        if entity:
+            wanted = normalize_entity(entity)
+            matches = [
+                e for e in matches
+                if any(normalize_entity(x) == wanted for x in e.entities or [])
+            ]
+        # Frozen payloads are spliced into the body without decoding
+        body = b'{"events":[' + b",".join(e.to_json() for e in matches) + b'],"next_cursor":null}'
+        return send(request, CachedBody(body))
 
     @app.route("/api/events/geojson", methods=["GET"])
     def events_geojson():
-        """Get events as GeoJSON."""
+        """
+        Get events as GeoJSON.
+
+        Optional: bbox=min_lon,min_lat,max_lon,max_lat, zoom (clustered
+        below CLUSTER_MAX_ZOOM) and since (ISO, overrides hours).
+        """
         hours = request.args.get("hours", 24, type=int)
-        return jsonify(hub.export_events_geojson(hours))
+        try:
+            since = parse_time("since")
+            bbox = parse_bbox(request.args["bbox"]) if request.args.get("bbox") else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        zoom = request.args.get("zoom", type=int)
+        return cached(
+            ("geojson", request.query_string), live_version(since is None),
+            lambda: hub.export_events_geojson(hours, bbox=bbox, zoom=zoom, since=since)
+        )
+
+    @app.route("/api/entities/<entity>/events", methods=["GET"])
+    def entity_events(entity):
+        """
+        Get retained events mentioning an entity, oldest first.
+
+        Optional: hours (default: all retained) and limit (newest kept).
+        """
+        hours = request.args.get("hours", type=int)
+        since = hub.clock.now() - timedelta(hours=hours) if hours is not None else None
+        found = hub.entity_index.events(entity, since, request.args.get("limit", type=int))
+        return send_json(request, {
+            "entity": normalize_entity(entity),
+            "count": len(found),
+            "events": [e.to_dict() for e in found]
+        })
+
+    @app.route("/api/entities/top", methods=["GET"])
+    def top_entities():
+        """Get the most mentioned entities in the last N hours."""
+        hours = request.args.get("hours", 24, type=int)
+        limit = request.args.get("limit", 10, type=int)
+        return cached(("entities_top", hours, limit), live_version(), lambda: {
+            "hours": hours,
+            "entities": [
+                {"entity": entity, "count": count}
+                for entity, count in hub.entity_index.top(hub.clock.now() - timedelta(hours=hours), limit)
+            ]
+        })
+
+    @app.route("/api/incidents", methods=["GET"])
+    def incidents():
+        """
+        Get incidents: correlations merged through shared events, with
+        members, severity roll-up and geographic extent.
+
+        Optional: hours (last activity window) and min_severity.
+        """
+        hours = request.args.get("hours", type=int)
+        min_severity = request.args.get("min_severity")
+
+        def build():
+            since = hub.clock.now() - timedelta(hours=hours) if hours is not None else None
+            found = hub.incidents.incidents(since, min_severity)
+            return {"count": len(found), "incidents": found}
+
+        return cached(("incidents", hours, min_severity), live_version(hours is not None), build)
 
     @app.route("/api/infrastructure", methods=["GET"])
     def infrastructure():
-        """Get infrastructure data."""
-        return jsonify(get_infrastructure_geojson())
+        """Get infrastructure data (static registry)."""
+        return cached("infrastructure", 0, get_infrastructure_geojson, "public, max-age=300")
 
     @app.route("/api/infrastructure/<infra_id>/impact", methods=["GET"])
     def infrastructure_impact(infra_id):
         """Get impact assessment for infrastructure."""
-        return jsonify(hub.infrastructure.assess_impact(infra_id))
+        max_depth = request.args.get("max_depth", 1, type=int)
+        if max_depth < 0:
+            return jsonify({"error": "max_depth must not be negative"}), 400
+        return send_json(request, hub.infrastructure.assess_impact(infra_id, max_depth))
+
+    @app.route("/api/infrastructure/impact", methods=["GET"])
+    def infrastructure_impacts():
+        """Get cascade impact scores for every asset."""
+        max_depth = request.args.get("max_depth", 3, type=int)
+        if max_depth < 0:
+            return jsonify({"error": "max_depth must not be negative"}), 400
+        return send_json(request, {
+            "max_depth": max_depth,
+            "assets": hub.infrastructure.assess_all_impacts(max_depth)
+        })
 
     @app.route("/api/commodities", methods=["GET"])
     def commodities():
         """Get commodity data."""
-        return jsonify(hub.commodities.get_all_commodities())
+        snapshot, version = hub.commodity_snapshot.get_versioned()
+        return cached("commodities", version, lambda: snapshot)
 
     @app.route("/api/rail", methods=["GET"])
     def rail():
         """Get rail status."""
-        return jsonify({
-            "trains": hub.rail.get_amtrak_trains(),
+        trains, version = hub.rail_snapshot.get_versioned()
+        return cached("rail", version, lambda: {
+            "trains": trains or [],
             "stations": {k: asdict(v) for k, v in BALTIMORE_RAIL_STATIONS.items()},
             "lines": BALTIMORE_RAIL_LINES
         })
 
+    @app.route("/api/stream", methods=["GET"])
+    def stream():
+        """
+        Stream new events and correlation updates as Server-Sent Events.
+
+        Each message's id can be sent back as the Last-Event-ID header
+        (or last_event_id) to resume; a "reset" message means events were
+        missed and the client should refetch /api/events. Filters: type
+        (comma-separated or repeated), min_severity, bbox and entity.
+        heartbeat sets the keep-alive interval in seconds (default 15).
+        """
+        try:
+            event_filter = SubscriptionFilter(
+                event_types=[EventType(t) for t in list_arg("type")] or None,
+                min_severity=request.args.get("min_severity"),
+                bbox=request.args.get("bbox") or None,
+                entities=list_arg("entity") or None
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        heartbeat = max(1.0, request.args.get("heartbeat", 15.0, type=float))
+        last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+        buffer = hub.stream
+        after = buffer.parse_id(last_id)
+        reset = bool(last_id) and after is None
+        if after is None:
+            after = buffer.last_seq
+
+        def generate():
+            cursor = after
+            yield b"retry: 3000\n\n"
+            if reset:
+                yield sse_frame(None, RESET_KIND, b"{}")
+            while True:
+                frames, cursor, gap = buffer.read(cursor, event_filter)
+                if gap:
+                    yield sse_frame(None, RESET_KIND, b"{}")
+                for seq, kind, data in frames:
+                    yield sse_frame(buffer.stream_id(seq), kind, data)
+                if cursor >= buffer.last_seq and not buffer.wait(cursor, heartbeat):
+                    yield b": keep-alive\n\n"
+
+        return Response(generate(), mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+
     @app.route("/api/ingest/scanner", methods=["POST"])
     def ingest_scanner():
-        """Ingest scanner transcript."""
+        """Ingest scanner transcript (optional "timestamp": when it was heard)."""
         data = request.json
         transcript = data.get("transcript", "")
         feed = data.get("feed", "unknown")
-        event = hub.create_scanner_event(transcript, feed)
-        return jsonify(event.to_dict())
+        return ingest_response(
+            lambda: hub.create_scanner_event(transcript, feed, data.get("timestamp"))
+        )
 
     @app.route("/api/ingest/vessel", methods=["POST"])
     def ingest_vessel():
         """Ingest vessel data."""
         vessel = request.json
-        event = hub.create_vessel_event(vessel)
-        return jsonify(event.to_dict())
+        return ingest_response(lambda: hub.create_vessel_event(vessel))
+
+    @app.route("/api/ingest/bulk", methods=["POST"])
+    def ingest_bulk():
+        """
+        Ingest NDJSON of mixed event kinds (see bulk_ingest), read
+        incrementally so chunked uploads are never buffered whole.
+
+        Optional: batch_size (default 500) and errors_only=1 to return
+        results for failed lines only.
+        """
+        batch_size = max(1, request.args.get("batch_size", 500, type=int))
+        results, summary = bulk_ingest(hub, iter_lines(request.stream), batch_size)
+        if request.args.get("errors_only", type=int):
+            results = [r for r in results if "error" in r]
+        queued = hub.async_ingest
+        return jsonify({
+            **summary,
+            "status": "queued" if queued else "ingested",
+            "results": results
+        }), 202 if queued else 200
+
+    @app.route("/api/ingest/stats", methods=["GET"])
+    def ingest_stats():
+        """Get async ingest queue depth and lag."""
+        return send_json(request, dict(hub.get_ingest_stats(), responses=responses.stats()))
 
     @app.route("/health", methods=["GET"])
     def health():
         """Health check."""
         return jsonify({
             "status": "healthy",
-            "events_count": len(hub.events),
-            "correlation_rules": len(hub.correlation_rules)
+            "events_count": len(hub.store),
+            "correlation_rules": len(hub.correlation_rules),
+            "ingest_queue_depth": hub.event_queue.qsize()
         })
 
     return app
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled Multi-Pattern Keyword Matcher
+
+One Aho-Corasick automaton over every transcript vocabulary:
+- scanner keyword categories          (scanner:<category>)
+- infrastructure asset keywords       (infra:<asset id>)
+- emergency keywords                  (emergency)
+- freight cargo / direction patterns  (cargo:<type>, direction:<dir>)
+- railroad names                      (railroad:<name>)
+
+A single pass over the lower-cased transcript finds every keyword that
+occurs as a substring (the same semantics as `kw in text`), so cost
+grows with transcript length and number of hits rather than vocabulary
+size. The scanner, infrastructure and freight analyzers all read from
+one cached scan of the same transcript.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# category -> keywords in category order
+Vocabulary = Dict[str, List[str]]
+# category -> matched keywords, in vocabulary order
+ScanResult = Dict[str, Tuple[str, ...]]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton mapping substrings to categories."""
+
+    def __init__(self, vocabulary: Vocabulary, cache_size: int = 256):
+        self.categories = list(vocabulary)
+        self._keywords: List[str] = []
+        self._tags: List[List[Tuple[int, int]]] = []  # keyword id -> (category, position)
+        keyword_ids: Dict[str, int] = {}
+
+        for cat_index, (category, keywords) in enumerate(vocabulary.items()):
+            for position, keyword in enumerate(keywords):
+                keyword = keyword.lower()
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self._keywords)
+                    self._keywords.append(keyword)
+                    self._tags.append([])
+                self._tags[keyword_ids[keyword]].append((cat_index, position))
+
+        self._build()
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[int]] = [[]]
+
+        for keyword_id, keyword in enumerate(self._keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(keyword_id)
+
+        # Breadth-first failure links; outputs inherit their suffix outputs
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = fail[state]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def _scan(self, text: str) -> ScanResult:
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+
+        hits: Dict[int, List[Tuple[int, str]]] = {}
+        for keyword_id in found:
+            keyword = self._keywords[keyword_id]
+            for cat_index, position in self._tags[keyword_id]:
+                hits.setdefault(cat_index, []).append((position, keyword))
+
+        return {
+            self.categories[cat_index]: tuple(kw for _, kw in sorted(hits[cat_index]))
+            for cat_index in sorted(hits)
+        }
+
+    def matches(self, text: str, prefix: str) -> Dict[str, Tuple[str, ...]]:
+        """Matches in categories named `<prefix>:<name>`, keyed by name."""
+        start = len(prefix) + 1
+        return {
+            category[start:]: keywords
+            for category, keywords in self.scan(text).items()
+            if category.startswith(prefix + ":")
+        }
+
+
+_matcher: Optional[KeywordAutomaton] = None
+_matcher_lock = threading.Lock()
+
+
+def build_transcript_vocabulary() -> Vocabulary:
+    """Collect every analyzer vocabulary under prefixed category names."""
+    # Imported lazily: these modules import this one
+    from scanner_feeds import KEYWORD_CATEGORIES
+    from critical_infrastructure import INFRASTRUCTURE_KEYWORDS, EMERGENCY_KEYWORDS
+    from rail_tracking import FreightInference
+
+    vocabulary: Vocabulary = {}
+    for category, keywords in KEYWORD_CATEGORIES.items():
+        vocabulary[f"scanner:{category}"] = keywords
+    for infra_id, keywords in INFRASTRUCTURE_KEYWORDS.items():
+        vocabulary[f"infra:{infra_id}"] = keywords
+    vocabulary["emergency"] = EMERGENCY_KEYWORDS
+    for cargo_type, patterns in FreightInference.CARGO_PATTERNS.items():
+        vocabulary[f"cargo:{cargo_type}"] = patterns
+    for direction, patterns in FreightInference.DIRECTION_PATTERNS.items():
+        vocabulary[f"direction:{direction}"] = patterns
+    for railroad, patterns in FreightInference.RAILROAD_PATTERNS.items():
+        vocabulary[f"railroad:{railroad}"] = patterns
+    return vocabulary
+
+
+def get_transcript_matcher() -> KeywordAutomaton:
+    """Process-wide automaton over all transcript vocabularies (built once)."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = KeywordAutomaton(build_transcript_vocabulary())
+    return _matcher
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar Commodity Price History
+
+Persists every fetched quote into a compact per-symbol time series and
+computes adaptive alerts across all symbols at once:
+- one append-only binary file per symbol of (timestamp, price) float64
+  records, read back through np.memmap; quotes are stamped with their
+  market time, so polling an unchanged quote does not add a tick
+- prices aligned into a (symbols x ticks) matrix
+- rolling z-scores of tick returns, EWMA mean/volatility and price
+  volatility bands, all computed with vectorized NumPy operations
+
+This replaces the fixed "moved >= 3% day-over-day" rule with thresholds
+that adapt to each commodity's own volatility.
+"""
+
+import os
+import re
+import threading
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+RECORD_DTYPE = np.dtype([("ts", "<f8"), ("price", "<f8")])
+
+DEFAULT_HISTORY_DIR = os.getenv("COMMODITY_HISTORY_DIR", "data/price_history")
+
+# Alerting defaults
+LOOKBACK_TICKS = 60     # returns used for mean/std
+MIN_HISTORY = 20        # below this, fall back to the fixed threshold
+Z_THRESHOLD = 2.5       # |z| above this raises a medium alert
+Z_HIGH = 4.0            # |z| above this raises a high alert
+EWMA_SPAN = 20
+BAND_WIDTH = 2.0        # volatility band width in standard deviations
+
+
+def _to_epoch(ts) -> float:
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    return ts.timestamp()
+
+
+class PriceHistory:
+    """Append-only, memory-mapped price series keyed by commodity."""
+
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._last_ts: Dict[str, float] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9._-]', '_', key)}.bin"
+
+    def keys(self) -> List[str]:
+        """Keys with recorded history."""
+        return sorted(p.stem for p in self.directory.glob("*.bin"))
+
+    def append(self, key: str, ts, price: float):
+        """Append one tick to a symbol's series."""
+        record = np.array([(_to_epoch(ts), float(price))], dtype=RECORD_DTYPE)
+        with self._lock, open(self._path(key), "ab") as f:
+            f.write(record.tobytes())
+
+    def append_quotes(self, quotes: Dict[str, Dict]):
+        """
+        Append the price of every fresh quote in a get_all_commodities()
+        result, skipping quotes whose market time is not newer than the
+        symbol's last tick (the market has not moved since last poll).
+        """
+        for key, quote in quotes.items():
+            if quote.get("stale") or quote.get("price") is None:
+                continue
+            ts = _to_epoch(quote.get("market_time") or quote.get("timestamp") or datetime.now())
+            last = self._last_ts.get(key)
+            if last is None:
+                tail = self.load(key, 1)
+                last = float(tail["ts"][0]) if len(tail) else float("-inf")
+            if ts <= last:
+                continue
+            self.append(key, ts, quote["price"])
+            self._last_ts[key] = ts
+
+    def load(self, key: str, last_n: Optional[int] = None) -> np.ndarray:
+        """Memory-map a symbol's series (structured ts/price array)."""
+        path = self._path(key)
+        if not path.exists() or path.stat().st_size < RECORD_DTYPE.itemsize:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        count = path.stat().st_size // RECORD_DTYPE.itemsize
+        data = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+        return data[-last_n:] if last_n else data
+
+    def price_matrix(self, keys: List[str], ticks: int) -> np.ndarray:
+        """
+        Last `ticks` prices per key as a (len(keys), ticks) float matrix,
+        right-aligned and NaN-padded for symbols with shorter history.
+        """
+        matrix = np.full((len(keys), ticks), np.nan)
+        for row, key in enumerate(keys):
+            prices = self.load(key, ticks)["price"]
+            if len(prices):
+                matrix[row, ticks - len(prices):] = prices
+        return matrix
+
+
+# ===========================================
+# VECTORIZED STATISTICS
+# ===========================================
+
+def pct_returns(prices: np.ndarray) -> np.ndarray:
+    """Tick-over-tick percentage returns along the last axis."""
+    return (prices[..., 1:] / prices[..., :-1] - 1.0) * 100.0
+
+
+def rolling_zscores(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling z-score of each value against the `window` values before it,
+    for every row at once. NaNs are ignored; positions without at least
+    two prior values are NaN.
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    pad = np.zeros(values.shape[:-1] + (1,))
+
+    csum = np.concatenate([pad, np.cumsum(filled, axis=-1)], axis=-1)
+    csq = np.concatenate([pad, np.cumsum(filled * filled, axis=-1)], axis=-1)
+    ccount = np.concatenate([pad, np.cumsum(valid, axis=-1)], axis=-1)
+
+    n = values.shape[-1]
+    end = np.arange(n)                      # window excludes the current value
+    start = np.maximum(end - window, 0)
+    count = ccount[..., end] - ccount[..., start]
+    total = csum[..., end] - csum[..., start]
+    total_sq = csq[..., end] - csq[..., start]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        var = (total_sq - count * mean * mean) / (count - 1)
+        std = np.sqrt(np.maximum(var, 0.0))
+        z = (values - mean) / std
+    z[(count < 2) | ~valid | (std == 0)] = np.nan
+    return z
+
+
+def ewma(values: np.ndarray, span: int) -> np.ndarray:
+    """EWMA of each row (NaN-aware), weighting the latest value most."""
+    alpha = 2.0 / (span + 1.0)
+    n = values.shape[-1]
+    weights = (1.0 - alpha) ** np.arange(n - 1, -1, -1)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nansum(values * weights, axis=-1) / np.sum(weights * valid, axis=-1)
+
+
+def ewm_std(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponentially weighted standard deviation of each row."""
+    mean = ewma(values, span)
+    return np.sqrt(ewma((values - mean[..., None]) ** 2, span))
+
+
+def compute_adaptive_alerts(
+    history: PriceHistory,
+    keys: List[str],
+    lookback: int = LOOKBACK_TICKS,
+    min_history: int = MIN_HISTORY,
+    z_threshold: float = Z_THRESHOLD,
+    z_high: float = Z_HIGH,
+    span: int = EWMA_SPAN,
+    band_width: float = BAND_WIDTH
+) -> Dict[str, Dict]:
+    """
+    Score the latest tick of every key against its own history.
+
+    Returns key -> stats for keys with at least `min_history` returns
+    and a non-zero return volatility (flat series have no z-score and
+    are left to the fixed threshold).
+    Stats include the rolling z-score, EWMA return/volatility, the
+    adaptive move threshold, volatility band and an alert severity
+    ("high", "medium" or None).
+    """
+    if not keys:
+        return {}
+
+    prices = history.price_matrix(keys, lookback + 2)
+    returns = pct_returns(prices)
+    latest_return = returns[:, -1]
+    latest_price = prices[:, -1]
+
+    z = rolling_zscores(returns, lookback)[:, -1]
+    prior = returns[:, :-1]
+    ewma_return = ewma(prior, span)
+    ewma_vol = ewm_std(prior, span)
+
+    price_prior = prices[:, :-1]
+    band_mid = ewma(price_prior, span)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        band_std = np.nanstd(price_prior, axis=1)
+    band_low = band_mid - band_width * band_std
+    band_high = band_mid + band_width * band_std
+
+    history_len = np.sum(~np.isnan(prior), axis=1)
+    outside_band = (latest_price < band_low) | (latest_price > band_high)
+
+    results = {}
+    for row, key in enumerate(keys):
+        if history_len[row] < min_history or np.isnan(latest_return[row]) or np.isnan(z[row]):
+            continue
+        abs_z = abs(z[row])
+        severity = None
+        if abs_z >= z_high:
+            severity = "high"
+        elif abs_z >= z_threshold or (outside_band[row] and abs_z >= z_threshold / 2):
+            severity = "medium"
+        results[key] = {
+            "change_pct": round(float(latest_return[row]), 3),
+            "zscore": round(float(z[row]), 2),
+            "ewma_return": round(float(ewma_return[row]), 3),
+            "ewma_volatility": round(float(ewma_vol[row]), 3),
+            "threshold_pct": round(float(abs(ewma_return[row]) + z_threshold * ewma_vol[row]), 3),
+            "band": [round(float(band_low[row]), 4), round(float(band_high[row]), 4)],
+            "outside_band": bool(outside_band[row]),
+            "severity": severity
+        }
+    return results
@@ -15,6 +15,8 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
+from keyword_matcher import get_transcript_matcher
+
 # API Endpoints
 AMTRAKER_API = "https://api.amtraker.com/v3"
 OPENRAILWAYMAP_API = "https://api.openrailwaymap.org"
@@ -305,12 +307,20 @@ class FreightInference:
         "outbound_port": ["from seagirt", "from dundalk", "from curtis bay", "ex baltimore"]
     }
 
+    # Railroad indicators, in detection priority order
+    RAILROAD_PATTERNS = {
+        "CSX": ["csx"],
+        "Norfolk Southern": ["norfolk southern", " ns "],
+        "Canton Railroad": ["canton"],
+        "PBR": ["pbr", "patapsco"]
+    }
+
     @classmethod
     def analyze_transcript(cls, text: str) -> Dict:
         """
         Analyze scanner transcript for freight movement intelligence.
         """
-        text_lower = text.lower()
+        scan = get_transcript_matcher()
 
         result = {
             "timestamp": datetime.now().isoformat(),
@@ -322,26 +332,18 @@ class FreightInference:
             "port_relevant": False
         }
 
-        # Detect railroad
-        if "csx" in text_lower:
-            result["railroad"] = "CSX"
-        elif "norfolk southern" in text_lower or " ns " in text_lower:
-            result["railroad"] = "Norfolk Southern"
-        elif "canton" in text_lower:
-            result["railroad"] = "Canton Railroad"
-        elif "pbr" in text_lower or "patapsco" in text_lower:
-            result["railroad"] = "PBR"
+        # Detect railroad (first match in priority order)
+        for railroad in scan.matches(text, "railroad"):
+            result["railroad"] = railroad
+            break
 
         # Detect cargo type
-        for cargo_type, patterns in cls.CARGO_PATTERNS.items():
-            if any(p in text_lower for p in patterns):
-                result["inferred_cargo"].append(cargo_type)
-
-        # Detect direction
-        for direction, patterns in cls.DIRECTION_PATTERNS.items():
-            if any(p in text_lower for p in patterns):
-                result["direction"] = direction
-                result["port_relevant"] = True
+        result["inferred_cargo"].extend(scan.matches(text, "cargo"))
+
+        # Detect direction (the last matching direction wins)
+        for direction in scan.matches(text, "direction"):
+            result["direction"] = direction
+            result["port_relevant"] = True
 
         # Calculate confidence
         confidence_factors = 0
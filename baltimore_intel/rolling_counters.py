@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rolling Event Counters
+
+Per-minute counts of events by (type, severity), maintained on ingest
+and on store eviction, so "how many events of each kind in the last N
+hours" costs O(minutes in N hours) instead of a scan of every event.
+
+Counts are kept at minute resolution: a query for events since a cutoff
+includes the whole minute containing the cutoff.
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from event_time import minute_bucket
+
+
+class RollingCounters:
+    """Minute-bucketed (type, severity) counters for retained events."""
+
+    def __init__(self):
+        self._buckets: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+
+    def add(self, event):
+        """Count an ingested event."""
+        minute = minute_bucket(event.timestamp)
+        with self._lock:
+            bucket = self._buckets.get(minute)
+            if bucket is None:
+                bucket = self._buckets[minute] = Counter()
+            bucket[(event.event_type.value, event.severity)] += 1
+
+    def remove(self, events: Iterable):
+        """Uncount events (store evict listener)."""
+        with self._lock:
+            for event in events:
+                minute = minute_bucket(event.timestamp)
+                bucket = self._buckets.get(minute)
+                if bucket is None:
+                    continue
+                key = (event.event_type.value, event.severity)
+                bucket[key] -= 1
+                if bucket[key] <= 0:
+                    del bucket[key]
+                    if not bucket:
+                        del self._buckets[minute]
+
+    def totals(self, since: datetime) -> Tuple[int, Dict[str, int], Dict[str, int]]:
+        """(total, by_type, by_severity) for events at or after `since`."""
+        start = minute_bucket(since)
+        combined: Counter = Counter()
+        with self._lock:
+            for minute, bucket in self._buckets.items():
+                if minute >= start:
+                    combined.update(bucket)
+
+        by_type: Dict[str, int] = {}
+        by_severity: Dict[str, int] = {}
+        for (event_type, severity), count in combined.items():
+            by_type[event_type] = by_type.get(event_type, 0) + count
+            by_severity[severity] = by_severity.get(severity, 0) + count
+        return sum(combined.values()), by_type, by_severity
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
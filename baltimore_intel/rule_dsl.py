@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Declarative Correlation Rules
+
+Rules are plain dicts (or YAML/JSON files of them) compiled once, at
+load time, into join plans the hub evaluates per event:
+
+    {
+        "name": "coal_spike_bulk_arrival",
+        "severity": "high",
+        "window_minutes": 60,
+        "events": {
+            "spike": {
+                "type": "commodity_alert",
+                "where": {"raw_data.change_pct": {"abs_gte": 5}},
+                "key": "raw_data.commodity"
+            },
+            "ship": {"type": "vessel_arrival", "key": "raw_data.vessel_type"}
+        },
+        "join": {"left": "spike", "right": "ship", "map": "cargo_vessel_types"},
+        "threshold": 1,
+        "group_by": "spike"
+    }
+
+- `events` names one or two aliases, each with a type (or list of
+  types), optional `where` field predicates and an optional `key`.
+  Field paths are dotted: attributes of the event, then dict keys
+  (`raw_data.vessel.flag`). A bare value means `eq`, a list means `in`;
+  operators are eq, ne, in, not_in, gt, gte, lt, lte, abs_gt, abs_gte,
+  contains and exists.
+- `join` pairs the two aliases by key (equal keys, or through a `map`
+  of left key -> right keys) and/or by distance (`within_nm`).
+- `threshold` is how many partner events (or, for a single alias, how
+  many events sharing a key, counting the new one) must be in the window.
+- `group_by` names the alias whose keys form the correlation entity set.
+
+Compiled plans keep hash tables of recent events by key per alias, so a
+new event looks up only the keys it can join with. Distance-only joins
+use a SpatioTemporalJoin. The hub dispatches an event only to rules that
+mention its type, so adding rules does not add work for unrelated events.
+"""
+
+import json
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from event_geo_index import event_position
+from spatial_index import haversine_nm
+from spatiotemporal_join import SpatioTemporalJoin
+
+try:
+    import yaml
+except ImportError:  # YAML rule files are optional
+    yaml = None
+
+Predicate = Callable[[Any], bool]
+Match = Tuple[Any, Optional[float]]  # (event, distance_nm or None)
+
+_MISSING = object()
+
+
+class RuleSpecError(ValueError):
+    """Raised when a rule spec cannot be compiled."""
+
+
+# ===========================================
+# PREDICATES
+# ===========================================
+
+def _getter(path: str) -> Callable[[Any], Any]:
+    parts = path.split(".")
+
+    def get(event):
+        value = getattr(event, parts[0], _MISSING)
+        for part in parts[1:]:
+            if not isinstance(value, dict):
+                return _MISSING
+            value = value.get(part, _MISSING)
+        if path == "event_type":
+            return value.value
+        return value
+
+    return get
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _operator(op: str, expected) -> Predicate:
+    if op == "eq":
+        return lambda v: v == expected
+    if op == "ne":
+        return lambda v: v != expected
+    if op in ("in", "not_in"):
+        allowed = frozenset(expected)
+        if op == "in":
+            return lambda v: v in allowed
+        return lambda v: v not in allowed
+    if op == "contains":
+        return lambda v: isinstance(v, (str, list, tuple, dict)) and expected in v
+    if op == "exists":
+        return lambda v: (v is not _MISSING and v is not None) == bool(expected)
+
+    compare = {
+        "gt": lambda n: n > expected,
+        "gte": lambda n: n >= expected,
+        "lt": lambda n: n < expected,
+        "lte": lambda n: n <= expected,
+        "abs_gt": lambda n: abs(n) > expected,
+        "abs_gte": lambda n: abs(n) >= expected,
+    }.get(op)
+    if compare is None:
+        raise RuleSpecError(f"Unknown operator: {op}")
+
+    def numeric(v):
+        n = _number(v)
+        return n is not None and compare(n)
+
+    return numeric
+
+
+def compile_where(where: Dict[str, Any]) -> Predicate:
+    """Compile {field path: value | [values] | {op: value}} into one predicate."""
+    checks: List[Tuple[Callable, Predicate]] = []
+    for path, condition in (where or {}).items():
+        get = _getter(path)
+        if isinstance(condition, dict):
+            for op, expected in condition.items():
+                checks.append((get, _operator(op, expected)))
+        elif isinstance(condition, (list, tuple)):
+            checks.append((get, _operator("in", condition)))
+        else:
+            checks.append((get, _operator("eq", condition)))
+
+    if not checks:
+        return lambda event: True
+    return lambda event: all(test(get(event)) for get, test in checks)
+
+
+def _key_function(path: Optional[str]) -> Callable[[Any], Optional[str]]:
+    if not path:
+        return lambda event: None
+    get = _getter(path)
+
+    def key(event):
+        value = get(event)
+        if value is _MISSING or value is None or value == "":
+            return None
+        return str(value).strip().lower()
+
+    return key
+
+
+# ===========================================
+# PLANS
+# ===========================================
+
+class _Source:
+    """One alias: type filter, predicate and key extractor."""
+
+    def __init__(self, alias: str, spec: Dict, known_types: Optional[Iterable[str]]):
+        types = spec.get("type")
+        if not types:
+            raise RuleSpecError(f"Alias '{alias}' needs a type")
+        self.alias = alias
+        self.types: FrozenSet[str] = frozenset([types] if isinstance(types, str) else types)
+        if known_types is not None:
+            unknown = self.types - set(known_types)
+            if unknown:
+                raise RuleSpecError(f"Alias '{alias}' has unknown types: {sorted(unknown)}")
+        self.predicate = compile_where(spec.get("where"))
+        self.key = _key_function(spec.get("key"))
+        self.has_key = bool(spec.get("key"))
+
+    def accepts(self, event) -> bool:
+        return event.event_type.value in self.types and self.predicate(event)
+
+    def key_of(self, event) -> Optional[str]:
+        """Key for events this alias accepts (group_by key function)."""
+        return self.key(event) if self.accepts(event) else None
+
+
+class CompiledRule:
+    """
+    Join plan for one declarative rule. Implements the join interface
+    CorrelationRule expects: add(event) -> matches, advance(now), clear().
+    """
+
+    def __init__(self, spec: Dict, mappings: Optional[Dict[str, Dict]] = None,
+                 known_types: Optional[Iterable[str]] = None):
+        try:
+            self.name = spec["name"]
+            self.window_minutes = float(spec.get("window_minutes", 30))
+        except (KeyError, TypeError, ValueError) as e:
+            raise RuleSpecError(f"Invalid rule spec: {e}") from e
+        self.severity = spec.get("severity", "medium")
+        self.cooldown_minutes = spec.get("cooldown_minutes")
+        self.threshold = int(spec.get("threshold", 1))
+        self.window = timedelta(minutes=self.window_minutes)
+
+        events = spec.get("events") or {}
+        if not 1 <= len(events) <= 2:
+            raise RuleSpecError(f"Rule '{self.name}' needs one or two event aliases")
+        self.sources = {alias: _Source(alias, s, known_types) for alias, s in events.items()}
+        self.event_types = frozenset().union(*(s.types for s in self.sources.values()))
+
+        self.group_by = spec.get("group_by")
+        if self.group_by is not None and self.group_by not in self.sources:
+            raise RuleSpecError(f"Rule '{self.name}' groups by unknown alias '{self.group_by}'")
+        self.keys = (
+            {self.group_by: self.sources[self.group_by].key_of}
+            if self.group_by else {}
+        )
+
+        self._compile_join(spec.get("join"), mappings or {})
+        self.clear()
+
+    def _compile_join(self, join: Optional[Dict], mappings: Dict[str, Dict]):
+        self.left = self.right = None
+        self.within_nm = None
+        self._forward: Optional[Dict[str, FrozenSet[str]]] = None
+        self._reverse: Optional[Dict[str, FrozenSet[str]]] = None
+        self._spatial: Optional[SpatioTemporalJoin] = None
+
+        if len(self.sources) == 1:
+            if join:
+                raise RuleSpecError(f"Rule '{self.name}' joins but has a single alias")
+            self.left = next(iter(self.sources.values()))
+            return
+        if not join:
+            raise RuleSpecError(f"Rule '{self.name}' has two aliases but no join")
+
+        try:
+            self.left = self.sources[join["left"]]
+            self.right = self.sources[join["right"]]
+        except KeyError as e:
+            raise RuleSpecError(f"Rule '{self.name}' joins unknown alias {e}") from e
+        self.within_nm = join.get("within_nm")
+
+        mapping = join.get("map")
+        if isinstance(mapping, str):
+            if mapping not in mappings:
+                raise RuleSpecError(f"Rule '{self.name}' uses unknown map '{mapping}'")
+            mapping = mappings[mapping]
+        if mapping is not None:
+            forward = defaultdict(set)
+            reverse = defaultdict(set)
+            for left_key, right_keys in mapping.items():
+                if isinstance(right_keys, str):
+                    right_keys = [right_keys]
+                for right_key in right_keys:
+                    forward[str(left_key).lower()].add(str(right_key).lower())
+                    reverse[str(right_key).lower()].add(str(left_key).lower())
+            self._forward = {k: frozenset(v) for k, v in forward.items()}
+            self._reverse = {k: frozenset(v) for k, v in reverse.items()}
+
+        keyed = self.left.has_key and self.right.has_key
+        if mapping is not None and not keyed:
+            raise RuleSpecError(f"Rule '{self.name}' maps keys but an alias has no key")
+        if not keyed and self.within_nm is None:
+            raise RuleSpecError(f"Rule '{self.name}' join needs keys or within_nm")
+        if not keyed:
+            if self.left.types & self.right.types:
+                raise RuleSpecError(f"Rule '{self.name}' distance join needs distinct types")
+            self._spatial = SpatioTemporalJoin(
+                [], [], max_distance_nm=float(self.within_nm), max_gap=self.window
+            )
+
+    # ===========================================
+    # EVALUATION
+    # ===========================================
+
+    def clear(self):
+        # alias -> key -> events, plus one arrival-ordered expiry queue
+        self._tables: Dict[str, Dict[Optional[str], deque]] = {
+            alias: defaultdict(deque) for alias in self.sources
+        }
+        self._order: deque = deque()
+        if self._spatial is not None:
+            self._spatial.clear()
+
+    def _insert(self, source: _Source, key: Optional[str], event):
+        self._tables[source.alias][key].append(event)
+        self._order.append((event.timestamp, source.alias, key))
+
+    def add(self, event) -> List[Match]:
+        """Insert an accepted event; return its partners once the threshold is met."""
+        matches: List[Match] = []
+        for source in self.sources.values():
+            if not source.accepts(event):
+                continue
+            key = source.key(event)
+            if source.has_key and key is None:
+                continue
+            if self._spatial is not None:
+                matches.extend(self._probe_spatial(source, event))
+                continue
+            if self.right is None:
+                matches.extend(self._probe_group(source, key, event))
+            else:
+                matches.extend(self._probe_keys(source, key, event))
+            self._insert(source, key, event)
+
+        if self.right is None:
+            return matches if len(matches) + 1 >= self.threshold else []
+        return matches if len(matches) >= self.threshold else []
+
+    def _in_window(self, event, other) -> bool:
+        return abs(event.timestamp - other.timestamp) <= self.window and other is not event
+
+    def _probe_group(self, source: _Source, key, event) -> List[Match]:
+        return [(other, None) for other in self._tables[source.alias][key] if self._in_window(event, other)]
+
+    def _probe_keys(self, source: _Source, key: str, event) -> List[Match]:
+        if source is self.left:
+            other, lookup = self.right, self._forward
+        else:
+            other, lookup = self.left, self._reverse
+        partner_keys = lookup.get(key, ()) if lookup is not None else (key,)
+
+        table = self._tables[other.alias]
+        candidates = [
+            o for k in partner_keys if k in table
+            for o in table[k] if self._in_window(event, o)
+        ]
+        if self.within_nm is None or not candidates:
+            return [(o, None) for o in candidates]
+
+        position = event_position(event)
+        located = [(o, p) for o in candidates for p in [event_position(o)] if p is not None]
+        if position is None or not located:
+            return []
+        distances = haversine_nm(
+            position[0], position[1],
+            [p[0] for _, p in located], [p[1] for _, p in located]
+        )
+        found = [(o, float(d)) for (o, _), d in zip(located, distances) if d <= self.within_nm]
+        found.sort(key=lambda m: m[1])
+        return found
+
+    def _probe_spatial(self, source: _Source, event) -> List[Match]:
+        return self._spatial.add(event, side=0 if source is self.left else 1)
+
+    def advance(self, now: datetime):
+        """Expire events older than now - window."""
+        cutoff = now - self.window
+        order = self._order
+        while order and order[0][0] < cutoff:
+            _, alias, key = order.popleft()
+            bucket = self._tables[alias].get(key)
+            if bucket:
+                bucket.popleft()
+                if not bucket:
+                    del self._tables[alias][key]
+        if self._spatial is not None:
+            self._spatial.advance(now)
+
+
+# ===========================================
+# LOADING
+# ===========================================
+
+RuleSource = Union[str, Path, Dict, List[Dict]]
+
+
+def load_rule_specs(source: RuleSource) -> List[Dict]:
+    """
+    Rule specs from a list, a {"rules": [...]} dict, a single rule dict,
+    or a .json/.yaml/.yml file containing either form.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        text = path.read_text()
+        if path.suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise RuleSpecError("PyYAML is required for YAML rule files")
+            source = yaml.safe_load(text)
+        else:
+            source = json.loads(text)
+
+    if isinstance(source, dict):
+        source = source["rules"] if "rules" in source else [source]
+    if not isinstance(source, list):
+        raise RuleSpecError("Rules must be a list of rule specs")
+    return source
+
+
+def compile_rules(
+    source: RuleSource,
+    mappings: Optional[Dict[str, Dict]] = None,
+    known_types: Optional[Iterable[str]] = None
+) -> List[CompiledRule]:
+    """Load and compile every rule; raises RuleSpecError on the first bad one."""
+    return [CompiledRule(spec, mappings, known_types) for spec in load_rule_specs(source)]
@@ -13,6 +13,8 @@ from typing import Dict, List
 from dataclasses import dataclass
 from enum import Enum
 
+from keyword_matcher import get_transcript_matcher
+
 class FeedCategory(Enum):
     MARITIME = "maritime"
     RAIL = "rail"
@@ -273,15 +275,10 @@ def categorize_transcript(text: str) -> Dict[str, List[str]]:
 
     Returns dict of category -> matched keywords
     """
-    text_lower = text.lower()
-    matches = {}
-
-    for category, keywords in KEYWORD_CATEGORIES.items():
-        found = [kw for kw in keywords if kw in text_lower]
-        if found:
-            matches[category] = found
-
-    return matches
+    return {
+        category: list(keywords)
+        for category, keywords in get_transcript_matcher().matches(text, "scanner").items()
+    }
 
 
 # Feed URLs for direct streaming (requires Broadcastify subscription)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Background-Refreshed Snapshot Cache
+
+Wraps an expensive loader (market fetches, national train downloads)
+so that many readers share one result:
+- fresh values (younger than ttl) are returned directly
+- stale values (older than ttl, younger than max_stale) are returned
+  immediately while a single background refresh runs
+- missing or expired values block the caller on one shared load
+- until the first successful load, readers get `default`
+
+Every successful load bumps `version`; the value and its version are
+stored together, and memoize() caches results derived from one value
+for that value's version only.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SnapshotCache:
+    """Process-wide cached value with stale-while-revalidate semantics."""
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        ttl: float = 300.0,
+        max_stale: Optional[float] = 3600.0,
+        name: str = "snapshot",
+        default: Any = None
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.name = name
+        # (value, version), replaced as one object on each load
+        self._state: Tuple[Any, int] = (default, 0)
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._memo: Dict[Hashable, Any] = {}
+        self._memo_version = 0
+        self._auto_refresh: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def version(self) -> int:
+        """Number of successful loads so far."""
+        return self._state[1]
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful load, or None."""
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def get(self) -> Any:
+        """Return the cached value, loading or refreshing as needed."""
+        return self.get_versioned()[0]
+
+    def get_versioned(self) -> Tuple[Any, int]:
+        """Return (value, version) from the same load."""
+        age = self.age
+        if age is not None and age < self.ttl:
+            return self._state
+
+        if age is not None and (self.max_stale is None or age < self.max_stale):
+            state = self._state
+            self._refresh_in_background()
+            return state
+
+        # Nothing usable cached: load in the foreground
+        with self._lock:
+            age = self.age
+            if age is None or age >= self.ttl:
+                self._load()
+            return self._state
+
+    def refresh(self) -> Any:
+        """Reload now, blocking the caller."""
+        with self._lock:
+            self._load()
+            return self._state[0]
+
+    def memoize(self, key: Hashable, compute: Callable[[Any], Any]) -> Any:
+        """Return compute(value) cached for the version of that value."""
+        value, version = self.get_versioned()
+        if self._memo_version != version:
+            self._memo = {}
+            self._memo_version = version
+        memo = self._memo
+        if key not in memo:
+            memo[key] = compute(value)
+        return memo[key]
+
+    def invalidate(self):
+        """Force the next get() to reload."""
+        self._loaded_at = None
+
+    def start_auto_refresh(self, interval: Optional[float] = None):
+        """Refresh periodically on a daemon thread (default: every ttl)."""
+        if self._auto_refresh is not None:
+            return
+        interval = interval or self.ttl
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing {self.name}: {e}")
+
+        self._auto_refresh = threading.Thread(
+            target=run, name=f"{self.name}-refresh", daemon=True
+        )
+        self._auto_refresh.start()
+
+    def stop_auto_refresh(self):
+        """Stop the periodic refresh thread."""
+        self._stop.set()
+        self._auto_refresh = None
+
+    def _load(self):
+        """Run the loader. Must be called with _lock held."""
+        try:
+            value = self.loader()
+        except Exception as e:
+            print(f"Error loading {self.name}: {e}")
+            return
+        self._state = (value, self._state[1] + 1)
+        self._loaded_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                with self._lock:
+                    if self.age is None or self.age >= self.ttl:
+                        self._load()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name=f"{self.name}-revalidate", daemon=True).start()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grid Spatial Index
+
+Answers "what is within N nautical miles of here?" without scanning
+every point:
+- points are projected onto a local equirectangular plane (nm) and
+  bucketed into square grid cells
+- a query only visits the cells its radius can reach, then filters the
+  candidates with a vectorized haversine
+- batch queries group positions by cell so each cell's candidates are
+  gathered once and scored as one distance matrix
+
+The index is immutable; owners rebuild it when their point set changes.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_NM = 3440.065
+NM_PER_DEGREE = 60.0
+
+
+def haversine_nm(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in nautical miles (broadcasts over arrays)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """Uniform grid over a static set of points."""
+
+    def __init__(
+        self,
+        ids: Sequence[Hashable],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        cell_nm: float = 1.0
+    ):
+        self.ids = list(ids)
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.cell_nm = cell_nm
+        self.ref_lat = float(self.lats.mean()) if len(self.lats) else 0.0
+        self._x_scale = NM_PER_DEGREE * math.cos(math.radians(self.ref_lat)) / cell_nm
+        self._y_scale = NM_PER_DEGREE / cell_nm
+
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, cell in enumerate(zip(*self._cells(self.lats, self.lons))):
+            cells[cell].append(i)
+        self._grid = {cell: np.array(members) for cell, members in cells.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _cells(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cx = np.floor(lons * self._x_scale).astype(int)
+        cy = np.floor(lats * self._y_scale).astype(int)
+        return cx, cy
+
+    def _reach(self, lat: float, radius_nm: float) -> Tuple[int, int]:
+        """Cells to visit in x and y for a radius around `lat`."""
+        # East-west cells shrink away from ref_lat; size the ring for the
+        # worst latitude the radius can reach, plus one cell of slack.
+        far_lat = min(abs(lat) + radius_nm / NM_PER_DEGREE, 89.0)
+        stretch = math.cos(math.radians(self.ref_lat)) / math.cos(math.radians(far_lat))
+        kx = math.ceil(radius_nm * max(stretch, 1.0) / self.cell_nm) + 1
+        ky = math.ceil(radius_nm / self.cell_nm) + 1
+        return kx, ky
+
+    def _candidates(self, cx: int, cy: int, kx: int, ky: int) -> np.ndarray:
+        if (2 * kx + 1) * (2 * ky + 1) > len(self._grid):
+            # Radius covers more cells than are occupied: scan occupied ones
+            found = [
+                members for (x, y), members in self._grid.items()
+                if abs(x - cx) <= kx and abs(y - cy) <= ky
+            ]
+        else:
+            found = [
+                self._grid[(x, y)]
+                for x in range(cx - kx, cx + kx + 1)
+                for y in range(cy - ky, cy + ky + 1)
+                if (x, y) in self._grid
+            ]
+        if not found:
+            return np.empty(0, dtype=int)
+        # Registry order keeps equal-distance results stable
+        return np.sort(np.concatenate(found))
+
+    def query(self, lat: float, lon: float, radius_nm: float) -> List[Tuple[int, float]]:
+        """(point index, distance_nm) within radius, nearest first."""
+        return self.query_batch([lat], [lon], radius_nm)[0]
+
+    def query_batch(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        radius_nm: float
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Run query() for many positions at once.
+
+        Positions sharing a grid cell share one candidate gather and one
+        vectorized distance matrix.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        results: List[List[Tuple[int, float]]] = [[] for _ in range(len(lats))]
+        if not len(lats) or not self._grid:
+            return results
+
+        cx, cy = self._cells(lats, lons)
+        groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for q, cell in enumerate(zip(cx.tolist(), cy.tolist())):
+            groups[cell].append(q)
+
+        for (x, y), members in groups.items():
+            members = np.array(members)
+            group_lats = lats[members]
+            kx, ky = self._reach(float(np.abs(group_lats).max()), radius_nm)
+            candidates = self._candidates(x, y, kx, ky)
+            if not len(candidates):
+                continue
+
+            distances = haversine_nm(
+                group_lats[:, None], lons[members][:, None],
+                self.lats[candidates][None, :], self.lons[candidates][None, :]
+            )
+            for row, q in enumerate(members.tolist()):
+                hits = np.nonzero(distances[row] <= radius_nm)[0]
+                order = hits[np.argsort(distances[row, hits], kind="stable")]
+                results[q] = [
+                    (int(candidates[i]), float(distances[row, i])) for i in order
+                ]
+
+        return results
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spatio-Temporal Join for Correlation Rules
+
+Pairs events of two groups of types (e.g. vessel arrivals with
+infrastructure alerts) only when they are within a distance and a time
+gap of each other:
+- events are bucketed by (time bucket, grid cell); buckets are as long
+  as the allowed gap and cells as wide as the allowed distance
+- a new event probes the opposite side's buckets in the neighbouring
+  cells of the adjacent time buckets, then is inserted into its own side
+- candidates are confirmed with haversine distance and |dt|
+- whole time buckets are dropped as the watermark passes them
+
+Cost per event is proportional to the events near it in space and
+time, not to every event in the rule's window.
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from spatial_index import NM_PER_DEGREE, haversine_nm
+
+Cell = Tuple[int, int]
+
+
+def _position(event) -> Optional[Tuple[float, float]]:
+    location = event.location or {}
+    try:
+        return float(location["lat"]), float(location["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class SpatioTemporalJoin:
+    """Incremental distance-and-time join between two event groups."""
+
+    def __init__(
+        self,
+        left_types: Iterable,
+        right_types: Iterable,
+        max_distance_nm: float,
+        max_gap: timedelta
+    ):
+        self.left_types = frozenset(left_types)
+        self.right_types = frozenset(right_types)
+        self.max_distance_nm = max_distance_nm
+        self.max_gap = max_gap
+        self._cell_deg = max_distance_nm / NM_PER_DEGREE
+        self._bucket_seconds = max(max_gap.total_seconds(), 1.0)
+        # time bucket -> side -> cell -> [(event, lat, lon, ts)]
+        self._buckets: Dict[int, Tuple[Dict[Cell, list], Dict[Cell, list]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _side(self, event) -> Optional[int]:
+        if event.event_type in self.left_types:
+            return 0
+        if event.event_type in self.right_types:
+            return 1
+        return None
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return math.floor(lon / self._cell_deg), math.floor(lat / self._cell_deg)
+
+    def add(self, event, side: Optional[int] = None) -> List[Tuple[object, float]]:
+        """
+        Insert an event and return (other event, distance_nm) for every
+        opposite-side event within range, nearest first. Events without
+        a position or of other types are ignored. Pass `side` (0 = left,
+        1 = right) to place an event explicitly instead of by type.
+        """
+        if side is None:
+            side = self._side(event)
+        position = _position(event)
+        if side is None or position is None:
+            return []
+        lat, lon = position
+        ts = event.timestamp.timestamp()
+        bucket = math.floor(ts / self._bucket_seconds)
+        cx, cy = self._cell(lat, lon)
+
+        matches = self._probe(1 - side, lat, lon, ts, bucket, cx, cy)
+
+        sides = self._buckets.get(bucket)
+        if sides is None:
+            sides = self._buckets[bucket] = (defaultdict(list), defaultdict(list))
+        sides[side][(cx, cy)].append((event, lat, lon, ts))
+        self._size += 1
+        return matches
+
+    def _probe(self, side: int, lat: float, lon: float, ts: float, bucket: int, cx: int, cy: int):
+        # Longitude cells narrow with latitude: widen the east-west reach
+        far_lat = min(abs(lat) + self._cell_deg, 89.0)
+        kx = math.ceil(1.0 / math.cos(math.radians(far_lat)))
+        gap = self.max_gap.total_seconds()
+
+        candidates = []
+        for b in (bucket - 1, bucket, bucket + 1):
+            sides = self._buckets.get(b)
+            if sides is None:
+                continue
+            cells = sides[side]
+            for x in range(cx - kx, cx + kx + 1):
+                for y in (cy - 1, cy, cy + 1):
+                    for entry in cells.get((x, y), ()):
+                        if abs(entry[3] - ts) <= gap:
+                            candidates.append(entry)
+        if not candidates:
+            return []
+
+        distances = haversine_nm(
+            lat, lon,
+            [entry[1] for entry in candidates],
+            [entry[2] for entry in candidates]
+        )
+        matches = [
+            (entry[0], float(d)) for entry, d in zip(candidates, distances)
+            if d <= self.max_distance_nm
+        ]
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    def advance(self, watermark: datetime) -> int:
+        """Drop buckets that can no longer match. Returns events dropped."""
+        horizon = math.floor((watermark - self.max_gap).timestamp() / self._bucket_seconds) - 1
+        dropped = 0
+        for bucket in [b for b in self._buckets if b < horizon]:
+            for cells in self._buckets.pop(bucket):
+                dropped += sum(len(entries) for entries in cells.values())
+        self._size -= dropped
+        return dropped
+
+    def clear(self):
+        self._buckets.clear()
+        self._size = 0
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filtered Subscriptions with Asynchronous Fan-Out
+
+Subscribers (Slack, webhooks, dashboards) register a callback plus an
+optional filter: event types, minimum severity, a bounding box and/or
+entities. Delivery is kept off the ingest path:
+- filters are indexed by event type and by entity, so publishing an
+  event only looks at subscriptions that could want it; severity and
+  bbox are then checked per candidate
+- each asynchronous subscription has its own bounded queue drained by
+  its own daemon thread, so a slow consumer only delays itself
+- when a queue is full the subscription's policy decides: drop the
+  oldest queued event, drop the new one, or block the publisher briefly
+  before dropping; after `max_consecutive_drops` drops in a row the
+  subscription is disconnected as a slow consumer (the hub publishes
+  after releasing its lock, so a blocked publisher stalls only itself)
+- per-subscription counters and delivery latency (enqueue to callback
+  return, over the most recent deliveries) are exposed through stats()
+
+Synchronous subscriptions are delivered inline on the publishing thread,
+for replay and tests that need deterministic ordering.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set
+
+from entity_index import event_entities
+from event_archive import normalize_entity
+from event_geo_index import BBox, SEVERITY_RANK, event_position, parse_bbox
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# Latency samples kept per subscription for percentiles
+LATENCY_SAMPLES = 1024
+
+
+class SubscriptionFilter:
+    """Which events a subscription wants; unset fields match everything."""
+
+    __slots__ = ("event_types", "min_rank", "min_severity", "bbox", "entities")
+
+    def __init__(
+        self,
+        event_types: Optional[Iterable] = None,
+        min_severity: Optional[str] = None,
+        bbox=None,
+        entities: Optional[Iterable[str]] = None
+    ):
+        self.event_types = frozenset(event_types) if event_types else None
+        if min_severity is not None and min_severity not in SEVERITY_RANK:
+            raise ValueError(f"Unknown severity: {min_severity}")
+        self.min_severity = min_severity
+        self.min_rank = SEVERITY_RANK.get(min_severity, 0) if min_severity else 0
+        self.bbox: Optional[BBox] = parse_bbox(bbox) if isinstance(bbox, str) else (
+            tuple(bbox) if bbox is not None else None
+        )
+        keys = [normalize_entity(e) for e in entities or [] if e is not None]
+        self.entities = frozenset(k for k in keys if k) or None
+
+    def matches_rest(self, event) -> bool:
+        """Severity and bbox checks (types and entities are indexed)."""
+        if self.min_rank and SEVERITY_RANK.get(event.severity, 0) < self.min_rank:
+            return False
+        if self.bbox is not None:
+            position = event_position(event)
+            if position is None:
+                return False
+            lat, lon = position
+            min_lon, min_lat, max_lon, max_lat = self.bbox
+            if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                return False
+        return True
+
+    def matches(self, event) -> bool:
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return False
+        if self.entities is not None and self.entities.isdisjoint(event_entities(event)):
+            return False
+        return self.matches_rest(event)
+
+    def to_dict(self) -> Dict:
+        return {
+            "event_types": sorted(
+                getattr(t, "value", str(t)) for t in self.event_types
+            ) if self.event_types else None,
+            "min_severity": self.min_severity,
+            "bbox": list(self.bbox) if self.bbox else None,
+            "entities": sorted(self.entities) if self.entities else None
+        }
+
+
+class Subscription:
+    """A callback, its filter, and (when asynchronous) its delivery queue."""
+
+    def __init__(
+        self,
+        subscription_id: int,
+        callback: Callable,
+        event_filter: SubscriptionFilter,
+        name: Optional[str] = None,
+        synchronous: bool = False,
+        queue_size: int = 1000,
+        policy: str = DROP_OLDEST,
+        block_timeout: float = 0.1,
+        max_consecutive_drops: Optional[int] = None,
+        on_disconnect: Optional[Callable[["Subscription"], None]] = None
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        self.id = subscription_id
+        self.callback = callback
+        self.filter = event_filter
+        self.name = name or getattr(callback, "__qualname__", None) or f"subscription-{subscription_id}"
+        self.synchronous = synchronous
+        self.queue_size = queue_size
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.max_consecutive_drops = max_consecutive_drops
+        self._on_disconnect = on_disconnect
+
+        self._queue: Deque = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self.active = True
+        self.disconnected_reason: Optional[str] = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._consecutive_drops = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.max_latency = 0.0
+
+    # ===========================================
+    # PUBLISH SIDE
+    # ===========================================
+
+    def offer(self, event):
+        """Hand an event to this subscriber (called by the publisher)."""
+        if not self.active:
+            return
+        if self.synchronous:
+            self._deliver(event, time.monotonic())
+            return
+
+        item = (event, time.monotonic())
+        disconnect = False
+        with self._cond:
+            if len(self._queue) >= self.queue_size and self.policy == BLOCK:
+                self._cond.wait_for(
+                    lambda: len(self._queue) < self.queue_size or not self.active,
+                    self.block_timeout
+                )
+            if not self.active:
+                return
+            if len(self._queue) < self.queue_size:
+                self._queue.append(item)
+                self._consecutive_drops = 0
+            else:
+                self.dropped += 1
+                self._consecutive_drops += 1
+                if self.policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self._queue.append(item)
+                if (self.max_consecutive_drops is not None
+                        and self._consecutive_drops >= self.max_consecutive_drops):
+                    disconnect = True
+            self._cond.notify_all()
+            if self._thread is None and not disconnect:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"intel-subscriber-{self.id}", daemon=True
+                )
+                self._thread.start()
+        if disconnect:
+            self.close("slow consumer")
+
+    # ===========================================
+    # DELIVERY SIDE
+    # ===========================================
+
+    def _deliver(self, event, enqueued: float):
+        try:
+            self.callback(event)
+        except Exception as e:
+            self.errors += 1
+            print(f"Subscriber {self.name} callback error: {e}")
+        else:
+            self.delivered += 1
+        latency = time.monotonic() - enqueued
+        self._latencies.append(latency)
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self.active)
+                if not self._queue:
+                    return
+                event, enqueued = self._queue.popleft()
+                self._in_flight += 1
+                self._cond.notify_all()
+            try:
+                self._deliver(event, enqueued)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been delivered."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._in_flight, timeout
+            )
+
+    def close(self, reason: Optional[str] = None):
+        """Stop delivery; queued events are discarded."""
+        with self._cond:
+            if not self.active:
+                return
+            self.active = False
+            self.disconnected_reason = reason
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._on_disconnect is not None:
+            self._on_disconnect(self)
+
+    def stats(self) -> Dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "filter": self.filter.to_dict(),
+            "mode": "sync" if self.synchronous else "async",
+            "policy": self.policy,
+            "active": self.active,
+            "disconnected_reason": self.disconnected_reason,
+            "queue_depth": len(self._queue),
+            "queue_size": self.queue_size,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(self.max_latency * 1000, 3)
+            }
+        }
+
+
+class SubscriptionManager:
+    """Subscriptions indexed by event type and entity."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._subscriptions: Dict[int, Subscription] = {}
+        # Event type (None = any) -> subscription ids
+        self._by_type: Dict[object, Set[int]] = {}
+        # Entity -> ids of subscriptions filtering on it; the rest are entity-free
+        self._by_entity: Dict[str, Set[int]] = {}
+        self._entity_free: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        callback: Callable,
+        event_types: Optional[Iterable] = None,
+        min_severity: Optional[str] = None,
+        bbox=None,
+        entities: Optional[Iterable[str]] = None,
+        **options
+    ) -> Subscription:
+        """
+        Register a filtered subscription. Options are passed to
+        Subscription (name, synchronous, queue_size, policy,
+        block_timeout, max_consecutive_drops).
+        """
+        event_filter = SubscriptionFilter(event_types, min_severity, bbox, entities)
+        with self._lock:
+            subscription = Subscription(
+                next(self._ids), callback, event_filter,
+                on_disconnect=self._forget, **options
+            )
+            sid = subscription.id
+            self._subscriptions[sid] = subscription
+            for event_type in event_filter.event_types or (None,):
+                self._by_type.setdefault(event_type, set()).add(sid)
+            if event_filter.entities is None:
+                self._entity_free.add(sid)
+            else:
+                for entity in event_filter.entities:
+                    self._by_entity.setdefault(entity, set()).add(sid)
+        return subscription
+
+    def unsubscribe(self, subscription) -> bool:
+        sid = getattr(subscription, "id", subscription)
+        found = self._subscriptions.get(sid)
+        if found is None:
+            return False
+        found.close("unsubscribed")
+        return True
+
+    def _forget(self, subscription: Subscription):
+        """Drop a closed subscription from the indexes."""
+        with self._lock:
+            sid = subscription.id
+            if self._subscriptions.pop(sid, None) is None:
+                return
+            for event_type in subscription.filter.event_types or (None,):
+                ids = self._by_type.get(event_type)
+                if ids is not None:
+                    ids.discard(sid)
+                    if not ids:
+                        del self._by_type[event_type]
+            self._entity_free.discard(sid)
+            for entity in subscription.filter.entities or ():
+                ids = self._by_entity.get(entity)
+                if ids is not None:
+                    ids.discard(sid)
+                    if not ids:
+                        del self._by_entity[entity]
+
+    def matching(self, event) -> List[Subscription]:
+        """Subscriptions whose filter accepts the event, in subscribe order."""
+        with self._lock:
+            by_type = self._by_type
+            candidates = by_type.get(None, set()) | by_type.get(event.event_type, set())
+            if not candidates:
+                return []
+            wanted = candidates & self._entity_free
+            if self._by_entity:
+                for entity in event_entities(event):
+                    ids = self._by_entity.get(entity)
+                    if ids:
+                        wanted |= candidates & ids
+            subscriptions = [self._subscriptions[sid] for sid in sorted(wanted)]
+        return [s for s in subscriptions if s.filter.matches_rest(event)]
+
+    def publish(self, event):
+        """Deliver (sync) or enqueue (async) the event to every match."""
+        for subscription in self.matching(event):
+            subscription.offer(event)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for every asynchronous queue to drain."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for subscription in list(self._subscriptions.values()):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not subscription.flush(remaining):
+                return False
+        return True
+
+    def stats(self) -> List[Dict]:
+        return [s.stats() for s in list(self._subscriptions.values())]
+
+    def close(self):
+        for subscription in list(self._subscriptions.values()):
+            subscription.close("closed")
@@ -6,6 +6,7 @@ Pytest configuration and fixtures for baltimore_intel tests.
 import pytest
 import sys
 import os
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 
 # Add parent directory to path for imports
@@ -85,6 +86,29 @@ def intelligence_hub():
     return IntelligenceHub()
 
 
+@pytest.fixture
+def make_event():
+    """
+    Factory for IntelEvents with test defaults. Integer ids become
+    "e<i>", the timestamp defaults to now and is shifted by `minutes`,
+    and any other IntelEvent field can be passed by keyword.
+    """
+    from intelligence_hub import IntelEvent, EventType
+
+    def factory(event_id="e1", event_type=EventType.SCANNER_ALERT, timestamp=None,
+                minutes=0, **fields):
+        if isinstance(event_id, int):
+            event_id = f"e{event_id}"
+        fields.setdefault("source", "test")
+        fields.setdefault("title", f"Event {event_id}")
+        fields.setdefault("description", "")
+        fields.setdefault("severity", "info")
+        when = (timestamp or datetime.now()) + timedelta(minutes=minutes)
+        return IntelEvent(id=event_id, timestamp=when, event_type=event_type, **fields)
+
+    return factory
+
+
 @pytest.fixture
 def infrastructure_monitor():
     """Create a fresh InfrastructureMonitor instance."""
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for cached, conditional and compressed API responses.
+"""
+
+import gzip
+import json
+from datetime import datetime
+
+import api_responses
+from api_responses import ResponseCache, dumps
+from intelligence_hub import IntelligenceHub, create_intelligence_api
+from snapshot_cache import SnapshotCache
+
+
+class TestResponseCache:
+    """Test per-version body caching."""
+
+    def test_builds_once_per_version(self):
+        cache = ResponseCache()
+        builds = []
+
+        def build():
+            builds.append(1)
+            return {"v": len(builds)}
+
+        first = cache.get("k", 1, build)
+        again = cache.get("k", 1, build)
+        newer = cache.get("k", 2, build)
+
+        assert first is again
+        assert json.loads(newer.body) == {"v": 2}
+        assert len(builds) == 2
+        assert first.etag != newer.etag
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """Without orjson the stdlib encoder produces the same JSON."""
+        payload = {"a": [1, 2.5, None], "b": "x", "when": datetime(2025, 6, 2, 8, 0)}
+        fast = json.loads(dumps(payload))
+        monkeypatch.setattr(api_responses, "orjson", None)
+        assert json.loads(dumps(payload)) == fast
+
+
+class TestConditionalResponses:
+    """Test ETag, 304 and compression on the Flask API."""
+
+    def test_infrastructure_etag_and_gzip(self):
+        client = create_intelligence_api(IntelligenceHub()).test_client()
+
+        plain = client.get("/api/infrastructure")
+        etag = plain.headers["ETag"]
+        unchanged = client.get("/api/infrastructure", headers={"If-None-Match": etag})
+        zipped = client.get("/api/infrastructure", headers={"Accept-Encoding": "gzip"})
+
+        assert plain.status_code == 200
+        assert "Last-Modified" in plain.headers
+        assert unchanged.status_code == 304 and unchanged.data == b""
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+
+        # The gzip variant has different bytes, so it has its own tag
+        assert zipped.headers["ETag"] == etag[:-1] + '-gzip"'
+        revalidated = client.get("/api/infrastructure", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]
+        })
+        assert revalidated.status_code == 304
+
+    def test_commodities_read_hub_snapshot(self):
+        """The endpoint serves (and versions) the hub's own snapshot."""
+        prices = iter(range(1, 10))
+        market = SnapshotCache(lambda: {"commodities": {"coal": {"price": next(prices)}}, "alerts": []},
+                               ttl=float("inf"))
+        client = create_intelligence_api(IntelligenceHub(commodity_snapshot=market)).test_client()
+
+        first = client.get("/api/commodities")
+        market.refresh()
+        second = client.get("/api/commodities", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert first.get_json()["commodities"] == {"coal": {"price": 1}}
+        assert second.status_code == 200
+        assert second.get_json()["commodities"] == {"coal": {"price": 2}}
+
+    def test_status_revalidates_on_ingest(self, make_event):
+        """The cached report is reused until the hub's data changes."""
+        market = SnapshotCache(lambda: {"commodities": {}, "alerts": []}, ttl=float("inf"))
+        hub = IntelligenceHub(commodity_snapshot=market)
+        client = create_intelligence_api(hub).test_client()
+        hub.rail_snapshot.loader = lambda: []
+        hub.infrastructure_snapshot.loader = lambda: {}
+
+        etag = client.get("/api/status").headers["ETag"]
+        assert client.get("/api/status", headers={"If-None-Match": etag}).status_code == 304
+
+        hub.ingest_event(make_event("s1", raw_data={"n": 1}))
+        changed = client.get("/api/status", headers={"If-None-Match": etag})
+
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_events_splice_frozen_payloads(self, make_event):
+        """In-memory /api/events matches to_dict() of the events."""
+        hub = IntelligenceHub(default_rules=False)
+        hub.ingest_event(make_event("s1", raw_data={"n": 1}))
+        client = create_intelligence_api(hub).test_client()
+
+        body = client.get("/api/events?hours=1").get_json()
+
+        assert hub.store.get("s1").frozen
+        assert body == {"events": [hub.store.get("s1").to_dict()], "next_cursor": None}
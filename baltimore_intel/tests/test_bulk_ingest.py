@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk NDJSON ingest.
+
+Tests incremental line splitting, mixed-kind records, per-line results
+and the /api/ingest/bulk endpoint.
+"""
+
+import io
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from bulk_ingest import bulk_ingest, iter_lines, LineTooLong
+from intelligence_hub import IntelligenceHub, IntelEvent, EventType, create_intelligence_api
+
+
+def ndjson(*records) -> bytes:
+    return b"".join(
+        (r if isinstance(r, bytes) else json.dumps(r).encode()) + b"\n" for r in records
+    )
+
+
+def vessel(mmsi):
+    return {"kind": "vessel", "data": {"mmsi": mmsi, "name": f"SHIP {mmsi}",
+                                       "ship_type_text": "container", "lat": 39.26, "lon": -76.58}}
+
+
+class TestIterLines:
+    """Test chunked line splitting."""
+
+    def test_lines_span_chunks(self):
+        """Lines split across reads are reassembled, final newline optional."""
+        body = b'{"a": 1}\n\n{"b": 2}\n{"c": 3}'
+        lines = list(iter_lines(io.BytesIO(body), chunk_bytes=3))
+
+        assert lines == [(1, b'{"a": 1}'), (2, b""), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+    def test_long_line_rejected_and_skipped(self):
+        """An over-long line is reported once and parsing resumes after it."""
+        body = b"x" * 50 + b"\nok\n"
+        lines = list(iter_lines(io.BytesIO(body), chunk_bytes=8, max_line_bytes=16))
+
+        assert isinstance(lines[0][1], LineTooLong)
+        assert lines[1:] == [(2, b"ok")]
+
+
+class TestBulkIngest:
+    """Test batch ingest of mixed records."""
+
+    def test_mixed_kinds_and_errors(self):
+        """Each line gets an id or an error; good lines are ingested."""
+        hub = IntelligenceHub()
+        event = IntelEvent(
+            id="ext1", timestamp=datetime.now(), event_type=EventType.RAIL_MOVEMENT,
+            source="relay", title="Rail", description="", severity="info"
+        )
+        body = ndjson(
+            vessel("367000001"),
+            {"kind": "scanner", "data": {"transcript": "vessel in the channel", "feed": "harbor"}},
+            b"not json",
+            {"kind": "teleport", "data": {}},
+            {"kind": "infrastructure", "data": {"infra_id": "nope", "alert_type": "x"}},
+            event.to_dict(),
+            vessel("367000002")
+        )
+
+        results, summary = bulk_ingest(hub, iter_lines(io.BytesIO(body)), batch_size=2)
+
+        assert summary == {"lines": 7, "accepted": 4, "rejected": 3, "batches": 2}
+        assert [r["line"] for r in results if "error" in r] == [3, 4, 5]
+        assert results[5]["id"].startswith("evt_")
+        ids = {e.id for e in hub.store.range()}
+        assert {r["id"] for r in results if "id" in r} <= ids
+        assert len(hub.entity_index.events("367000002")) == 1
+
+
+    def test_plain_event_timestamps_normalized(self):
+        """Timezone-aware timestamps are stored as naive local time."""
+        hub = IntelligenceHub()
+        record = {"event_type": "rail_movement", "id": "ext1",
+                  "timestamp": datetime.now(timezone.utc).isoformat()}
+
+        body = ndjson(record, dict(record, timestamp="soon"))
+
+        results, summary = bulk_ingest(hub, iter_lines(io.BytesIO(body)))
+
+        assert summary["accepted"] == 1
+        assert results[1]["error"] == "missing or invalid timestamp"
+        assert hub.store.get(results[0]["id"]).timestamp.tzinfo is None
+
+    def test_ingest_failure_is_reported_per_line(self):
+        """One event failing to ingest does not fail the batch."""
+        hub = IntelligenceHub()
+        add = hub.entity_index.add
+
+        def flaky_add(event):
+            if "367000002" in (event.entities or []):
+                raise RuntimeError("index unavailable")
+            add(event)
+
+        body = ndjson(vessel("367000001"), vessel("367000002"), vessel("367000003"))
+
+        with patch.object(hub.entity_index, "add", side_effect=flaky_add):
+            results, summary = bulk_ingest(hub, iter_lines(io.BytesIO(body)))
+
+        assert summary == {"lines": 3, "accepted": 2, "rejected": 1, "batches": 1}
+        assert results[1] == {"line": 2, "error": "ingest failed: index unavailable"}
+        assert [r["id"] in hub.store for r in (results[0], results[2])] == [True, True]
+
+
+class TestBulkEndpoint:
+    """Test /api/ingest/bulk."""
+
+    def test_endpoint_reports_per_line(self):
+        hub = IntelligenceHub()
+        client = create_intelligence_api(hub).test_client()
+
+        response = client.post(
+            "/api/ingest/bulk?errors_only=1",
+            data=ndjson(vessel("1"), {"kind": "vessel"}, vessel("2")),
+            content_type="application/x-ndjson"
+        )
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body["accepted"] == 2
+        assert body["results"] == [{"line": 2, "error": "data must be an object"}]
+
+    def test_mistyped_fields_fail_only_their_line(self):
+        """Badly typed fields are line errors even after earlier batches are committed."""
+        hub = IntelligenceHub()
+        client = create_intelligence_api(hub).test_client()
+        body = ndjson(
+            vessel("1"), vessel("2"),
+            {"kind": "scanner", "data": {"transcript": 123}},
+            {"kind": "vessel", "data": {"ship_type_text": None}},
+            vessel("3")
+        )
+
+        response = client.post("/api/ingest/bulk?batch_size=1&errors_only=1", data=body,
+                               content_type="application/x-ndjson")
+
+        result = response.get_json()
+        assert response.status_code == 200
+        assert result["accepted"] == 3 and result["rejected"] == 2
+        assert [r["line"] for r in result["results"]] == [3, 4]
+        assert all(r["error"] for r in result["results"])
+        assert len(hub.store) == 3
+
+    def test_async_mode_queues(self):
+        hub = IntelligenceHub()
+        hub.start_workers(1)
+        client = create_intelligence_api(hub).test_client()
+
+        response = client.post("/api/ingest/bulk", data=ndjson(vessel("1"), vessel("2")))
+        hub.stop_workers()
+
+        assert response.status_code == 202
+        assert response.get_json()["status"] == "queued"
+        assert len(hub.store) == 2
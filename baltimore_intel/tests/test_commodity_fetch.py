@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent commodity quote fetching.
+
+Tests the global deadline, stale fallbacks and FRED batching.
+"""
+
+import time
+from unittest.mock import patch
+
+from commodities import BaltimorePortCommodities, COMMODITIES
+
+
+def fake_quote(symbol, change_pct=0.5):
+    return {
+        "symbol": symbol,
+        "price": 100.0,
+        "prev_close": 99.5,
+        "change": 0.5,
+        "change_pct": change_pct,
+        "currency": "USD",
+        "exchange": "TEST",
+        "timestamp": "2026-01-01T12:00:00"
+    }
+
+
+class TestConcurrentFetch:
+    """Test concurrent fetching with a deadline."""
+
+    def test_slow_symbol_does_not_stall_batch(self):
+        """A symbol slower than the deadline is left out, not waited on."""
+        tracker = BaltimorePortCommodities(deadline=0.3)
+        slow_symbol = COMMODITIES["coal"]["symbol"]
+
+        def fetch(symbol, timeout=None):
+            if symbol == slow_symbol:
+                time.sleep(1.0)
+            return fake_quote(symbol)
+
+        with patch.object(tracker, "fetch_yahoo_quote", side_effect=fetch):
+            start = time.time()
+            data = tracker.get_all_commodities()
+            elapsed = time.time() - start
+
+        assert elapsed < 0.9
+        assert "coal" not in data["commodities"]
+        assert "corn" in data["commodities"]
+
+    def test_missed_deadline_falls_back_to_last_good(self):
+        """Symbols that miss the deadline reuse their last good quote."""
+        tracker = BaltimorePortCommodities(deadline=0.3)
+        slow_symbol = COMMODITIES["coal"]["symbol"]
+
+        with patch.object(tracker, "fetch_yahoo_quote", side_effect=lambda s, timeout=None: fake_quote(s)):
+            tracker.get_all_commodities()
+
+        def fetch(symbol, timeout=None):
+            if symbol == slow_symbol:
+                time.sleep(1.0)
+            return fake_quote(symbol, change_pct=4.0)
+
+        with patch.object(tracker, "fetch_yahoo_quote", side_effect=fetch):
+            data = tracker.get_all_commodities()
+
+        coal = data["commodities"]["coal"]
+        assert coal["stale"] is True
+        assert coal["as_of"] == "2026-01-01T12:00:00"
+        assert "coal" in data["stale"]
+        assert data["commodities"]["corn"]["stale"] is False
+        # Fresh moves still alert; the stale one does not
+        assert not any(a["commodity"] == COMMODITIES["coal"]["name"] for a in data["alerts"])
+        assert any(a["commodity"] == COMMODITIES["corn"]["name"] for a in data["alerts"])
+
+    def test_fred_series_share_the_batch(self):
+        """FRED indicators are fetched through the same concurrent path."""
+        tracker = BaltimorePortCommodities(fred_api_key="test-key")
+        fred = {
+            "series_id": "TOTALSA", "value": 16.0, "prev_value": 15.8, "change": 0.2,
+            "change_pct": 1.27, "date": "2026-01-01", "timestamp": "2026-01-01T12:00:00"
+        }
+
+        with patch.object(tracker, "fetch_yahoo_quote", side_effect=lambda s, timeout=None: fake_quote(s)), \
+                patch.object(tracker, "fetch_fred_data", side_effect=lambda s, timeout=None: dict(fred, series_id=s)):
+            data = tracker.get_all_commodities()
+
+        assert data["indicators"]["industrial_production"]["series_id"] == "INDPRO"
+        assert data["indicators"]["us_auto_sales"]["stale"] is False
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental correlation windows.
+
+Tests running aggregates, watermark expiry and hub rule evaluation.
+"""
+
+from datetime import datetime, timedelta
+
+from correlation_window import CorrelationWindow
+from intelligence_hub import IntelligenceHub, EventType
+
+
+class TestCorrelationWindow:
+    """Test the incremental window."""
+
+    def test_counts_and_keys_track_additions(self, make_event):
+        """Per-type counts and keyed counters update on add."""
+        window = CorrelationWindow(
+            timedelta(minutes=10),
+            keys={"kind": lambda e: (e.raw_data or {}).get("kind")}
+        )
+        now = datetime(2026, 1, 1, 12, 0)
+
+        window.add(make_event("a", EventType.VESSEL_ARRIVAL, now, raw_data={"kind": "bulk"}))
+        window.add(make_event("b", EventType.VESSEL_ARRIVAL, now, raw_data={"kind": "bulk"}))
+        window.add(make_event("c", EventType.RAIL_MOVEMENT, now))
+
+        assert window.count() == 3
+        assert window.count(EventType.VESSEL_ARRIVAL) == 2
+        assert window.keys("kind")["bulk"] == 2
+        assert window.latest.id == "c"
+
+    def test_advance_expires_and_decrements(self, make_event):
+        """Advancing the watermark expires old events and their keys."""
+        window = CorrelationWindow(
+            timedelta(minutes=10),
+            keys={"kind": lambda e: (e.raw_data or {}).get("kind")}
+        )
+        base = datetime(2026, 1, 1, 12, 0)
+
+        window.add(make_event("old", EventType.VESSEL_ARRIVAL, base, raw_data={"kind": "tanker"}))
+        window.add(make_event("new", EventType.VESSEL_ARRIVAL, base + timedelta(minutes=15)))
+
+        expired = window.advance(base + timedelta(minutes=20))
+
+        assert expired == 1
+        assert window.ids() == ["new"]
+        assert not window.has_key("kind", "tanker")
+
+    def test_expiry_reuses_keys_computed_at_add(self, make_event):
+        """Frozen events expire without re-running key functions."""
+        calls = []
+
+        def route(event):
+            calls.append(event.id)
+            return tuple(event.raw_data["route"])
+
+        window = CorrelationWindow(timedelta(minutes=10), keys={"route": route})
+        base = datetime(2026, 1, 1, 12, 0)
+        event = make_event("old", EventType.VESSEL_ARRIVAL, base, raw_data={"route": ["BAL", "NOR"]})
+        window.add(event)
+        event.freeze()
+
+        window.advance(base + timedelta(minutes=20))
+
+        assert calls == ["old"]
+        assert window.keys("route") == {}
+
+
+class TestHubCorrelation:
+    """Test hub rules evaluated against incremental windows."""
+
+    def test_commodity_vessel_rule_fires_on_cargo_match(self, make_event):
+        """Coal alert plus bulk carrier arrival produces a correlation."""
+        hub = IntelligenceHub()
+        now = datetime.now()
+
+        hub.ingest_event(make_event("c1", EventType.COMMODITY_ALERT, now, raw_data={"commodity": "coal"}))
+        hub.ingest_event(make_event("v1", EventType.VESSEL_ARRIVAL, now,
+                                    raw_data={"vessel_type": "bulk_carrier"}))
+
+        correlations = hub.get_recent_events(1, [EventType.CORRELATION])
+        titles = [c.title for c in correlations]
+        assert "Correlation: commodity_vessel_correlation" in titles
+
+    def test_commodity_vessel_rule_ignores_mismatch(self, make_event):
+        """Coal alert plus container ship is not correlated."""
+        hub = IntelligenceHub()
+        now = datetime.now()
+
+        hub.ingest_event(make_event("c1", EventType.COMMODITY_ALERT, now, raw_data={"commodity": "coal"}))
+        hub.ingest_event(make_event("v1", EventType.VESSEL_ARRIVAL, now,
+                                    raw_data={"vessel_type": "container"}))
+
+        titles = [c.title for c in hub.get_recent_events(1, [EventType.CORRELATION])]
+        assert "Correlation: commodity_vessel_correlation" not in titles
+
+    def test_scanner_rule_uses_severity_keys(self, make_event):
+        """High severity scanner alerts trigger the emergency rule."""
+        hub = IntelligenceHub()
+
+        hub.ingest_event(make_event("s1", EventType.SCANNER_ALERT, datetime.now(), severity="high"))
+
+        titles = [c.title for c in hub.get_recent_events(1, [EventType.CORRELATION])]
+        assert "Correlation: scanner_infrastructure_emergency" in titles
+
+
+class TestCorrelationDeduplication:
+    """Test cooldown de-duplication of correlation output."""
+
+    def test_repeat_matches_extend_existing_correlation(self, make_event):
+        """Matches within cooldown append ids instead of re-emitting."""
+        hub = IntelligenceHub()
+        notified = []
+        hub.subscribe(notified.append)
+        now = datetime.now()
+
+        hub.ingest_event(make_event("r1", EventType.RAIL_MOVEMENT, now))
+        for i in range(5):
+            hub.ingest_event(make_event(f"v{i}", EventType.VESSEL_ARRIVAL, now))
+
+        correlations = [
+            c for c in hub.get_recent_events(1, [EventType.CORRELATION])
+            if c.title == "Correlation: rail_vessel_cargo_movement"
+        ]
+        assert len(correlations) == 1
+        assert correlations[0].correlations == ["r1", "v0", "v1", "v2", "v3", "v4"]
+        assert correlations[0].raw_data["update_count"] == 4
+        assert hub.subscriptions.flush(timeout=5)
+        assert sum(1 for e in notified if e.event_type == EventType.CORRELATION) == 1
+
+    def test_new_entity_set_opens_new_correlation(self, make_event):
+        """A different contributing entity set is a separate correlation."""
+        hub = IntelligenceHub()
+        now = datetime.now()
+
+        hub.ingest_event(make_event("c1", EventType.COMMODITY_ALERT, now, raw_data={"commodity": "coal"}))
+        hub.ingest_event(make_event("v1", EventType.VESSEL_ARRIVAL, now,
+                                    raw_data={"vessel_type": "bulk_carrier"}))
+        hub.ingest_event(make_event("c2", EventType.COMMODITY_ALERT, now, raw_data={"commodity": "soybeans"}))
+
+        correlations = [
+            c for c in hub.get_recent_events(1, [EventType.CORRELATION])
+            if c.title == "Correlation: commodity_vessel_correlation"
+        ]
+        assert len(correlations) == 2
+        assert correlations[1].raw_data["entities"] == ["coal", "soybeans"]
+
+    def test_cooldown_expiry_emits_fresh_correlation(self, make_event):
+        """Once the cooldown lapses a new correlation is emitted."""
+        from correlation_window import CorrelationCache
+
+        cache = CorrelationCache()
+        now = datetime(2026, 1, 1, 12, 0)
+        event = make_event("corr", EventType.CORRELATION, now)
+        event.correlations = ["a"]
+
+        cache.put(("rule", frozenset()), event, now + timedelta(minutes=5))
+
+        assert cache.get(("rule", frozenset()), now + timedelta(minutes=1)) is event
+        assert cache.get(("rule", frozenset()), now + timedelta(minutes=6)) is None
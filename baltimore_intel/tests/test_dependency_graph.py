@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the infrastructure dependency graph.
+
+Tests reverse adjacency, multi-hop cascades through cycles and the
+one-pass impact scores for every asset.
+"""
+
+import pytest
+
+from dependency_graph import DependencyGraph
+from intelligence_hub import IntelligenceHub, create_intelligence_api
+from critical_infrastructure import (
+    InfrastructureMonitor,
+    Infrastructure,
+    InfrastructureType,
+)
+
+
+def asset(asset_id, dependencies=(), criticality=2):
+    return Infrastructure(
+        id=asset_id, name=asset_id, type=InfrastructureType.POWER, lat=39.0, lon=-76.5,
+        description="", operator=f"op_{asset_id}", criticality=criticality,
+        dependencies=list(dependencies)
+    )
+
+
+@pytest.fixture
+def registry():
+    # power -> substation -> terminal <-> spur -> yard
+    return {
+        a.id: a for a in [
+            asset("power"),
+            asset("substation", ["power"]),
+            asset("terminal", ["substation", "spur"], criticality=5),
+            asset("spur", ["terminal"], criticality=3),
+            asset("yard", ["spur"], criticality=4),
+        ]
+    }
+
+
+class TestDependencyGraph:
+    """Test graph construction and traversal."""
+
+    def test_reverse_adjacency(self, registry):
+        """Dependents are indexed by the asset they depend on."""
+        graph = DependencyGraph(registry)
+
+        assert graph.get_dependents("power") == ["substation"]
+        assert graph.get_dependents("spur") == ["terminal", "yard"]
+        assert graph.get_dependents("yard") == []
+
+    def test_cascade_respects_depth_and_cycles(self, registry):
+        """Each asset appears once, at its shortest depth."""
+        graph = DependencyGraph(registry)
+
+        assert graph.cascade("power", 2) == [("substation", 1), ("terminal", 2)]
+        assert graph.cascade("power", None) == [
+            ("substation", 1), ("terminal", 2), ("spur", 3), ("yard", 4)
+        ]
+
+    def test_cycle_is_one_component(self, registry):
+        """The terminal <-> spur cycle condenses to one component."""
+        components = DependencyGraph(registry).strongly_connected_components()
+
+        assert sorted(sorted(c) for c in components if len(c) > 1) == [["spur", "terminal"]]
+
+    def test_all_cascades_match_per_asset_traversal(self, registry):
+        """The one-pass depths equal a BFS from each asset."""
+        graph = DependencyGraph(registry)
+
+        for max_depth in (1, 2, None):
+            everything = graph.all_cascades(max_depth)
+            for asset_id in registry:
+                assert everything[asset_id] == dict(graph.cascade(asset_id, max_depth))
+
+
+class TestCascadeImpact:
+    """Test monitor impact scoring."""
+
+    def test_default_depth_is_one_hop(self, registry):
+        """max_depth=1 scores direct dependents at half weight."""
+        monitor = InfrastructureMonitor(registry)
+
+        impact = monitor.assess_impact("power")
+
+        assert impact["impact_score"] == 2 + 2 * 0.5
+        assert [d["id"] for d in impact["dependent_assets"]] == ["substation"]
+
+    def test_multi_hop_weights_by_depth(self, registry):
+        """Deeper dependents contribute criticality * 0.5^depth."""
+        monitor = InfrastructureMonitor(registry)
+
+        impact = monitor.assess_impact("power", max_depth=2)
+
+        assert impact["impact_score"] == round(2 + 2 * 0.5 + 5 * 0.25, 1)
+
+    def test_memo_invalidated_on_registry_change(self, registry):
+        """Registering a new dependent changes the cached result."""
+        monitor = InfrastructureMonitor(registry)
+        before = monitor.assess_impact("yard")["impact_score"]
+
+        monitor.register_infrastructure([asset("berth", ["yard"], criticality=4)])
+
+        assert monitor.assess_impact("yard")["impact_score"] == before + 2.0
+
+    def test_all_impacts_agree_with_single_assessments(self):
+        """Bulk scores match assess_impact on the real registry (with cycles)."""
+        monitor = InfrastructureMonitor()
+
+        scores = {s["id"]: s["impact_score"] for s in monitor.assess_all_impacts(3)}
+
+        for infra_id in monitor.infrastructure:
+            assert scores[infra_id] == monitor.assess_impact(infra_id, 3)["impact_score"]
+
+    def test_negative_depth_rejected_by_api(self):
+        """The impact routes answer 400 rather than scoring a negative depth."""
+        hub = IntelligenceHub()
+        client = create_intelligence_api(hub).test_client()
+        infra_id = next(iter(hub.infrastructure.infrastructure))
+
+        assert client.get("/api/infrastructure/impact?max_depth=-1").status_code == 400
+        assert client.get(f"/api/infrastructure/{infra_id}/impact?max_depth=-1").status_code == 400
+        assert client.get("/api/infrastructure/impact?max_depth=0").status_code == 200
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the entity inverted index.
+
+Tests normalized lookups, eviction, top-N counts and the entity API.
+"""
+
+from datetime import datetime, timedelta
+
+from entity_index import EntityIndex
+from intelligence_hub import IntelligenceHub, EventType
+
+
+class TestEntityIndex:
+    """Test postings and counters."""
+
+    def test_lookup_is_normalized(self, make_event):
+        """Entities match case- and whitespace-insensitively."""
+        index = EntityIndex()
+        index.add(make_event(1, EventType.VESSEL_ARRIVAL, minutes=-5, entities=["367123456", "Ever Given "]))
+        index.add(make_event(2, EventType.VESSEL_ARRIVAL, entities=["ever given"]))
+        index.add(make_event(3, EventType.VESSEL_ARRIVAL, entities=["other", ""]))
+
+        assert [e.id for e in index.events("EVER GIVEN")] == ["e1", "e2"]
+        assert [e.id for e in index.events("367123456")] == ["e1"]
+        assert index.events("") == []
+
+    def test_since_and_limit(self, make_event):
+        """Timelines filter by time and keep the newest events."""
+        index = EntityIndex()
+        for i in range(5):
+            index.add(make_event(i, EventType.VESSEL_ARRIVAL, minutes=-(50 - i * 10), entities=["csx"]))
+
+        assert [e.id for e in index.events("csx", since=datetime.now() - timedelta(minutes=25))] == ["e3", "e4"]
+        assert [e.id for e in index.events("csx", limit=2)] == ["e3", "e4"]
+
+    def test_remove_updates_postings_and_counts(self, make_event):
+        """Removed events leave postings and top counts."""
+        index = EntityIndex()
+        events = [make_event(i, EventType.VESSEL_ARRIVAL, entities=["coal", f"v{i}"]) for i in range(3)]
+        for event in events:
+            index.add(event)
+
+        index.remove(events[:2])
+
+        assert [e.id for e in index.events("coal")] == ["e2"]
+        assert index.top(datetime.now() - timedelta(hours=1)) == [("coal", 1), ("v2", 1)]
+        assert index.events("v0") == []
+
+    def test_top_respects_window(self, make_event):
+        """Top counts only include events inside the window."""
+        index = EntityIndex()
+        for i in range(3):
+            index.add(make_event(i, EventType.VESSEL_ARRIVAL, minutes=-10, entities=["key_bridge"]))
+        index.add(make_event(3, EventType.VESSEL_ARRIVAL, minutes=-300, entities=["old"]))
+        index.add(make_event(4, EventType.VESSEL_ARRIVAL, minutes=-10, entities=["pbr"]))
+
+        assert index.top(datetime.now() - timedelta(hours=1), n=5) == [("key_bridge", 3), ("pbr", 1)]
+
+
+class TestEntityAPI:
+    """Test the entity endpoints."""
+
+    def test_entity_endpoints_follow_store_retention(self, make_event):
+        """Evicted events drop out of timelines and top lists."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub(max_events=3)
+        for i in range(5):
+            hub.ingest_event(make_event(i, EventType.VESSEL_ARRIVAL, minutes=-(5 - i),
+                                        entities=["367000001", f"Vessel {i}"]))
+        client = create_intelligence_api(hub).test_client()
+
+        timeline = client.get("/api/entities/367000001/events").get_json()
+        top = client.get("/api/entities/top?hours=1&limit=1").get_json()
+
+        assert timeline["count"] == 3
+        assert [e["title"] for e in timeline["events"]] == ["Event e2", "Event e3", "Event e4"]
+        assert top["entities"] == [{"entity": "367000001", "count": 3}]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite event archive.
+
+Tests filter pushdown, keyset pagination, entity lookups and the
+archive-backed events API.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from event_archive import EventArchive, encode_cursor
+from intelligence_hub import IntelligenceHub, IntelEvent, EventType
+
+
+BASE = datetime(2026, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = EventArchive(str(tmp_path / "events.db"))
+    yield archive
+    archive.close()
+
+
+class TestEventArchive:
+    """Test archive storage and queries."""
+
+    def test_filters_are_combined(self, archive, make_event):
+        """Time, type and severity filters all apply."""
+        for i in range(30):
+            archive.add(make_event(f"e{i:04d}",
+                                   EventType.SCANNER_ALERT if i % 2 else EventType.VESSEL_ARRIVAL,
+                                   timestamp=BASE, minutes=i, severity="high" if i % 3 == 0 else "info"))
+        archive.flush()
+
+        found, _ = archive.query(
+            start=BASE + timedelta(minutes=10),
+            event_types=["scanner_alert"],
+            severities=["high"]
+        )
+
+        assert [e["id"] for e in found] == ["e0027", "e0021", "e0015"]
+
+    def test_keyset_pagination_visits_every_event_once(self, archive, make_event):
+        """Following next_cursor returns every event exactly once, newest first."""
+        for i in range(25):
+            archive.add(make_event(f"e{i:04d}", EventType.VESSEL_ARRIVAL, timestamp=BASE, minutes=i))
+        archive.flush()
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = archive.query(limit=10, cursor=cursor)
+            seen.extend(e["id"] for e in page)
+            if cursor is None:
+                break
+
+        assert seen == [f"e{i:04d}" for i in reversed(range(25))]
+
+    def test_entity_join(self, archive, make_event):
+        """Entity lookups are case-insensitive through the join table."""
+        archive.add(make_event("e0001", EventType.VESSEL_ARRIVAL, timestamp=BASE, minutes=1,
+                               entities=["Coal", "CSX"]))
+        archive.add(make_event("e0002", EventType.VESSEL_ARRIVAL, timestamp=BASE, minutes=2,
+                               entities=["container"]))
+        archive.add(make_event("e0003", EventType.VESSEL_ARRIVAL, timestamp=BASE, minutes=3,
+                               entities=["coal"]))
+        archive.flush()
+
+        found, _ = archive.query(entity="COAL")
+
+        assert [e["id"] for e in found] == ["e0003", "e0001"]
+
+    def test_readding_updates_in_place(self, archive, make_event):
+        """A second add of the same id replaces its data."""
+        event = make_event("e0001", EventType.VESSEL_ARRIVAL, timestamp=BASE, minutes=1)
+        archive.add(event)
+        event.description = "updated"
+        archive.add(event)
+        archive.flush()
+
+        found, _ = archive.query()
+
+        assert archive.count() == 1
+        assert found[0]["description"] == "updated"
+
+    def test_malformed_cursor_rejected(self, archive):
+        """Bad cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            archive.query(cursor="not-a-cursor")
+        archive.query(cursor=encode_cursor(0.0, 0))
+
+
+class TestArchiveAPI:
+    """Test /api/events backed by the archive."""
+
+    def test_events_endpoint_pages_archive(self, archive):
+        """The API pushes filters down and returns a cursor."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub(archive=archive)
+        now = datetime.now()
+        for i in range(5):
+            hub.ingest_event(IntelEvent(
+                id=f"s{i}", timestamp=now - timedelta(minutes=i), event_type=EventType.SCANNER_ALERT,
+                source="test", title="", description="", severity="medium"
+            ))
+        archive.flush()
+        client = create_intelligence_api(hub).test_client()
+
+        first = client.get("/api/events?type=scanner_alert&limit=3").get_json()
+        second = client.get(f"/api/events?type=scanner_alert&limit=3&cursor={first['next_cursor']}").get_json()
+
+        assert [e["id"] for e in first["events"]] == ["s0", "s1", "s2"]
+        assert [e["id"] for e in second["events"]] == ["s3", "s4"]
+        assert second["next_cursor"] is None
+        assert client.get("/api/events?cursor=bogus").status_code == 400
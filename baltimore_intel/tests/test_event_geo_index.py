@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the located-event viewport index.
+
+Tests bbox and since filtering, eviction, clustering and the GeoJSON
+endpoint parameters.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from event_geo_index import EventGeoIndex, parse_bbox
+from intelligence_hub import IntelligenceHub, EventType
+
+
+NOW = datetime.now()
+
+
+class TestEventGeoIndex:
+    """Test viewport queries."""
+
+    def test_bbox_and_since_filters(self, make_event):
+        """Only events inside the box and after the cutoff are returned."""
+        index = EventGeoIndex()
+        index.add(make_event(1, EventType.RAIL_MOVEMENT, timestamp=NOW, minutes=-5,
+                             location={"lat": 39.26, "lon": -76.58}))
+        index.add(make_event(2, EventType.RAIL_MOVEMENT, timestamp=NOW, minutes=-5,
+                             location={"lat": 39.21, "lon": -76.53}))
+        index.add(make_event(3, EventType.RAIL_MOVEMENT, timestamp=NOW, minutes=-90,
+                             location={"lat": 39.26, "lon": -76.58}))
+        index.add(make_event(4, EventType.RAIL_MOVEMENT, timestamp=NOW, minutes=-5,
+                             location={"lat": 38.98, "lon": -76.49}))
+
+        found = index.features(
+            bbox=(-76.60, 39.20, -76.50, 39.30),
+            since=NOW - timedelta(hours=1)
+        )
+
+        assert [f["properties"]["id"] for f in found] == ["e1", "e2"]
+
+    def test_unlocated_events_skipped(self, make_event):
+        """Events without usable coordinates are not indexed."""
+        index = EventGeoIndex()
+        index.add(make_event(1, EventType.RAIL_MOVEMENT, timestamp=NOW, location={"lat": None, "lon": -76.5}))
+        event = make_event(2, EventType.RAIL_MOVEMENT, timestamp=NOW, location={"lat": 39.2, "lon": -76.5})
+        event.location = None
+        index.add(event)
+
+        assert len(index) == 0
+
+    def test_remove(self, make_event):
+        """Removed events disappear from queries."""
+        index = EventGeoIndex()
+        events = [make_event(i, EventType.RAIL_MOVEMENT, timestamp=NOW,
+                             location={"lat": 39.26, "lon": -76.58}) for i in range(3)]
+        for event in events:
+            index.add(event)
+
+        index.remove(events[:2])
+
+        assert [f["properties"]["id"] for f in index.features()] == ["e2"]
+
+    def test_clusters_aggregate_nearby_events(self, make_event):
+        """At low zoom nearby events collapse into one cluster feature."""
+        index = EventGeoIndex()
+        for i in range(50):
+            index.add(make_event(i, EventType.RAIL_MOVEMENT, timestamp=NOW,
+                                 severity="high" if i == 7 else "info",
+                                 location={"lat": 39.25 + i * 0.0001, "lon": -76.55}))
+        index.add(make_event(99, EventType.RAIL_MOVEMENT, timestamp=NOW,
+                             location={"lat": 38.0, "lon": -75.0}))
+
+        clusters = index.clusters(zoom=8)
+
+        assert len(clusters) == 2
+        cluster = next(f for f in clusters if f["properties"].get("cluster"))
+        assert cluster["properties"]["point_count"] == 50
+        assert cluster["properties"]["severity"] == "high"
+        assert cluster["properties"]["types"] == {"rail_movement": 50}
+        single = next(f for f in clusters if not f["properties"].get("cluster"))
+        assert single["properties"]["id"] == "e99"
+
+    def test_parse_bbox_rejects_bad_input(self):
+        """Malformed boxes raise ValueError."""
+        assert parse_bbox("-77,39,-76,40") == (-77.0, 39.0, -76.0, 40.0)
+        for bad in ("1,2,3", "a,b,c,d", "-76,39,-77,40"):
+            with pytest.raises(ValueError):
+                parse_bbox(bad)
+
+
+class TestGeoJSONAPI:
+    """Test /api/events/geojson."""
+
+    def test_endpoint_filters_and_clusters(self, make_event):
+        """bbox and zoom parameters are honoured and eviction applies."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub(max_events=20)
+        for i in range(25):
+            hub.ingest_event(make_event(i, EventType.RAIL_MOVEMENT, timestamp=NOW, minutes=-(30 - i),
+                                        location={"lat": 39.25, "lon": -76.55}))
+        client = create_intelligence_api(hub).test_client()
+
+        detail = client.get("/api/events/geojson?bbox=-76.6,39.2,-76.5,39.3&zoom=14").get_json()
+        clustered = client.get("/api/events/geojson?zoom=6").get_json()
+        empty = client.get("/api/events/geojson?bbox=-75,38,-74,39").get_json()
+
+        assert len(detail["features"]) == 20
+        assert len(clustered["features"]) == 1
+        assert clustered["features"][0]["properties"]["point_count"] == 20
+        assert empty["features"] == []
+        assert client.get("/api/events/geojson?bbox=nope").status_code == 400
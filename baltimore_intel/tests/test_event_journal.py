@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only event journal.
+
+Tests record framing, torn-tail recovery, segment rotation, snapshot
+compaction and hub warm restart.
+"""
+
+from event_journal import EventJournal
+from intelligence_hub import IntelligenceHub, EventType
+
+
+class TestEventJournal:
+    """Test journal storage."""
+
+    def test_records_round_trip(self, tmp_path):
+        """Appended records replay in order."""
+        journal = EventJournal(str(tmp_path))
+        journal.append(1, ("a", 1.5, {"k": [1, 2]}))
+        journal.append(2, ("b", None))
+        journal.close()
+
+        assert list(EventJournal(str(tmp_path)).replay()) == [
+            (1, ("a", 1.5, {"k": [1, 2]})),
+            (2, ("b", None)),
+        ]
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        """A partial trailing record is dropped and later appends stay readable."""
+        journal = EventJournal(str(tmp_path))
+        journal.append(1, "first")
+        journal.append(1, "second")
+        journal.close()
+        segment = next(tmp_path.glob("segment-*.log"))
+        segment.write_bytes(segment.read_bytes()[:-3])
+
+        journal = EventJournal(str(tmp_path))
+        assert [p for _, p in journal.replay()] == ["first"]
+        journal.append(1, "third")
+        journal.close()
+
+        assert [p for _, p in EventJournal(str(tmp_path)).replay()] == ["first", "third"]
+
+    def test_rotation_and_snapshot(self, tmp_path):
+        """Segments rotate by size; a snapshot replaces older segments."""
+        journal = EventJournal(str(tmp_path), segment_bytes=64)
+        for i in range(10):
+            journal.append(1, i)
+        assert len(list(tmp_path.glob("segment-*.log"))) > 1
+
+        seq = journal.rotate()
+        journal.append(1, 10)
+        journal.write_snapshot(seq, [(1, "compacted")])
+        journal.close()
+
+        assert len(list(tmp_path.glob("segment-*.log"))) == 1
+        assert [p for _, p in EventJournal(str(tmp_path)).replay()] == ["compacted", 10]
+
+
+class TestHubWarmRestart:
+    """Test hub state restored from the journal."""
+
+    def test_events_and_correlations_survive_restart(self, tmp_path, make_event):
+        """Events, correlation updates and the id counter are restored."""
+        hub = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+        hub.ingest_event(make_event("r1", EventType.RAIL_MOVEMENT))
+        hub.ingest_event(make_event("v1", EventType.VESSEL_ARRIVAL))
+        hub.ingest_event(make_event("v2", EventType.VESSEL_ARRIVAL))
+        hub.journal.close()
+
+        restored = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+
+        assert len(restored.store) == len(hub.store)
+        corr = restored.get_recent_events(1, [EventType.CORRELATION])[0]
+        assert corr.correlations == ["r1", "v1", "v2"]
+        assert corr.raw_data["update_count"] == 1
+        assert restored._generate_event_id() > corr.id
+
+        # Windows and cooldowns are rebuilt: the next match extends in place
+        restored.ingest_event(make_event("v3", EventType.VESSEL_ARRIVAL))
+        correlations = restored.get_recent_events(1, [EventType.CORRELATION])
+        assert len(correlations) == 1
+        assert correlations[0].correlations[-1] == "v3"
+
+    def test_watermark_and_windows_survive_restart(self, tmp_path, make_event):
+        """Rule windows are rebuilt against the restored event-time watermark."""
+        hub = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+        hub.ingest_event(make_event("v1", EventType.VESSEL_ARRIVAL, minutes=-50))
+        hub.ingest_event(make_event("v2", EventType.VESSEL_ARRIVAL, minutes=-45))
+        hub.journal.close()
+
+        restored = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+
+        assert restored.watermarks.current() == hub.watermarks.current()
+        for before, after in zip(hub.correlation_rules, restored.correlation_rules):
+            assert after.window.ids() == before.window.ids()
+        assert "v1" in restored._rules_by_type[EventType.VESSEL_ARRIVAL][0].window.ids()
+
+    def test_id_counter_resumes_after_highest_id(self, tmp_path, make_event):
+        """Ids journaled out of generation order still advance the counter."""
+        hub = IntelligenceHub(journal=EventJournal(str(tmp_path)), default_rules=False)
+        hub.ingest_event(make_event("evt_20260301_000009"))
+        hub.ingest_event(make_event("evt_20260301_000003"))
+        hub.journal.close()
+
+        restored = IntelligenceHub(journal=EventJournal(str(tmp_path)), default_rules=False)
+
+        assert restored._generate_event_id().endswith("_000010")
+
+    def test_compaction_keeps_state(self, tmp_path, make_event):
+        """State replays identically from a compacted snapshot."""
+        hub = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+        for i in range(20):
+            hub.ingest_event(make_event(f"c{i}", EventType.COMMODITY_ALERT, raw_data={"commodity": "corn"}))
+        hub.compact_journal()
+        hub.ingest_event(make_event("after", EventType.COMMODITY_ALERT))
+        hub.journal.close()
+
+        restored = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+
+        assert [e.id for e in restored.events] == [e.id for e in hub.events]
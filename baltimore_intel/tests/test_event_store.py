@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the time-indexed event store.
+
+Tests bucketing, range queries and retention.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from event_store import EventStore
+from intelligence_hub import EventType, IntelligenceHub
+
+
+class TestEventStoreQueries:
+    """Test time-range queries."""
+
+    def test_range_merges_types_in_time_order(self, make_event):
+        """Events of different types come back oldest first."""
+        store = EventStore(max_age=None, max_events=None)
+        base = datetime(2026, 1, 1, 12, 0)
+
+        store.add(make_event("v1", EventType.VESSEL_ARRIVAL, base), now=base)
+        store.add(make_event("r1", EventType.RAIL_MOVEMENT, base + timedelta(minutes=1)), now=base)
+        store.add(make_event("v2", EventType.VESSEL_ARRIVAL, base + timedelta(minutes=2)), now=base)
+
+        assert [e.id for e in store.range()] == ["v1", "r1", "v2"]
+
+    def test_since_filters_by_time_and_type(self, make_event):
+        """since() bisects to the window and honours type filters."""
+        store = EventStore(max_age=None, max_events=None)
+        base = datetime(2026, 1, 1, 12, 0)
+
+        for i in range(10):
+            store.add(make_event(f"v{i}", EventType.VESSEL_ARRIVAL, base + timedelta(minutes=i)))
+            store.add(make_event(f"s{i}", EventType.SCANNER_ALERT, base + timedelta(minutes=i)))
+
+        recent = store.since(base + timedelta(minutes=7), [EventType.VESSEL_ARRIVAL])
+
+        assert [e.id for e in recent] == ["v7", "v8", "v9"]
+        assert store.count([EventType.SCANNER_ALERT]) == 10
+
+    def test_out_of_order_insert_stays_sorted(self, make_event):
+        """Late events are inserted at their timestamp."""
+        store = EventStore(max_age=None, max_events=None)
+        base = datetime(2026, 1, 1, 12, 0)
+
+        store.add(make_event("late", EventType.VESSEL_ARRIVAL, base + timedelta(minutes=5)))
+        store.add(make_event("early", EventType.VESSEL_ARRIVAL, base))
+
+        assert [e.id for e in store.range()] == ["early", "late"]
+
+
+class TestEventStoreRetention:
+    """Test age and count based retention."""
+
+    def test_max_events_evicts_oldest(self, make_event):
+        """Count retention drops the globally oldest events."""
+        store = EventStore(max_age=None, max_events=5)
+        base = datetime(2026, 1, 1, 12, 0)
+
+        for i in range(8):
+            event_type = EventType.VESSEL_ARRIVAL if i % 2 else EventType.RAIL_MOVEMENT
+            store.add(make_event(f"e{i}", event_type, base + timedelta(minutes=i)))
+
+        assert len(store) == 5
+        assert [e.id for e in store.range()] == ["e3", "e4", "e5", "e6", "e7"]
+        assert store.get("e0") is None
+
+    def test_max_age_evicts_expired(self, make_event):
+        """Age retention drops events older than max_age."""
+        store = EventStore(max_age=timedelta(hours=1), max_events=None)
+        now = datetime(2026, 1, 1, 12, 0)
+
+        store.add(make_event("old", EventType.VESSEL_ARRIVAL, now - timedelta(hours=2)), now=now)
+        store.add(make_event("new", EventType.VESSEL_ARRIVAL, now), now=now)
+
+        assert [e.id for e in store.range()] == ["new"]
+
+    def test_evict_listener_receives_events(self, make_event):
+        """Eviction listeners see every dropped event."""
+        store = EventStore(max_age=None, max_events=2)
+        evicted = []
+        store.add_evict_listener(evicted.extend)
+        base = datetime(2026, 1, 1, 12, 0)
+
+        for i in range(4):
+            store.add(make_event(f"e{i}", EventType.SCANNER_ALERT, base + timedelta(minutes=i)))
+
+        assert [e.id for e in evicted] == ["e0", "e1"]
+
+
+class TestHubUsesStore:
+    """Test that the hub reads and writes through the store."""
+
+    def test_hub_retention_bounds_events(self, make_event):
+        """Hub event history is bounded by max_events."""
+        hub = IntelligenceHub(max_events=3)
+
+        for i in range(6):
+            hub.ingest_event(make_event(f"e{i}", EventType.COMMODITY_ALERT, datetime.now()))
+
+        assert len(hub.store) == 3
+        assert len(hub.events) == 3
+
+    def test_get_recent_events_by_type(self, make_event):
+        """get_recent_events filters by type."""
+        hub = IntelligenceHub()
+        hub.ingest_event(make_event("c1", EventType.COMMODITY_ALERT, datetime.now()))
+        hub.ingest_event(make_event("r1", EventType.RAIL_MOVEMENT, datetime.now()))
+
+        recent = hub.get_recent_events(1, [EventType.RAIL_MOVEMENT])
+
+        assert [e.id for e in recent] == ["r1"]
+
+    def test_events_endpoint_accepts_offset_times(self, make_event):
+        """Offset-aware start/end are normalized; unparseable ones are a 400."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub()
+        hub.ingest_event(make_event("r1", EventType.RAIL_MOVEMENT, datetime.now()))
+        client = create_intelligence_api(hub).test_client()
+        start = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+
+        response = client.get("/api/events", query_string={"start": start})
+
+        assert response.status_code == 200
+        assert [e["id"] for e in response.get_json()["events"]] == ["r1"]
+        assert client.get("/api/events?start=yesterday").status_code == 400
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the live event stream.
+
+Tests sequence-addressed resume, gap detection, filtering and the SSE
+endpoint.
+"""
+
+import json
+
+from event_stream import StreamBuffer, RESET_KIND
+from intelligence_hub import IntelligenceHub, EventType, create_intelligence_api
+from subscriptions import SubscriptionFilter
+
+
+def read_frames(response, count):
+    """Parse the next `count` id/event/data messages from an SSE response."""
+    frames = []
+    for chunk in response.response:
+        text = chunk.decode()
+        if not text.startswith(("id:", "event:")):
+            continue
+        fields = dict(line.split(": ", 1) for line in text.strip().split("\n"))
+        frames.append(fields)
+        if len(frames) == count:
+            break
+    return frames
+
+
+class TestStreamBuffer:
+    """Test the sequenced replay ring."""
+
+    def test_resume_after_sequence(self, make_event):
+        """Readers get only entries after their cursor, serialized once."""
+        buffer = StreamBuffer()
+        for i in range(3):
+            buffer.publish(make_event(f"e{i}"))
+
+        frames, cursor, gap = buffer.read(1)
+        again, _, _ = buffer.read(1)
+
+        assert [json.loads(data)["id"] for _, _, data in frames] == ["e1", "e2"]
+        assert cursor == 3 and not gap
+        assert frames[0][2] is again[0][2]
+
+    def test_gap_when_ring_overflowed(self, make_event):
+        """A cursor older than the ring reports a gap."""
+        buffer = StreamBuffer(capacity=2)
+        for i in range(5):
+            buffer.publish(make_event(f"e{i}"))
+
+        frames, cursor, gap = buffer.read(1)
+
+        assert gap
+        assert [seq for seq, _, _ in frames] == [4, 5]
+
+    def test_filter_and_ids(self, make_event):
+        """Filtered entries still advance the cursor; foreign ids are rejected."""
+        buffer = StreamBuffer()
+        buffer.publish(make_event("low"))
+        buffer.publish(make_event("high", severity="high"))
+
+        frames, cursor, _ = buffer.read(0, SubscriptionFilter(min_severity="high"))
+
+        assert [seq for seq, _, _ in frames] == [2]
+        assert cursor == 2
+        assert buffer.parse_id(buffer.stream_id(7)) == 7
+        assert buffer.parse_id("0-7") is None
+
+
+class TestStreamEndpoint:
+    """Test /api/stream."""
+
+    def test_streams_new_events_and_resumes(self, make_event):
+        """Only events after connect (or after Last-Event-ID) are sent."""
+        hub = IntelligenceHub(default_rules=False)
+        hub.ingest_event(make_event("before"))
+        client = create_intelligence_api(hub).test_client()
+
+        response = client.get("/api/stream?heartbeat=1", buffered=False)
+        hub.ingest_event(make_event("r1", EventType.RAIL_MOVEMENT))
+        hub.ingest_event(make_event("s1"))
+        frames = read_frames(response, 2)
+        response.close()
+
+        assert response.mimetype == "text/event-stream"
+        assert [json.loads(f["data"])["id"] for f in frames] == ["r1", "s1"]
+        assert frames[0]["event"] == "rail_movement"
+
+        resumed = client.get("/api/stream?type=scanner_alert",
+                             headers={"Last-Event-ID": frames[0]["id"]}, buffered=False)
+        assert json.loads(read_frames(resumed, 1)[0]["data"])["id"] == "s1"
+        resumed.close()
+
+    def test_unknown_last_event_id_resets(self):
+        """An id from another process epoch asks the client to refetch."""
+        hub = IntelligenceHub(default_rules=False)
+        client = create_intelligence_api(hub).test_client()
+
+        response = client.get("/api/stream", headers={"Last-Event-ID": "0-5"}, buffered=False)
+        frame = read_frames(response, 1)[0]
+        response.close()
+
+        assert frame["event"] == RESET_KIND
+
+    def test_invalid_filter(self):
+        hub = IntelligenceHub(default_rules=False)
+        client = create_intelligence_api(hub).test_client()
+        assert client.get("/api/stream?min_severity=loud").status_code == 400
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for event-time parsing, watermarks and late-data handling.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from event_time import WatermarkTracker, parse_event_time
+from correlation_window import CorrelationWindow
+from intelligence_hub import IntelligenceHub, IntelEvent, EventType, CorrelationRule
+
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+class TestParseEventTime:
+    """Test source timestamp normalization."""
+
+    def test_formats(self):
+        """ISO (naive, offset, Z) and epoch seconds/millis all parse."""
+        utc = datetime(2026, 3, 1, 17, 0, tzinfo=timezone.utc)
+        local = utc.astimezone().replace(tzinfo=None)
+
+        assert parse_event_time("2026-03-01T12:00:00") == NOW
+        assert parse_event_time("2026-03-01T17:00:00Z") == local
+        assert parse_event_time(utc.timestamp()) == local
+        assert parse_event_time(utc.timestamp() * 1000) == local
+        assert parse_event_time("yesterday") is None
+        assert parse_event_time(None) is None
+
+    def test_future_times_clamped(self):
+        """Clock-skewed future timestamps fall back to now."""
+        assert parse_event_time(NOW + timedelta(hours=1), now=NOW) == NOW
+        assert parse_event_time(NOW + timedelta(minutes=1), now=NOW) == NOW + timedelta(minutes=1)
+
+
+class TestWatermarkTracker:
+    """Test per-source lateness and the combined watermark."""
+
+    def test_watermark_is_min_over_active_sources(self):
+        """The slowest active source holds the watermark back."""
+        tracker = WatermarkTracker({"ais": 30, "scanner_": 300})
+        tracker.observe("scanner_a", NOW - timedelta(minutes=2), NOW)
+        tracker.observe("ais", NOW, NOW)
+
+        assert tracker.current() == NOW - timedelta(minutes=7)
+
+    def test_idle_sources_stop_holding_watermark(self):
+        """A source that stops delivering no longer blocks progress."""
+        tracker = WatermarkTracker({"ais": 30, "scanner_": 300})
+        tracker.observe("scanner_a", NOW, NOW)
+        later = NOW + timedelta(minutes=20)
+        tracker.observe("ais", later, later)
+
+        assert tracker.current() == later - timedelta(seconds=30)
+
+    def test_late_events_flagged_and_watermark_monotonic(self):
+        """Events behind the watermark are late; it never moves back."""
+        tracker = WatermarkTracker(default_lateness=60)
+        assert tracker.observe("src", NOW, NOW)
+        assert tracker.observe("src", NOW - timedelta(seconds=30), NOW)
+        assert not tracker.observe("src", NOW - timedelta(minutes=5), NOW)
+
+        assert tracker.current() == NOW - timedelta(seconds=60)
+        assert tracker.stats()["late_by_source"] == {"src": 1}
+
+
+class TestOutOfOrderWindows:
+    """Test event-time windows in the hub."""
+
+    def test_window_keeps_timestamp_order(self):
+        """Late inserts land in order, so expiry is exact."""
+        window = CorrelationWindow(timedelta(minutes=10))
+        for i, minutes in enumerate([0, 5, 2, 8, 1]):
+            window.add(IntelEvent(f"e{i}", NOW + timedelta(minutes=minutes), EventType.RAIL_MOVEMENT,
+                                  "test", "", "", "info"))
+
+        assert window.ids() == ["e0", "e4", "e2", "e1", "e3"]
+        window.advance(NOW + timedelta(minutes=13))
+        assert window.ids() == ["e1", "e3"]
+
+    def test_delayed_scanner_correlates_by_event_time(self):
+        """A transcript arriving late still pairs with what it overheard."""
+        hub = IntelligenceHub()
+        heard = datetime.now() - timedelta(minutes=4)
+        hub.create_rail_event({"railroad": "CSX", "timestamp": heard.isoformat()})
+        hub.ingest_event(IntelEvent("v1", heard + timedelta(minutes=1), EventType.VESSEL_ARRIVAL,
+                                    "ais_tracker", "", "", "info"))
+
+        rail = hub.store.range(event_types=[EventType.RAIL_MOVEMENT])[0]
+        assert rail.timestamp == heard
+        titles = [c.title for c in hub.store.range(event_types=[EventType.CORRELATION])]
+        assert "Correlation: rail_vessel_cargo_movement" in titles
+
+    def test_events_beyond_lateness_are_not_correlated(self):
+        """Too-late data is stored but kept out of closed windows."""
+        hub = IntelligenceHub(allowed_lateness={"ais_tracker": 60})
+        now = datetime.now()
+        hub.ingest_event(IntelEvent("v1", now, EventType.VESSEL_ARRIVAL, "ais_tracker", "", "", "info"))
+        hub.ingest_event(IntelEvent("v0", now - timedelta(minutes=10), EventType.VESSEL_ARRIVAL,
+                                    "ais_tracker", "", "", "info"))
+
+        assert "v0" in hub.store
+        assert "v0" not in hub._rules_by_type[EventType.VESSEL_ARRIVAL][0].window.ids()
+        assert hub.get_ingest_stats()["event_time"]["late_events"] == 1
+
+    def test_added_rule_window_follows_watermark(self):
+        """A rule added while the watermark lags the clock keeps open events."""
+        hub = IntelligenceHub(allowed_lateness={"ais_tracker": 0}, default_rules=False)
+        now = datetime.now()
+        for i, minutes in enumerate([30, 25]):
+            hub.ingest_event(IntelEvent(f"v{i}", now - timedelta(minutes=minutes), EventType.VESSEL_ARRIVAL,
+                                        "ais_tracker", "", "", "info"))
+
+        rule = CorrelationRule("vessels", [EventType.VESSEL_ARRIVAL], 10, lambda window: False)
+        hub.add_correlation_rule(rule)
+
+        assert rule.window.ids() == ["v0", "v1"]
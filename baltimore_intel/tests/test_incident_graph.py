@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for incident tracking over the correlation graph.
+
+Tests component merging, aggregate roll-ups, retention and the
+incidents API.
+"""
+
+from datetime import datetime, timedelta
+
+from incident_graph import IncidentTracker
+from intelligence_hub import IntelligenceHub, IntelEvent, EventType
+
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def make_correlation(i, rule, severity="medium", minutes=0):
+    return IntelEvent(
+        id=f"c{i}",
+        timestamp=NOW + timedelta(minutes=minutes),
+        event_type=EventType.CORRELATION,
+        source="correlation_engine",
+        title=f"Correlation: {rule}",
+        description="",
+        severity=severity,
+        raw_data={"rule": rule}
+    )
+
+
+class TestIncidentTracker:
+    """Test union-find components and aggregates."""
+
+    def test_shared_event_merges_correlations(self, make_event):
+        """Correlations sharing a member become one incident."""
+        tracker = IncidentTracker()
+        a, b, c, d = (make_event(i, EventType.VESSEL_ARRIVAL, timestamp=NOW) for i in range(4))
+
+        tracker.link(make_correlation(1, "rule_a"), [a, b])
+        tracker.link(make_correlation(2, "rule_b", minutes=5), [c])
+        assert len(tracker.incidents()) == 2
+
+        tracker.link(make_correlation(3, "rule_b", minutes=10), [b, c, d])
+
+        incidents = tracker.incidents()
+        assert len(incidents) == 1
+        assert incidents[0]["id"] == "c1"
+        assert sorted(incidents[0]["correlations"]) == ["c1", "c2", "c3"]
+        assert incidents[0]["rules"] == {"rule_a": 1, "rule_b": 2}
+        assert incidents[0]["member_count"] == 7
+
+    def test_severity_and_extent_roll_up(self, make_event):
+        """Incidents report their top severity and bounding box."""
+        tracker = IncidentTracker()
+        members = [
+            make_event(1, EventType.VESSEL_ARRIVAL, timestamp=NOW, severity="low",
+                       location={"lat": 39.20, "lon": -76.60}),
+            make_event(2, EventType.VESSEL_ARRIVAL, timestamp=NOW, severity="critical",
+                       location={"lat": 39.30, "lon": -76.50}),
+            make_event(3, EventType.VESSEL_ARRIVAL, timestamp=NOW),
+        ]
+
+        tracker.link(make_correlation(1, "rule", "high"), members)
+
+        incident = tracker.incident_of("e3")
+        assert incident["severity"] == "critical"
+        assert incident["severity_counts"] == {"high": 1, "low": 1, "critical": 1, "info": 1}
+        assert incident["extent"] == {"min_lon": -76.6, "min_lat": 39.2, "max_lon": -76.5, "max_lat": 39.3}
+
+    def test_incident_dropped_when_all_members_evicted(self, make_event):
+        """Components leave once every member is gone."""
+        tracker = IncidentTracker()
+        corr = make_correlation(1, "rule")
+        members = [make_event(i, EventType.VESSEL_ARRIVAL, timestamp=NOW) for i in (1, 2)]
+        tracker.link(corr, members)
+
+        tracker.remove(members)
+        assert len(tracker) == 1
+        tracker.remove([corr])
+        assert len(tracker) == 0
+        assert tracker.incident_of("e1") is None
+
+    def test_filters(self, make_event):
+        """Incidents filter by last activity and minimum severity."""
+        tracker = IncidentTracker()
+        old = make_event(1, EventType.VESSEL_ARRIVAL, timestamp=NOW, minutes=-120)
+        tracker.link(make_correlation(1, "old", "critical", minutes=-120), [old])
+        tracker.link(make_correlation(2, "new", "low"), [make_event(2, EventType.VESSEL_ARRIVAL, timestamp=NOW)])
+
+        assert [i["id"] for i in tracker.incidents(since=NOW - timedelta(hours=1))] == ["c2"]
+        assert [i["id"] for i in tracker.incidents(min_severity="high")] == ["c1"]
+
+
+class TestIncidentAPI:
+    """Test hub wiring and /api/incidents."""
+
+    def test_hub_correlations_form_incidents(self):
+        """Hub correlations sharing a vessel arrival merge into one incident."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub()
+        now = datetime.now()
+        for event in (
+            IntelEvent("r1", now, EventType.RAIL_MOVEMENT, "test", "", "", "info"),
+            IntelEvent("c1", now, EventType.COMMODITY_ALERT, "test", "", "", "medium", raw_data={"commodity": "coal"}),
+            IntelEvent("v1", now, EventType.VESSEL_ARRIVAL, "test", "", "", "info", raw_data={"vessel_type": "bulk_carrier"}),
+        ):
+            hub.ingest_event(event)
+        client = create_intelligence_api(hub).test_client()
+
+        body = client.get("/api/incidents").get_json()
+
+        assert body["count"] == 1
+        incident = body["incidents"][0]
+        assert set(incident["rules"]) == {"rail_vessel_cargo_movement", "commodity_vessel_correlation"}
+        assert {"r1", "c1", "v1"} <= set(incident["members"])
+        assert incident["severity"] == "medium"
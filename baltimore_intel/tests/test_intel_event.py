@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact IntelEvent representation.
+
+Tests slotting, interning, frozen payloads and when the hub freezes.
+"""
+
+import json
+import pytest
+
+from event_journal import EventJournal
+from intelligence_hub import IntelligenceHub, IntelEvent, EventType
+
+
+@pytest.fixture
+def vessel_event(make_event):
+    """Vessel events whose source and severity are freshly built strings."""
+    def factory(event_id="e1", event_type=EventType.VESSEL_ARRIVAL, raw_data=None):
+        return make_event(
+            event_id, event_type,
+            source="".join(["ais_", "tracker"]),
+            title="Vessel",
+            severity="".join(["hi", "gh"]),
+            location={"lat": 39.26, "lon": -76.58},
+            entities=["367000001"],
+            raw_data=raw_data if raw_data is not None else {"vessel_type": "bulk_carrier", "n": [1, 2]}
+        )
+    return factory
+
+
+class TestIntelEvent:
+    """Test the slotted event type."""
+
+    def test_slotted_and_interned(self, vessel_event):
+        """No __dict__, and parsed severity/source share one string."""
+        event = vessel_event()
+        assert not hasattr(event, "__dict__")
+        assert event.severity is vessel_event("e2").severity
+        assert event.source is vessel_event("e2").source
+
+    def test_freeze_decodes_on_demand(self, vessel_event):
+        """Frozen payloads read back equal, as fresh dicts."""
+        event = vessel_event()
+        expected = event.to_dict()
+
+        event.freeze()
+
+        assert event.frozen
+        assert event.raw_data == {"vessel_type": "bulk_carrier", "n": [1, 2]}
+        assert event.raw_data is not event.raw_data
+        assert event.to_dict() == expected
+        assert json.loads(event.to_json()) == expected
+
+    def test_round_trip_and_equality(self, vessel_event):
+        """from_dict(to_dict()) is equal, frozen or not."""
+        event = vessel_event()
+        copy = IntelEvent.from_dict(event.to_dict())
+        event.freeze()
+        assert IntelEvent.from_dict(json.loads(event.to_json())) == copy
+
+
+class TestHubFreezing:
+    """Test that the hub freezes only source events."""
+
+    def test_source_events_frozen_correlations_mutable(self, vessel_event):
+        hub = IntelligenceHub()
+        hub.ingest_event(vessel_event("r1", EventType.RAIL_MOVEMENT, {"railroad": "CSX"}))
+        hub.ingest_event(vessel_event("v1"))
+        hub.ingest_event(vessel_event("v2"))
+
+        correlation = hub.get_recent_events(1, [EventType.CORRELATION])[0]
+        assert hub.store.get("v1").frozen
+        assert not correlation.frozen
+        assert correlation.raw_data["update_count"] == 1
+
+    def test_journal_restore_keeps_payloads(self, tmp_path, vessel_event):
+        """Frozen payloads journal as bytes and restore frozen."""
+        hub = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+        hub.ingest_event(vessel_event("v1"))
+        hub.compact_journal()
+        hub.journal.close()
+
+        restored = IntelligenceHub(journal=EventJournal(str(tmp_path)))
+
+        event = restored.store.get("v1")
+        assert event.frozen
+        assert event.raw_data == {"vessel_type": "bulk_carrier", "n": [1, 2]}
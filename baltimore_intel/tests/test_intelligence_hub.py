@@ -379,3 +379,87 @@ class TestNotificationIntegration:
 
         assert observables is not None
         # Should extract IP, domain, MMSI as observables
+
+
+class TestAsyncIngest:
+    """Test background ingest workers and backpressure."""
+
+    def test_workers_drain_queue(self):
+        """Queued events are ingested by the worker pool."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub()
+        hub.start_workers(2)
+        try:
+            client = create_intelligence_api(hub).test_client()
+            response = client.post('/api/ingest/scanner', json={
+                'transcript': 'CSX coal train arriving Curtis Bay',
+                'feed': 'test'
+            })
+
+            assert response.status_code == 202
+            event_id = response.get_json()['id']
+
+            hub.event_queue.join()
+            assert event_id in hub.store
+        finally:
+            hub.stop_workers()
+
+        stats = hub.get_ingest_stats()
+        assert stats['processed'] >= 1
+        assert stats['queue_depth'] == 0
+
+    def test_failed_event_does_not_drop_its_batch(self):
+        """One failing event is counted as failed; the rest are ingested."""
+        hub = IntelligenceHub()
+        add = hub.entity_index.add
+
+        def flaky_add(event):
+            if event.id == 'bad':
+                raise RuntimeError('index unavailable')
+            add(event)
+
+        events = [
+            IntelEvent(id=event_id, timestamp=datetime.now(), event_type=EventType.SCANNER_ALERT,
+                       source='test', title='', description='', severity='info')
+            for event_id in ('good1', 'bad', 'good2')
+        ]
+        with patch.object(hub.entity_index, 'add', side_effect=flaky_add):
+            for event in events:
+                hub.submit(event)
+            hub.start_workers(1)
+            hub.stop_workers()
+
+        stats = hub.get_ingest_stats()
+        assert 'good1' in hub.store and 'good2' in hub.store
+        assert stats['processed'] == 2
+        assert stats['failed'] == 1
+
+    def test_full_queue_returns_503(self):
+        """A full queue rejects ingest with 503 and Retry-After."""
+        from intelligence_hub import create_intelligence_api
+
+        hub = IntelligenceHub(queue_size=1)
+        hub.start_workers(1)
+        client = create_intelligence_api(hub).test_client()
+
+        # Hold the hub lock so workers cannot make progress
+        with hub._lock:
+            statuses = [
+                client.post('/api/ingest/scanner', json={'transcript': 'tug', 'feed': 'test'}).status_code
+                for _ in range(5)
+            ]
+
+        hub.stop_workers()
+
+        assert 503 in statuses
+        assert hub.get_ingest_stats()['rejected'] >= 1
+
+    def test_sync_mode_by_default(self):
+        """Without workers, create_* ingests on the calling thread."""
+        hub = IntelligenceHub()
+
+        event = hub.create_scanner_event('Seagirt crane loading', 'test')
+
+        assert event.id in hub.store
+        assert not hub.async_ingest
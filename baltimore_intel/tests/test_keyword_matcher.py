@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled keyword automaton.
+
+Tests substring semantics against naive scans and the analyzers built
+on the shared transcript matcher.
+"""
+
+import pytest
+import random
+
+from keyword_matcher import KeywordAutomaton, get_transcript_matcher
+from scanner_feeds import KEYWORD_CATEGORIES, categorize_transcript
+from critical_infrastructure import InfrastructureMonitor
+from rail_tracking import FreightInference
+
+
+def naive_scan(vocabulary, text):
+    text = text.lower()
+    result = {}
+    for category, keywords in vocabulary.items():
+        found = tuple(kw for kw in keywords if kw in text)
+        if found:
+            result[category] = found
+    return result
+
+
+class TestKeywordAutomaton:
+    """Test the Aho-Corasick automaton."""
+
+    def test_overlapping_and_nested_keywords(self):
+        """Keywords inside other keywords and overlapping ones all match."""
+        automaton = KeywordAutomaton({
+            "a": ["he", "she", "hers"],
+            "b": ["his", "e"],
+        })
+
+        assert automaton.scan("USHERS") == {"a": ("he", "she", "hers"), "b": ("e",)}
+
+    def test_matches_naive_scan_on_random_text(self):
+        """Results equal `kw in text` for every category."""
+        vocabulary = {f"scanner:{c}": kws for c, kws in KEYWORD_CATEGORIES.items()}
+        automaton = KeywordAutomaton(vocabulary)
+        words = [kw for kws in KEYWORD_CATEGORIES.values() for kw in kws] + ["the", "x", "bay"]
+        rng = random.Random(11)
+
+        for _ in range(200):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+            assert automaton.scan(text) == naive_scan(vocabulary, text)
+
+    def test_prefix_view(self):
+        """matches() strips the category prefix."""
+        matches = get_transcript_matcher().matches("CSX coal train to Curtis Bay", "cargo")
+
+        assert matches == {"coal": ("coal train",)}
+
+
+class TestTranscriptAnalyzers:
+    """Test analyzers that share the transcript matcher."""
+
+    TEXT = "Mayday, fire aboard bulk carrier near Curtis Bay coal terminal, CSX unit train holding"
+
+    def test_categorize_transcript(self):
+        """Scanner categories keep vocabulary order."""
+        categories = categorize_transcript(self.TEXT)
+
+        assert list(categories) == ["cargo_operations", "rail_operations", "safety_emergency", "commodities"]
+        assert categories["safety_emergency"] == ["mayday", "fire"]
+
+    def test_infrastructure_matches_flag_emergency(self):
+        """Infrastructure hits carry the emergency flag."""
+        matches = InfrastructureMonitor().analyze_scanner_transcript(self.TEXT)
+
+        assert [m["infrastructure_id"] for m in matches] == ["cnx_coal"]
+        assert matches[0]["emergency_detected"] is True
+
+    @pytest.mark.parametrize("text,railroad,direction", [
+        ("CSX coal train from Curtis Bay", "CSX", "outbound_port"),
+        ("Local NS manifest to Dundalk", "Norfolk Southern", "inbound_port"),
+        ("Patapsco switcher", "PBR", "unknown"),
+    ])
+    def test_freight_inference(self, text, railroad, direction):
+        """Railroad priority and direction detection are preserved."""
+        result = FreightInference.analyze_transcript(text)
+
+        assert result["railroad"] == railroad
+        assert result["direction"] == direction
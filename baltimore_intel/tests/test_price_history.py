@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar commodity price history.
+
+Tests append/load round trips, vectorized statistics and adaptive
+alert thresholds.
+"""
+
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from price_history import PriceHistory, compute_adaptive_alerts, rolling_zscores
+from commodities import BaltimorePortCommodities, COMMODITIES
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PriceHistory(str(tmp_path))
+
+
+def record_series(history, key, prices, start=1_700_000_000):
+    for i, price in enumerate(prices):
+        history.append(key, start + i * 60, price)
+
+
+class TestPriceHistory:
+    """Test the append-only per-symbol store."""
+
+    def test_append_and_load_round_trip(self, history):
+        """Ticks read back in order through the memory map."""
+        record_series(history, "coal", [100.0, 101.0, 102.5])
+
+        data = history.load("coal")
+
+        assert list(data["price"]) == [100.0, 101.0, 102.5]
+        assert list(history.load("coal", 2)["price"]) == [101.0, 102.5]
+        assert len(history.load("missing")) == 0
+
+    def test_repeated_quote_is_recorded_once(self, history):
+        """Polling a quote whose market time has not changed adds no tick."""
+        quote = {"price": 100.0, "market_time": 1_700_000_000, "timestamp": "2026-01-01T12:00:00"}
+        history.append_quotes({"coal": quote})
+        history.append_quotes({"coal": dict(quote, timestamp="2026-01-01T12:05:00")})
+        history.append_quotes({"coal": dict(quote, price=101.0, market_time=1_700_000_060)})
+
+        assert list(history.load("coal")["price"]) == [100.0, 101.0]
+
+    def test_price_matrix_right_aligns_short_series(self, history):
+        """Shorter series are NaN-padded on the left."""
+        record_series(history, "coal", [1.0, 2.0, 3.0])
+        record_series(history, "corn", [5.0])
+
+        matrix = history.price_matrix(["coal", "corn"], 3)
+
+        assert list(matrix[0]) == [1.0, 2.0, 3.0]
+        assert np.isnan(matrix[1, :2]).all()
+        assert matrix[1, 2] == 5.0
+
+
+class TestAdaptiveAlerts:
+    """Test volatility-adjusted alerting."""
+
+    def test_rolling_zscores_match_direct_computation(self):
+        """Cumulative-sum z-scores agree with a per-window calculation."""
+        rng = np.random.default_rng(7)
+        values = rng.normal(size=(2, 50))
+
+        z = rolling_zscores(values, 10)
+
+        window = values[1, 30:40]
+        expected = (values[1, 40] - window.mean()) / window.std(ddof=1)
+        assert z[1, 40] == pytest.approx(expected)
+
+    def test_volatile_commodity_needs_a_bigger_move(self, history):
+        """The same 3% move alerts on a calm series but not a volatile one."""
+        rng = np.random.default_rng(1)
+        calm = 100 * np.cumprod(1 + rng.normal(0, 0.002, 40))
+        wild = 100 * np.cumprod(1 + rng.normal(0, 0.04, 40))
+        record_series(history, "calm", list(calm) + [calm[-1] * 1.03])
+        record_series(history, "wild", list(wild) + [wild[-1] * 1.03])
+
+        stats = compute_adaptive_alerts(history, ["calm", "wild"])
+
+        assert stats["calm"]["severity"] == "high"
+        assert stats["wild"]["severity"] is None
+        assert stats["wild"]["threshold_pct"] > stats["calm"]["threshold_pct"]
+
+    def test_short_history_is_skipped(self, history):
+        """Keys below min_history are left to the fixed threshold."""
+        record_series(history, "coal", [100.0, 104.0])
+
+        assert compute_adaptive_alerts(history, ["coal"]) == {}
+
+    def test_flat_history_is_left_to_fixed_threshold(self, history):
+        """Zero return volatility yields no z-score, so the key is skipped."""
+        record_series(history, "coal", [100.0] * 40 + [106.0])
+
+        assert compute_adaptive_alerts(history, ["coal"]) == {}
+
+    def test_tracker_records_quotes_and_falls_back(self, history):
+        """The tracker persists fresh quotes and keeps fixed alerts until history builds."""
+        tracker = BaltimorePortCommodities(history=history)
+
+        def quote(symbol, timeout=None):
+            return {"symbol": symbol, "price": 100.0, "prev_close": 96.0, "change": 4.0,
+                    "change_pct": 4.17, "currency": "USD", "exchange": "TEST",
+                    "timestamp": "2026-01-01T12:00:00"}
+
+        with patch.object(tracker, "fetch_yahoo_quote", side_effect=quote):
+            data = tracker.get_all_commodities()
+
+        assert len(history.load("coal")) == 1
+        assert len(data["alerts"]) == len(COMMODITIES)
+        assert all(a["severity"] == "medium" for a in data["alerts"])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for rolling event counters and the situation report.
+
+Tests minute-bucket totals, eviction bookkeeping and that the report is
+served from counters and snapshots without touching the network.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from rolling_counters import RollingCounters
+from intelligence_hub import IntelligenceHub, EventType
+
+
+@pytest.fixture
+def offline_hub(monkeypatch):
+    hub = IntelligenceHub(max_events=5)
+    monkeypatch.setattr(hub.rail_snapshot, "get", lambda: [{"train": "151"}])
+    monkeypatch.setattr(hub.infrastructure_snapshot, "get", lambda: {"status": "ok"})
+    monkeypatch.setattr(hub.commodity_snapshot, "get", lambda: {"commodities": {}, "alerts": []})
+    return hub
+
+
+class TestRollingCounters:
+    """Test minute-bucketed counts."""
+
+    def test_totals_respect_cutoff(self, make_event):
+        """Only buckets at or after the cutoff minute are counted."""
+        counters = RollingCounters()
+        counters.add(make_event(1, minutes=-5, severity="high"))
+        counters.add(make_event(2, EventType.VESSEL_ARRIVAL, minutes=-30))
+        counters.add(make_event(3, minutes=-120))
+
+        total, by_type, by_severity = counters.totals(datetime.now() - timedelta(hours=1))
+
+        assert total == 2
+        assert by_type == {"scanner_alert": 1, "vessel_arrival": 1}
+        assert by_severity == {"high": 1, "info": 1}
+
+    def test_remove_decrements(self, make_event):
+        """Removed events are no longer counted and empty buckets vanish."""
+        counters = RollingCounters()
+        events = [make_event(i, minutes=-1) for i in range(3)]
+        for event in events:
+            counters.add(event)
+
+        counters.remove(events[:2])
+        assert counters.totals(datetime.now() - timedelta(hours=1))[0] == 1
+        counters.remove(events[2:])
+        assert counters._buckets == {}
+
+
+class TestSituationReport:
+    """Test the materialized situation report."""
+
+    def test_counts_follow_store_eviction(self, offline_hub, make_event):
+        """Counter and critical-event state shrink when the store evicts."""
+        for i in range(8):
+            offline_hub.ingest_event(make_event(i, EventType.RAIL_MOVEMENT, minutes=-(8 - i),
+                                                severity="critical" if i < 4 else "low"))
+
+        report = offline_hub.get_situation_report(hours=1)
+
+        assert report["summary"]["total_events"] == len(offline_hub.store) == 5
+        assert report["summary"]["by_severity"]["critical"] == 1
+        assert report["summary"]["by_severity"]["medium"] == 0
+        assert [e["title"] for e in report["critical_events"]] == ["Event e3"]
+
+    def test_external_sections_come_from_snapshots(self, offline_hub):
+        """Rail and infrastructure sections read the cached snapshots."""
+        report = offline_hub.get_situation_report()
+
+        assert report["rail_status"]["amtrak_trains_in_area"] == 1
+        assert report["infrastructure_status"] == {"status": "ok"}
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for declarative correlation rules.
+
+Tests predicate compilation, key and mapped hash joins, distance joins,
+thresholds, spec validation and loading rules into the hub.
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta
+
+from rule_dsl import CompiledRule, RuleSpecError, compile_where, load_rule_specs
+from intelligence_hub import CARGO_VESSEL_TYPES, IntelligenceHub, EventType
+
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+CARGO_RULE = {
+    "name": "cargo_spike",
+    "severity": "high",
+    "window_minutes": 60,
+    "events": {
+        "spike": {
+            "type": "commodity_alert",
+            "where": {"raw_data.change_pct": {"abs_gte": 5}},
+            "key": "raw_data.commodity"
+        },
+        "ship": {"type": "vessel_arrival", "key": "raw_data.vessel_type"}
+    },
+    "join": {"left": "spike", "right": "ship", "map": "cargo_vessel_types"},
+    "group_by": "spike"
+}
+
+
+@pytest.fixture
+def spike(make_event):
+    def factory(i, commodity, change, minutes=0):
+        return make_event(i, EventType.COMMODITY_ALERT, NOW, minutes,
+                          raw_data={"commodity": commodity, "change_pct": change})
+    return factory
+
+
+@pytest.fixture
+def ship(make_event):
+    def factory(i, vessel_type, minutes=0):
+        return make_event(i, EventType.VESSEL_ARRIVAL, NOW, minutes, raw_data={"vessel_type": vessel_type})
+    return factory
+
+
+class TestPredicates:
+    """Test where-clause compilation."""
+
+    def test_operators(self, make_event):
+        """Shorthand and explicit operators combine with AND."""
+        predicate = compile_where({
+            "severity": ["high", "critical"],
+            "source": "test",
+            "raw_data.change_pct": {"abs_gte": 5, "lt": 20},
+            "raw_data.missing": {"exists": False}
+        })
+
+        assert predicate(make_event(1, EventType.COMMODITY_ALERT, timestamp=NOW, raw_data={"change_pct": -7},
+                                    severity="high"))
+        assert not predicate(make_event(2, EventType.COMMODITY_ALERT, timestamp=NOW,
+                                        raw_data={"change_pct": 3}, severity="high"))
+        assert not predicate(make_event(3, EventType.COMMODITY_ALERT, timestamp=NOW,
+                                        raw_data={"change_pct": 25}, severity="high"))
+        assert not predicate(make_event(4, EventType.COMMODITY_ALERT, timestamp=NOW,
+                                        raw_data={"change_pct": 7}))
+
+    def test_unknown_operator_rejected(self):
+        with pytest.raises(RuleSpecError):
+            compile_where({"severity": {"like": "hi%"}})
+
+
+class TestCompiledRule:
+    """Test join plans."""
+
+    def test_mapped_key_join(self, spike, ship):
+        """Commodity keys join only the vessel types that carry them."""
+        plan = CompiledRule(CARGO_RULE, {"cargo_vessel_types": CARGO_VESSEL_TYPES})
+
+        assert plan.add(ship(1, "container")) == []
+        assert plan.add(ship(2, "bulk_carrier")) == []
+        assert plan.add(spike(3, "natural_gas", 6)) == []
+        matches = plan.add(spike(4, "Coal", 6))
+        assert [m.id for m, _ in matches] == ["e2"]
+        assert [m.id for m, _ in plan.add(ship(5, "tanker"))] == ["e3"]
+
+    def test_predicate_filters_join_side(self, spike, ship):
+        """Small moves never enter the join tables."""
+        plan = CompiledRule(CARGO_RULE, {"cargo_vessel_types": CARGO_VESSEL_TYPES})
+        plan.add(spike(1, "coal", 1.5))
+        assert plan.add(ship(2, "bulk_carrier")) == []
+
+    def test_window_expiry(self, spike, ship):
+        """Partners older than the window are forgotten."""
+        plan = CompiledRule(CARGO_RULE, {"cargo_vessel_types": CARGO_VESSEL_TYPES})
+        plan.add(ship(1, "bulk_carrier"))
+        plan.advance(NOW + timedelta(minutes=90))
+        assert plan.add(spike(2, "coal", 6, minutes=90)) == []
+
+    def test_single_alias_threshold(self, make_event):
+        """A grouped threshold fires once enough same-key events arrive."""
+        plan = CompiledRule({
+            "name": "repeat_scanner",
+            "window_minutes": 15,
+            "events": {"alert": {"type": "scanner_alert", "where": {"severity": "high"}, "key": "source"}},
+            "threshold": 3
+        })
+        events = [make_event(i, timestamp=NOW, minutes=i, severity="high") for i in range(3)]
+
+        assert plan.add(events[0]) == []
+        assert plan.add(events[1]) == []
+        assert [m.id for m, _ in plan.add(events[2])] == ["e0", "e1"]
+
+    def test_distance_join(self, make_event):
+        """within_nm without keys uses the spatio-temporal join."""
+        plan = CompiledRule({
+            "name": "rail_near_vessel",
+            "events": {"rail": {"type": "rail_movement"}, "ship": {"type": "vessel_arrival"}},
+            "join": {"left": "rail", "right": "ship", "within_nm": 1.0}
+        })
+        plan.add(make_event(1, EventType.VESSEL_ARRIVAL, timestamp=NOW,
+                            location={"lat": 39.26, "lon": -76.58}))
+        plan.add(make_event(2, EventType.VESSEL_ARRIVAL, timestamp=NOW,
+                            location={"lat": 39.40, "lon": -76.40}))
+
+        matches = plan.add(make_event(3, EventType.RAIL_MOVEMENT, timestamp=NOW,
+                                      location={"lat": 39.265, "lon": -76.58}))
+
+        assert [m.id for m, _ in matches] == ["e1"]
+        assert matches[0][1] < 1.0
+
+    @pytest.mark.parametrize("spec", [
+        {"name": "x", "events": {}},
+        {"name": "x", "events": {"a": {"type": "scanner_alert"}, "b": {"type": "rail_movement"}}},
+        {"name": "x", "events": {"a": {"type": "nope"}}},
+        {"name": "x", "events": {"a": {"type": "scanner_alert"}}, "group_by": "b"},
+        {**CARGO_RULE, "join": {"left": "spike", "right": "ship", "map": "unknown"}},
+    ])
+    def test_invalid_specs_rejected(self, spec):
+        with pytest.raises(RuleSpecError):
+            CompiledRule(spec, {}, known_types=[t.value for t in EventType])
+
+
+class TestHubRules:
+    """Test loading rules into the hub."""
+
+    def test_loaded_rule_correlates_and_groups(self, tmp_path, spike, ship):
+        """Rules load from JSON files and emit grouped correlations."""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"rules": [CARGO_RULE]}))
+        assert load_rule_specs(str(path)) == [CARGO_RULE]
+
+        hub = IntelligenceHub()
+        hub.load_rules(str(path))
+        now = datetime.now()
+        for event in (ship(1, "bulk_carrier"), spike(2, "coal", 8)):
+            event.timestamp = now
+            hub.ingest_event(event)
+
+        correlations = [
+            c for c in hub.store.range(event_types=[EventType.CORRELATION])
+            if c.raw_data["rule"] == "cargo_spike"
+        ]
+        assert len(correlations) == 1
+        assert correlations[0].severity == "high"
+        assert correlations[0].correlations == ["e1", "e2"]
+        assert correlations[0].raw_data["entities"] == ["coal"]
+
+    def test_yaml_rules(self, tmp_path):
+        """YAML rule files load when PyYAML is available."""
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "rules.yaml"
+        path.write_text(yaml.safe_dump([CARGO_RULE]))
+
+        rules = IntelligenceHub().load_rules(str(path))
+
+        assert [r.name for r in rules] == ["cargo_spike"]
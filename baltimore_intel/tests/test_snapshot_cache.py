@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the background-refreshed snapshot cache.
+
+Tests TTL handling, stale-while-revalidate and the shared commodity
+snapshot used by vessel correlation.
+"""
+
+import pytest
+import time
+
+from snapshot_cache import SnapshotCache
+from commodities import correlate_vessel_with_commodities
+
+
+class CountingLoader:
+    """Loader that records how often it is called."""
+
+    def __init__(self, values=None):
+        self.calls = 0
+        self.values = values
+
+    def __call__(self):
+        self.calls += 1
+        if self.values is not None:
+            return self.values[min(self.calls, len(self.values)) - 1]
+        return {"call": self.calls}
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSnapshotCache:
+    """Test snapshot loading and revalidation."""
+
+    def test_fresh_value_is_shared(self):
+        """Reads within the TTL hit the loader once."""
+        loader = CountingLoader()
+        cache = SnapshotCache(loader, ttl=60)
+
+        for _ in range(10):
+            cache.get()
+
+        assert loader.calls == 1
+        assert cache.version == 1
+
+    def test_stale_value_served_while_revalidating(self):
+        """Stale reads return immediately and refresh in the background."""
+        loader = CountingLoader()
+        cache = SnapshotCache(loader, ttl=0.01, max_stale=60)
+
+        first = cache.get()
+        time.sleep(0.02)
+        stale = cache.get()
+
+        assert stale is first
+        assert wait_for(lambda: cache.version == 2)
+
+    def test_loader_failure_keeps_previous_value(self):
+        """A failing refresh does not discard the last good value."""
+        calls = {"n": 0}
+
+        def loader():
+            calls["n"] += 1
+            if calls["n"] > 1:
+                raise RuntimeError("upstream down")
+            return {"ok": True}
+
+        cache = SnapshotCache(loader, ttl=60)
+        cache.get()
+        cache.refresh()
+
+        assert cache.get() == {"ok": True}
+        assert cache.version == 1
+
+    def test_memoize_resets_on_new_version(self):
+        """Memoized results are scoped to one snapshot version."""
+        cache = SnapshotCache(CountingLoader(), ttl=60)
+        cache.get()
+        computed = []
+
+        cache.memoize("k", lambda value: computed.append(value) or len(computed))
+        cache.memoize("k", lambda value: computed.append(value) or len(computed))
+        cache.refresh()
+        cache.memoize("k", lambda value: computed.append(value) or len(computed))
+
+        assert computed == [{"call": 1}, {"call": 2}]
+
+    def test_failed_first_load_returns_default(self):
+        """Readers get the default, not None, until a load succeeds."""
+        def loader():
+            raise RuntimeError("upstream down")
+
+        cache = SnapshotCache(loader, ttl=60, default={"commodities": {}, "alerts": []})
+
+        assert cache.get() == {"commodities": {}, "alerts": []}
+        assert cache.get_versioned() == ({"commodities": {}, "alerts": []}, 0)
+
+
+class TestCommoditySnapshotCorrelation:
+    """Test vessel correlation against a shared snapshot."""
+
+    @pytest.fixture
+    def snapshot(self):
+        data = {
+            "commodities": {
+                "coal": {"name": "Coal Futures", "price": 140.0, "change_pct": 5.5,
+                         "relevance": "Baltimore #1 export"},
+                "corn": {"name": "Corn Futures", "price": 480.0, "change_pct": 0.1,
+                         "relevance": "Agricultural exports"},
+            },
+            "alerts": []
+        }
+        return SnapshotCache(CountingLoader([data]), ttl=60)
+
+    def test_correlation_reads_snapshot(self, snapshot):
+        """Correlation uses snapshot data without any market fetch."""
+        result = correlate_vessel_with_commodities("bulk_carrier", "Australia", snapshot=snapshot)
+
+        names = [c["name"] for c in result["relevant_commodities"]]
+        assert "Coal Futures" in names
+        assert result["risk_assessment"] == "watch"
+
+    def test_correlation_memoized_per_version(self, snapshot):
+        """Many vessels of the same type cost one snapshot load."""
+        for _ in range(300):
+            correlate_vessel_with_commodities("bulk_carrier", "India", snapshot=snapshot)
+
+        assert snapshot.loader.calls == 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the grid spatial index.
+
+Tests radius queries against a brute-force scan and the infrastructure
+monitor's indexed vessel proximity lookups.
+"""
+
+import pytest
+import numpy as np
+
+from spatial_index import GridIndex, haversine_nm
+from critical_infrastructure import (
+    InfrastructureMonitor,
+    Infrastructure,
+    InfrastructureType,
+    BALTIMORE_INFRASTRUCTURE,
+)
+
+
+def brute_force(lats, lons, lat, lon, radius):
+    distances = haversine_nm(lat, lon, lats, lons)
+    return sorted(
+        (int(i), float(distances[i])) for i in np.nonzero(distances <= radius)[0]
+    )
+
+
+class TestGridIndex:
+    """Test grid radius queries."""
+
+    @pytest.fixture
+    def points(self):
+        rng = np.random.default_rng(3)
+        lats = 39.0 + rng.random(2000) * 0.6
+        lons = -76.8 + rng.random(2000) * 0.6
+        return lats, lons
+
+    def test_query_matches_brute_force(self, points):
+        """Indexed results equal a full scan for several radii."""
+        lats, lons = points
+        index = GridIndex(range(len(lats)), lats, lons, cell_nm=1.0)
+
+        for radius in (0.5, 1.0, 3.7, 25.0):
+            result = index.query(39.25, -76.55, radius)
+            assert sorted(result) == pytest.approx(brute_force(lats, lons, 39.25, -76.55, radius))
+
+    def test_batch_matches_single_queries(self, points):
+        """Batch queries return the same hits as one-by-one queries."""
+        lats, lons = points
+        index = GridIndex(range(len(lats)), lats, lons)
+        q_lats, q_lons = lats[:50] + 0.001, lons[:50] - 0.001
+
+        batch = index.query_batch(q_lats, q_lons, 2.0)
+
+        for i in range(50):
+            assert batch[i] == index.query(q_lats[i], q_lons[i], 2.0)
+
+    def test_results_sorted_by_distance(self, points):
+        """Hits are ordered nearest first."""
+        lats, lons = points
+        index = GridIndex(range(len(lats)), lats, lons)
+
+        distances = [d for _, d in index.query(39.3, -76.5, 2.0)]
+
+        assert distances == sorted(distances)
+
+
+class TestInfrastructureProximity:
+    """Test monitor proximity lookups through the index."""
+
+    def test_vessel_near_seagirt(self):
+        """A vessel at Seagirt finds the terminal at zero distance."""
+        monitor = InfrastructureMonitor()
+        seagirt = BALTIMORE_INFRASTRUCTURE["seagirt"]
+
+        nearby = monitor.correlate_vessel_with_infrastructure(
+            {"mmsi": "1", "lat": seagirt.lat, "lon": seagirt.lon}
+        )
+
+        assert nearby[0]["infrastructure"]["id"] == "seagirt"
+        assert nearby[0]["distance_nm"] == 0.0
+
+    def test_index_rebuilt_on_registry_change(self):
+        """Newly registered assets are found; removed ones are not."""
+        monitor = InfrastructureMonitor()
+        vessel = {"mmsi": "2", "lat": 38.5, "lon": -76.0}
+        assert monitor.correlate_vessel_with_infrastructure(vessel) == []
+
+        monitor.register_infrastructure([Infrastructure(
+            id="test_berth", name="Test Berth", type=InfrastructureType.PORT_TERMINAL,
+            lat=38.5, lon=-76.0, description="", operator="Test", criticality=2,
+            dependencies=[]
+        )])
+        assert [m["infrastructure"]["id"] for m in
+                monitor.correlate_vessel_with_infrastructure(vessel)] == ["test_berth"]
+
+        monitor.remove_infrastructure("test_berth")
+        assert monitor.correlate_vessel_with_infrastructure(vessel) == []
+
+    def test_batch_api_aligned_with_input(self):
+        """One result list per vessel, in input order."""
+        monitor = InfrastructureMonitor()
+        seagirt = BALTIMORE_INFRASTRUCTURE["seagirt"]
+        vessels = [
+            {"mmsi": "far", "lat": 0.0, "lon": 0.0},
+            {"mmsi": "near", "lat": seagirt.lat, "lon": seagirt.lon},
+        ]
+
+        results = monitor.correlate_vessels_with_infrastructure(vessels)
+
+        assert results[0] == []
+        assert results[1][0]["vessel_mmsi"] == "near"
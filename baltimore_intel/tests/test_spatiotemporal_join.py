@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the spatio-temporal join and the vessel/infrastructure rule.
+
+Tests distance and time pairing, bucket expiry and that the hub only
+correlates vessels that are actually near an alerting asset.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from spatiotemporal_join import SpatioTemporalJoin
+from intelligence_hub import IntelligenceHub, EventType
+
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def vessel(make_event):
+    def factory(i, lat, lon, minutes=0):
+        return make_event(i, EventType.VESSEL_ARRIVAL, NOW, minutes, location={"lat": lat, "lon": lon})
+    return factory
+
+
+@pytest.fixture
+def alert(make_event):
+    def factory(i, lat, lon, minutes=0, asset="key_bridge"):
+        return make_event(i, EventType.INFRASTRUCTURE_ALERT, NOW, minutes,
+                          location={"lat": lat, "lon": lon}, entities=[asset])
+    return factory
+
+
+def make_join():
+    return SpatioTemporalJoin(
+        [EventType.VESSEL_ARRIVAL], [EventType.INFRASTRUCTURE_ALERT],
+        max_distance_nm=2.0, max_gap=timedelta(minutes=30)
+    )
+
+
+class TestSpatioTemporalJoin:
+    """Test join pairing and expiry."""
+
+    def test_pairs_only_within_distance_and_gap(self, vessel, alert):
+        """Far-away or stale opposite-side events are not matched."""
+        join = make_join()
+        join.add(vessel(1, 39.217, -76.528))              # ~0.5 nm away
+        join.add(vessel(2, 39.35, -76.40))                # ~9 nm away
+        join.add(vessel(3, 39.217, -76.528, minutes=-45)) # too early
+        join.add(vessel(4, 39.22, -76.53))                # ~0.7 nm away
+
+        matches = join.add(alert(9, 39.2176, -76.5181, minutes=5))
+
+        assert [m.id for m, _ in matches] == ["e1", "e4"]
+        assert all(d <= 2.0 for _, d in matches)
+
+    def test_same_side_events_do_not_pair(self, vessel):
+        """Two vessels side by side are not a match."""
+        join = make_join()
+        join.add(vessel(1, 39.2, -76.5))
+        assert join.add(vessel(2, 39.2, -76.5)) == []
+
+    def test_matches_across_cell_and_bucket_edges(self, vessel, alert):
+        """Neighbouring cells and time buckets are probed."""
+        join = make_join()
+        join.add(vessel(1, 39.2499, -76.5001, minutes=29))
+        matches = join.add(alert(2, 39.2501, -76.4999, minutes=1))
+        assert [m.id for m, _ in matches] == ["e1"]
+
+    def test_advance_drops_expired_buckets(self, vessel, alert):
+        """Old buckets are released once the watermark passes them."""
+        join = make_join()
+        for i in range(10):
+            join.add(vessel(i, 39.2, -76.5))
+
+        join.advance(NOW + timedelta(hours=3))
+
+        assert len(join) == 0
+        assert join.add(alert(99, 39.2, -76.5, minutes=180)) == []
+
+
+class TestVesselInfrastructureRule:
+    """Test the hub rule built on the join."""
+
+    def test_only_nearby_vessels_correlate(self, vessel, alert):
+        """A correlation fires per nearby asset and lists just the pair."""
+        hub = IntelligenceHub(vessel_infra_distance_nm=1.0)
+        now = datetime.now()
+        far = vessel(1, 39.35, -76.40)
+        far.timestamp = now
+        near = vessel(2, 39.218, -76.52)
+        near.timestamp = now
+        hub.ingest_event(far)
+        hub.ingest_event(near)
+        bridge = alert(3, 39.2176, -76.5181)
+        bridge.timestamp = now
+        hub.ingest_event(bridge)
+
+        correlations = hub.store.range(event_types=[EventType.CORRELATION])
+
+        assert len(correlations) == 1
+        assert sorted(correlations[0].correlations) == ["e2", "e3"]
+        assert correlations[0].raw_data["entities"] == ["key_bridge"]
+        assert correlations[0].raw_data["nearest_nm"] < 1.0
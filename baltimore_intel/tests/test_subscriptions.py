@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for filtered subscriptions.
+
+Tests filter indexing, asynchronous delivery, queue policies and
+slow-consumer disconnects.
+"""
+
+import threading
+import time
+
+from intelligence_hub import IntelligenceHub, EventType
+from subscriptions import SubscriptionManager, BLOCK, DROP_NEWEST, DROP_OLDEST
+
+
+class TestSubscriptionFilters:
+    """Test that filters select the right events."""
+
+    def test_type_severity_bbox_entity(self, make_event):
+        """Each filter field narrows delivery independently."""
+        manager = SubscriptionManager()
+        seen = {name: [] for name in ("all", "rail", "high", "harbor", "mmsi")}
+        manager.subscribe(seen["all"].append, synchronous=True)
+        manager.subscribe(seen["rail"].append, event_types=[EventType.RAIL_MOVEMENT], synchronous=True)
+        manager.subscribe(seen["high"].append, min_severity="high", synchronous=True)
+        manager.subscribe(seen["harbor"].append, bbox="-76.7,39.2,-76.5,39.3", synchronous=True)
+        manager.subscribe(seen["mmsi"].append, entities=["367000001"], synchronous=True)
+
+        manager.publish(make_event("rail", EventType.RAIL_MOVEMENT))
+        manager.publish(make_event("crit", severity="critical"))
+        manager.publish(make_event("harbor", location={"lat": 39.26, "lon": -76.58}))
+        manager.publish(make_event("far", location={"lat": 38.0, "lon": -76.58}))
+        manager.publish(make_event("ship", EventType.VESSEL_ARRIVAL, entities=["367000001"]))
+
+        ids = {name: [e.id for e in events] for name, events in seen.items()}
+        assert ids["all"] == ["rail", "crit", "harbor", "far", "ship"]
+        assert ids["rail"] == ["rail"]
+        assert ids["high"] == ["crit"]
+        assert ids["harbor"] == ["harbor"]
+        assert ids["mmsi"] == ["ship"]
+
+    def test_unsubscribe_removes_from_index(self, make_event):
+        """Unsubscribed callbacks receive nothing further."""
+        manager = SubscriptionManager()
+        seen = []
+        subscription = manager.subscribe(seen.append, entities=["x"], synchronous=True)
+
+        assert manager.unsubscribe(subscription)
+        manager.publish(make_event("e1", entities=["x"]))
+
+        assert seen == []
+        assert len(manager) == 0
+
+
+class TestAsyncDelivery:
+    """Test queued delivery off the publishing thread."""
+
+    def test_slow_subscriber_does_not_block_ingest(self, make_event):
+        """Ingest completes while a subscriber is still blocked."""
+        hub = IntelligenceHub()
+        release = threading.Event()
+        slow, fast = [], []
+        hub.subscribe(lambda e: (release.wait(5), slow.append(e)))
+        hub.subscribe(fast.append)
+
+        for i in range(3):
+            hub.ingest_event(make_event(f"e{i}"))
+        assert len(slow) == 0
+
+        release.set()
+        assert hub.subscriptions.flush(timeout=5)
+        assert [e.id for e in slow] == ["e0", "e1", "e2"]
+        assert [e.id for e in fast] == ["e0", "e1", "e2"]
+
+        stats = hub.get_ingest_stats()["subscriptions"]
+        assert stats[0]["delivered"] == 3
+        assert stats[0]["latency_ms"]["max"] > 0
+
+    def test_blocking_subscriber_waits_outside_hub_lock(self, make_event):
+        """A BLOCK wait on a full queue does not hold the hub lock."""
+        hub = IntelligenceHub()
+        release = threading.Event()
+        hub.subscribe(lambda e: release.wait(5), queue_size=1, policy=BLOCK, block_timeout=5)
+        for i in range(2):
+            hub.ingest_event(make_event(f"e{i}"))
+
+        publisher = threading.Thread(target=hub.ingest_event, args=(make_event("e2"),))
+        publisher.start()
+        time.sleep(0.1)
+        try:
+            assert publisher.is_alive()
+            assert hub._lock.acquire(timeout=1)
+            hub._lock.release()
+        finally:
+            release.set()
+            publisher.join(5)
+
+    def test_drop_policies(self, make_event):
+        """Full queues drop the oldest or the newest event."""
+        manager = SubscriptionManager()
+        release = threading.Event()
+        got = {DROP_OLDEST: [], DROP_NEWEST: []}
+        subs = {
+            policy: manager.subscribe(
+                lambda e, p=policy: (release.wait(5), got[p].append(e.id)),
+                queue_size=2, policy=policy
+            )
+            for policy in got
+        }
+        manager.publish(make_event("first"))
+        for sub in subs.values():
+            # The worker has taken "first" and is blocked delivering it
+            while sub.stats()["queue_depth"]:
+                time.sleep(0.001)
+        for i in range(4):
+            manager.publish(make_event(f"e{i}"))
+
+        release.set()
+        assert manager.flush(timeout=5)
+        assert got[DROP_OLDEST] == ["first", "e2", "e3"]
+        assert got[DROP_NEWEST] == ["first", "e0", "e1"]
+        assert subs[DROP_OLDEST].stats()["dropped"] == 2
+
+    def test_slow_consumer_disconnected(self, make_event):
+        """Repeated drops disconnect the subscription."""
+        manager = SubscriptionManager()
+        release = threading.Event()
+        subscription = manager.subscribe(
+            lambda e: release.wait(5), queue_size=1, max_consecutive_drops=3
+        )
+        for i in range(6):
+            manager.publish(make_event(f"e{i}"))
+
+        assert not subscription.active
+        assert subscription.disconnected_reason == "slow consumer"
+        assert len(manager) == 0
+        release.set()
+
+    def test_callback_errors_are_counted(self, make_event):
+        """A raising callback does not stop later deliveries."""
+        manager = SubscriptionManager()
+        subscription = manager.subscribe(lambda e: 1 / 0)
+        manager.publish(make_event("e1"))
+        manager.publish(make_event("e2"))
+
+        assert manager.flush(timeout=5)
+        assert subscription.stats()["errors"] == 2